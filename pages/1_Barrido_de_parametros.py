@@ -0,0 +1,81 @@
+import numpy as np
+import streamlit as st
+
+from submain_engine import PVC_SDR, PE_PN
+from submain_report import ETIQUETAS_BARRIDO, dibujar_barrido
+from submain_sweep import PARAMETROS, barrido
+
+# ===============================
+# CONFIGURACIÓN GENERAL
+# ===============================
+st.set_page_config(page_title="Barrido de parámetros", layout="wide")
+st.title("📈 Barrido de parámetros – diámetro recomendado")
+st.caption("Selección con un diámetro sobre mallas completas de parámetros | Prof. Gregory Guevara")
+
+# (mínimo, máximo, valor fijo) de cada parámetro
+RANGOS = {
+    "Q": (1.0, 100.0, 20.0),
+    "S": (0.3, 20.0, 10.0),
+    "LL": (100.0, 5000.0, 100.0),
+    "HF_disp": (0.2, 10.0, 1.0),
+    "C": (100.0, 150.0, 150.0),
+}
+# Todos los parámetros deben ser positivos (S = 0 o LL = 0 no tienen salidas)
+MINIMO = 0.01
+VARIABLES = ("d1", "HF", "V", "t_avance")
+
+
+@st.cache_data(max_entries=32, show_spinner="Calculando barrido...")
+def calcular(material, clase, valores):
+    return barrido(material, clase, **valores)
+
+
+# ===============================
+# ENTRADAS
+# ===============================
+st.sidebar.header("🧱 Material")
+
+material = st.sidebar.selectbox("Material", ["PVC", "PE (HDPE)"])
+
+if material == "PVC":
+    clase = st.sidebar.selectbox("SDR", list(PVC_SDR.keys()), index=3)
+else:
+    clase = st.sidebar.selectbox("Clase PN", list(PE_PN.keys()))
+
+st.sidebar.header("📐 Ejes del barrido")
+
+x = st.sidebar.selectbox("Eje X", PARAMETROS, index=PARAMETROS.index("LL"),
+                         format_func=ETIQUETAS_BARRIDO.get)
+y = st.sidebar.selectbox("Eje Y", [p for p in PARAMETROS if p != x],
+                         format_func=ETIQUETAS_BARRIDO.get)
+puntos = st.sidebar.slider("Puntos por eje", 20, 1000, 200, step=20)
+
+valores = {}
+for p in PARAMETROS:
+    lo, hi, fijo = RANGOS[p]
+    if p in (x, y):
+        c1, c2 = st.sidebar.columns(2)
+        lo = c1.number_input(f"{p} mín.", value=lo, min_value=MINIMO)
+        hi = c2.number_input(f"{p} máx.", value=hi, min_value=MINIMO)
+        valores[p] = np.linspace(lo, hi, puntos)
+    else:
+        valores[p] = st.sidebar.number_input(ETIQUETAS_BARRIDO[p], value=fijo,
+                                             min_value=MINIMO)
+
+variable = st.radio("Resultado", VARIABLES, horizontal=True,
+                    format_func=ETIQUETAS_BARRIDO.get)
+
+# ===============================
+# RESULTADOS
+# ===============================
+res = calcular(material, clase, valores)
+
+st.pyplot(dibujar_barrido(res, variable, x, y))
+
+Z = res.plano(variable, x, y)
+sin_solucion = np.isnan(res.plano("d1", x, y)).mean()
+c1, c2, c3 = st.columns(3)
+c1.metric("Combinaciones", f"{Z.size:,}")
+c2.metric("Sin diámetro que cumpla", f"{sin_solucion:.1%}")
+if np.isfinite(Z).any():
+    c3.metric(f"Rango de {variable}", f"{np.nanmin(Z):.3g} – {np.nanmax(Z):.3g}")
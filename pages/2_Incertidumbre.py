@@ -0,0 +1,104 @@
+import os
+
+import streamlit as st
+
+from submain_engine import (
+    DARCY, MODELOS, PVC_SDR, PE_PN, V_MAX, Entrada, diametros_por_tramo,
+    solucion_un_diametro, solucion_dos_diametros,
+)
+from submain_montecarlo import Incertidumbre, monte_carlo
+from submain_report import dibujar_monte_carlo
+
+# ===============================
+# CONFIGURACIÓN GENERAL
+# ===============================
+st.set_page_config(page_title="Análisis de incertidumbre", layout="wide")
+st.title("🎲 Análisis de incertidumbre – Monte Carlo")
+st.caption("Envejecimiento de la tubería, variación de emisores y tolerancia de instalación | Prof. Gregory Guevara")
+
+
+@st.cache_data(max_entries=16, show_spinner="Simulando...")
+def simular(entrada, diseno, inc, muestras, semilla, procesos):
+    if diseno == "Dos diámetros":
+        sol2 = solucion_dos_diametros(entrada)
+        if sol2 is None:
+            return None
+        D = diametros_por_tramo(entrada, sol2=sol2)
+    else:
+        d1 = solucion_un_diametro(entrada).d1
+        if d1 is None:
+            return None
+        D = diametros_por_tramo(entrada, d1)
+    return monte_carlo(entrada, D, inc, muestras, semilla, procesos)
+
+
+# ===============================
+# ENTRADAS
+# ===============================
+st.sidebar.header("📥 Datos de entrada")
+
+Q = st.sidebar.number_input("Caudal total (m³/h)", value=20.0)
+S = st.sidebar.number_input("Espaciamiento entre salidas (m)", value=10.0)
+LL = st.sidebar.number_input("Longitud total (m)", value=100.0)
+HF_disp = st.sidebar.number_input("Pérdida disponible (m)", value=1.0)
+C = st.sidebar.number_input("Coeficiente Hazen–Williams (C)", value=150)
+
+material = st.sidebar.selectbox("Material", ["PVC", "PE (HDPE)"])
+
+if material == "PVC":
+    clase = st.sidebar.selectbox("SDR", list(PVC_SDR.keys()), index=3)
+else:
+    clase = st.sidebar.selectbox("Clase PN", list(PE_PN.keys()))
+
+modelo = st.sidebar.selectbox("Modelo de fricción", MODELOS)
+temperatura = 20.0
+if modelo == DARCY:
+    temperatura = st.sidebar.number_input("Temperatura del agua (°C)", value=20.0,
+                                          min_value=0.0, max_value=40.0)
+
+diseno = st.sidebar.radio("Diseño a evaluar", ["Un diámetro", "Dos diámetros"])
+
+st.sidebar.header("🎲 Incertidumbre")
+
+inc = Incertidumbre(
+    C_sd=st.sidebar.number_input("Desviación estándar de C", value=10.0, min_value=0.0,
+                                 disabled=modelo == DARCY,
+                                 help="Sólo Hazen–Williams: con Darcy–Weisbach la pérdida no depende de C"),
+    cv_q=st.sidebar.number_input("CV del caudal por salida", value=0.05, min_value=0.0, step=0.01),
+    tol_S=st.sidebar.number_input("Tolerancia del espaciamiento (±)", value=0.02,
+                                  min_value=0.0, max_value=0.5, step=0.01),
+)
+muestras = st.sidebar.select_slider("Muestras", [10_000, 100_000, 1_000_000], value=100_000)
+semilla = st.sidebar.number_input("Semilla", value=0, min_value=0, step=1)
+# Un proceso por defecto: cada proceso extra se lanza dentro del servidor
+procesos = st.sidebar.number_input("Procesos", value=1, min_value=1,
+                                   max_value=os.cpu_count() or 1, step=1)
+
+try:
+    entrada = Entrada(Q, S, LL, HF_disp, C, material, clase, modelo, temperatura)
+except ValueError as ex:
+    st.error(f"❌ {ex}")
+    st.stop()
+
+# ===============================
+# RESULTADOS
+# ===============================
+res = simular(entrada, diseno, inc, muestras, int(semilla), int(procesos))
+if res is None:
+    st.warning("⚠️ Ningún diseño cumple con los datos ingresados.")
+    st.stop()
+
+pct = res.percentiles()
+c1, c2, c3, c4, c5 = st.columns(5)
+c1.metric(f"P(HF > {HF_disp:.2f} m)", f"{res.p_HF:.2%}")
+c2.metric(f"P(V > {V_MAX:.0f} m/s)", f"{res.p_V:.2%}")
+c3.metric("HF nominal tramo a tramo (m)", f"{res.HF_nominal:.3f}")
+c4.metric("HF p95 (m)", f"{pct['HF'][95]:.3f}")
+c5.metric("Tiempo de avance p95 (min)", f"{pct['t_avance'][95]:.2f}")
+
+st.pyplot(dibujar_monte_carlo(res))
+
+st.dataframe(
+    {nombre: {f"p{q}": round(v, 3) for q, v in p.items()} for nombre, p in pct.items()},
+    use_container_width=True,
+)
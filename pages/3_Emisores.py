@@ -0,0 +1,117 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from submain_engine import (
+    PVC_SDR, PE_PN, Entrada, diametros_por_tramo,
+    solucion_un_diametro, solucion_dos_diametros,
+)
+from submain_emisores import emisor_del_diseno, resolver_presiones
+from submain_report import dibujar_presiones
+
+# ===============================
+# CONFIGURACIÓN GENERAL
+# ===============================
+st.set_page_config(page_title="Emisores y presión", layout="wide")
+st.title("🚿 Caudal de emisores dependiente de la presión")
+st.caption("Perfil acoplado presión/caudal q = k·hˣ con cota del terreno | Prof. Gregory Guevara")
+
+
+@st.cache_data(max_entries=32, show_spinner=False)
+def calcular(entrada, diseno, h_nominal, x, H0, cota):
+    if diseno == "Dos diámetros":
+        sol2 = solucion_dos_diametros(entrada)
+        if sol2 is None:
+            return None
+        D = diametros_por_tramo(entrada, sol2=sol2)
+    else:
+        d1 = solucion_un_diametro(entrada).d1
+        if d1 is None:
+            return None
+        D = diametros_por_tramo(entrada, d1)
+    return resolver_presiones(entrada, D, emisor_del_diseno(entrada, h_nominal, x),
+                              H0, cota)
+
+
+# ===============================
+# ENTRADAS
+# ===============================
+st.sidebar.header("📥 Datos de entrada")
+
+Q = st.sidebar.number_input("Caudal total (m³/h)", value=20.0)
+S = st.sidebar.number_input("Espaciamiento entre salidas (m)", value=10.0)
+LL = st.sidebar.number_input("Longitud total (m)", value=100.0)
+HF_disp = st.sidebar.number_input("Pérdida disponible (m)", value=1.0)
+C = st.sidebar.number_input("Coeficiente Hazen–Williams (C)", value=150)
+
+material = st.sidebar.selectbox("Material", ["PVC", "PE (HDPE)"])
+
+if material == "PVC":
+    clase = st.sidebar.selectbox("SDR", list(PVC_SDR.keys()), index=3)
+else:
+    clase = st.sidebar.selectbox("Clase PN", list(PE_PN.keys()))
+
+diseno = st.sidebar.radio("Diseño a evaluar", ["Un diámetro", "Dos diámetros"])
+
+st.sidebar.header("🚿 Emisores")
+
+h_nominal = st.sidebar.number_input("Presión nominal del emisor (m)", value=10.0, min_value=0.1)
+x = st.sidebar.number_input("Exponente de descarga x", value=0.5, min_value=0.0,
+                            max_value=1.0, step=0.05)
+H0 = st.sidebar.number_input("Presión a la entrada (m)", value=h_nominal + HF_disp)
+
+st.sidebar.header("⛰️ Terreno")
+
+pendiente = st.sidebar.number_input("Pendiente (%; positiva = sube)", value=0.0, step=0.5)
+archivo = st.sidebar.file_uploader("Cota por salida (CSV, columna cota)", type="csv")
+
+try:
+    entrada = Entrada(Q, S, LL, HF_disp, C, material, clase)
+except ValueError as ex:
+    st.error(f"❌ {ex}")
+    st.stop()
+
+if archivo is None:
+    cota = pendiente / 100 * entrada.tramos()[0]
+else:
+    try:
+        tabla_cota = pd.read_csv(archivo)
+        if "cota" not in tabla_cota.columns:
+            raise ValueError("El CSV debe tener la columna cota")
+        cota = tabla_cota["cota"].to_numpy(dtype=float)
+        if not np.isfinite(cota).all():
+            raise ValueError("Las cotas deben ser números finitos")
+    except ValueError as ex:
+        st.error(f"❌ {ex}")
+        st.stop()
+    if len(cota) != entrada.Salidas:
+        st.error(f"❌ El CSV debe tener {entrada.Salidas} cotas, una por salida")
+        st.stop()
+
+# ===============================
+# RESULTADOS
+# ===============================
+res = calcular(entrada, diseno, h_nominal, x, H0, cota)
+if res is None:
+    st.warning("⚠️ Ningún diseño cumple con los datos ingresados.")
+    st.stop()
+
+if not res.convergio:
+    st.warning(f"⚠️ Sin convergencia tras {res.iteraciones} iteraciones "
+               f"(residuo {res.residuo:.2e} m); {res.secas} salidas sin presión.")
+
+c1, c2, c3, c4, c5 = st.columns(5)
+c1.metric("Caudal de entrada (m³/h)", f"{res.Q:.2f}", f"{res.Q - Q:+.2f}")
+c2.metric("Uniformidad CU", f"{res.CU:.1%}",
+          f"{res.secas} salidas secas" if res.secas else None, delta_color="off")
+c3.metric("Uniformidad de emisión UE", f"{res.UE:.1%}")
+c4.metric("Variación de caudal", f"{res.q_var:.1%}")
+c5.metric("Pérdida por fricción (m)", f"{res.HF:.3f}")
+
+st.pyplot(dibujar_presiones(res, cota if cota.any() else None))
+
+st.caption(f"Convergencia: {res.iteraciones} iteraciones, residuo final "
+           f"{res.residuo:.2e} m")
+
+with st.expander("Tabla por salida"):
+    st.dataframe(res.tabla(), use_container_width=True)
@@ -0,0 +1,114 @@
+import io
+
+import pandas as pd
+import streamlit as st
+
+from submain_batch import normalizar
+from submain_engine import PVC_SDR, PE_PN, Entrada, catalogo
+from submain_red import red_desde_tablas, red_submain
+
+# ===============================
+# CONFIGURACIÓN GENERAL
+# ===============================
+st.set_page_config(page_title="Red de submain", layout="wide")
+st.title("🕸️ Submain con varias secundarias")
+st.caption("Solución conjunta de caudales y cargas por el método del gradiente global | Prof. Gregory Guevara")
+
+
+@st.cache_resource(max_entries=8, show_spinner="Armando la red...")
+def armar(secundarias, espaciamiento, D_submain, H_entrada, C_submain):
+    return red_submain(list(secundarias), espaciamiento, D_submain, H_entrada, C_submain)
+
+
+@st.cache_resource(max_entries=8, show_spinner="Armando la red...")
+def armar_tablas(tuberias, nudos):
+    return red_desde_tablas(pd.read_csv(io.BytesIO(tuberias)), pd.read_csv(io.BytesIO(nudos)))
+
+
+# ===============================
+# ENTRADAS
+# ===============================
+trazado = st.sidebar.radio("Trazado", ["Submain con secundarias", "Red desde tablas (mallada)"])
+if trazado != "Submain con secundarias":
+    st.sidebar.header("🕸️ Red")
+    tuberias = st.sidebar.file_uploader(
+        "Tuberías (CSV: desde, hasta, L, D[, C, rama])", type="csv")
+    nudos = st.sidebar.file_uploader(
+        "Nudos (CSV: nudo, demanda[, carga en los nudos fijos])", type="csv")
+    if tuberias is None or nudos is None:
+        st.info("Cargue las tablas de tuberías y de nudos; los diámetros deben "
+                "ser del catálogo PVC/PE.")
+        st.stop()
+    try:
+        red, demandas = armar_tablas(tuberias.getvalue(), nudos.getvalue())
+    except (ValueError, KeyError) as ex:
+        st.error(f"❌ {ex}")
+        st.stop()
+else:
+    st.sidebar.header("🧱 Submain")
+
+    material = st.sidebar.selectbox("Material", ["PVC", "PE (HDPE)"])
+    if material == "PVC":
+        clase = st.sidebar.selectbox("SDR", list(PVC_SDR.keys()), index=3)
+    else:
+        clase = st.sidebar.selectbox("Clase PN", list(PE_PN.keys()))
+    D_submain = st.sidebar.selectbox("Diámetro interno (mm)", catalogo(material, clase).d[::-1])
+    espaciamiento = st.sidebar.number_input("Distancia entre tomas (m)", value=20.0, min_value=0.1)
+    H_entrada = st.sidebar.number_input("Carga a la entrada (m)", value=20.0)
+    C_submain = st.sidebar.number_input("Coeficiente Hazen–Williams (C)", value=150)
+
+    st.sidebar.header("💧 Secundarias")
+
+    archivo = st.sidebar.file_uploader(
+        "Secundarias (CSV: Q, S, LL, HF_disp, C, material, clase)", type="csv")
+    if archivo is None:
+        n = st.sidebar.number_input("Número de secundarias", value=20, min_value=1, step=1)
+        Q = st.sidebar.number_input("Caudal por secundaria (m³/h)", value=10.0)
+        S = st.sidebar.number_input("Espaciamiento entre salidas (m)", value=1.0)
+        LL = st.sidebar.number_input("Longitud de cada secundaria (m)", value=100.0)
+        HF_disp = st.sidebar.number_input("Pérdida disponible (m)", value=2.0)
+        filas = pd.DataFrame({"Q": [Q], "S": [S], "LL": [LL], "HF_disp": [HF_disp]})
+        filas = filas.loc[[0] * int(n)]
+    else:
+        filas = pd.read_csv(archivo, dtype={"material": str, "clase": str})
+
+    try:
+        filas = normalizar(filas)
+        secundarias = tuple(
+            Entrada(f.Q, f.S, f.LL, f.HF_disp, f.C, f.material, f.clase, f.modelo, f.temperatura)
+            for f in filas.itertuples())
+        red, demandas = armar(secundarias, espaciamiento, float(D_submain), H_entrada, C_submain)
+    except ValueError as ex:
+        st.error(f"❌ {ex}")
+        st.stop()
+
+factor = st.slider("Factor de demanda", 0.5, 1.5, 1.0, step=0.05,
+                   help="Escala todas las demandas; la red ya armada se reutiliza")
+
+# ===============================
+# RESULTADOS
+# ===============================
+# Arranque en caliente por sesión: la Red en caché se comparte entre sesiones
+previo = st.session_state.get("red_Q0")
+Q0 = previo[1] if previo is not None and previo[0] is red else None
+res = red.resolver(demandas * factor, Q0=Q0)
+st.session_state["red_Q0"] = (red, res.caudal)
+if not res.convergio:
+    st.warning(f"⚠️ Sin convergencia tras {res.iteraciones} iteraciones "
+               f"(residuo {res.residuo:.2e}).")
+
+c1, c2, c3, c4 = st.columns(4)
+c1.metric("Tuberías", f"{len(red.L):,}")
+c2.metric("Caudal de entrada (m³/h)", f"{(demandas * factor)[~red.fijo].sum():.2f}")
+c3.metric("Carga mínima (m)", f"{res.carga.min():.2f}")
+c4.metric("Iteraciones", res.iteraciones)
+
+st.dataframe(
+    red.resumen_ramas(res).style.format({
+        "Caudal de entrada (m³/h)": "{:.2f}",
+        "HF (m)": "{:.3f}",
+        "Velocidad máxima (m/s)": "{:.2f}",
+        "Carga mínima (m)": "{:.2f}",
+    }),
+    use_container_width=True, hide_index=True,
+)
@@ -0,0 +1,114 @@
+import inspect
+
+import pandas as pd
+import streamlit as st
+
+from submain_costos import PRECIOS, clases_catalogo, frente_pareto
+from submain_engine import DARCY, MATERIALES, MODELOS, Entrada, etiqueta_material, tiempo_avance
+from submain_graficos import grafico_pareto, graficos_avance
+
+# ===============================
+# CONFIGURACIÓN GENERAL
+# ===============================
+st.set_page_config(page_title="Costo y frente de Pareto", layout="wide")
+st.title("💲 Diseño por costo – frente de Pareto")
+st.caption("Todas las clases, pares de diámetros y longitudes de corte | Prof. Gregory Guevara")
+
+
+@st.cache_data(max_entries=16, show_spinner="Enumerando diseños...")
+def calcular(entrada, precios, clases):
+    return frente_pareto(entrada, precios, clases)
+
+
+# ===============================
+# ENTRADAS
+# ===============================
+st.sidebar.header("🔧 Parámetros de entrada")
+
+Q = st.sidebar.number_input("Caudal total (m³/h)", value=20.0)
+S = st.sidebar.number_input("Espaciamiento entre salidas (m)", value=1.0)
+LL = st.sidebar.number_input("Longitud total (m)", value=2000.0)
+HF_disp = st.sidebar.number_input("Pérdida disponible (m)", value=6.0)
+C = st.sidebar.number_input("Coeficiente Hazen–Williams (C)", value=150)
+
+modelo = st.sidebar.selectbox("Modelo de fricción", MODELOS)
+temperatura = 20.0
+if modelo == DARCY:
+    temperatura = st.sidebar.number_input("Temperatura del agua (°C)", value=20.0,
+                                          min_value=0.0, max_value=40.0)
+
+st.sidebar.header("🧱 Clases a comparar")
+
+todas = clases_catalogo()
+clases = tuple(st.sidebar.multiselect(
+    "Clases SDR/PN", todas, default=todas, format_func=lambda c: etiqueta_material(*c)))
+
+# ===============================
+# PRECIOS
+# ===============================
+with st.expander("💲 Precios por metro ($/m) – editar con la lista del proveedor"):
+    lista = pd.DataFrame([
+        {"Material": m, "Clase": c, "Diámetro (mm)": d, "Precio ($/m)": p}
+        for m in MATERIALES for c in MATERIALES[m]
+        for d, p in zip(MATERIALES[m][c], PRECIOS[m][c])])
+    lista = st.data_editor(lista, disabled=["Material", "Clase", "Diámetro (mm)"],
+                           hide_index=True, use_container_width=True)
+
+precios = {m: {c: grupo["Precio ($/m)"].tolist() for c, grupo in filas.groupby("Clase", sort=False)}
+           for m, filas in lista.groupby("Material", sort=False)}
+
+if not clases:
+    st.warning("⚠️ Elija al menos una clase.")
+    st.stop()
+
+try:
+    entrada = Entrada(Q=Q, S=S, LL=LL, HF_disp=HF_disp, C=C,
+                      modelo=modelo, temperatura=temperatura)
+    frente = calcular(entrada, precios, clases)
+except ValueError as ex:
+    st.error(f"❌ {ex}")
+    st.stop()
+
+if len(frente) == 0:
+    st.warning("⚠️ Ningún diseño de las clases elegidas cumple con los datos ingresados.")
+    st.stop()
+
+# ===============================
+# FRENTE DE PARETO
+# ===============================
+c1, c2, c3 = st.columns(3)
+c1.metric("Diseños enumerados", f"{frente.evaluadas:,}")
+c2.metric("En el frente de Pareto", f"{len(frente):,}")
+c3.metric("Costo mínimo", f"$ {frente.costo.min():,.2f}")
+
+# La selección sobre el gráfico requiere Streamlit >= 1.35; antes se elige en una lista
+if "on_select" in inspect.signature(st.vega_lite_chart).parameters:
+    st.markdown("Haga clic en un punto para elegir el compromiso entre costo, "
+                "pérdida y tiempo de avance.")
+    evento = st.vega_lite_chart(grafico_pareto(frente), use_container_width=True,
+                                on_select="rerun", key="pareto")
+    elegidos = evento.selection.get("eleccion") or []
+    fila = int(elegidos[0]["fila"]) if elegidos else 0
+else:
+    st.vega_lite_chart(grafico_pareto(frente), use_container_width=True)
+    fila = st.selectbox(
+        "Diseño del frente", range(len(frente)),
+        format_func=lambda i: f"{i}: $ {frente.costo[i]:,.2f}")
+if fila >= len(frente):     # selección de un frente anterior
+    fila = 0
+
+# ===============================
+# DISEÑO ELEGIDO
+# ===============================
+st.markdown("## Diseño elegido")
+
+tabla = frente.tabla()
+st.dataframe(tabla.iloc[[fila]], hide_index=True, use_container_width=True)
+
+e, d1, sol2 = frente.solucion(entrada, fila)
+avance = tiempo_avance(e, d1, sol2)
+un, dos = graficos_avance(avance, sol2)
+st.vega_lite_chart(un if sol2 is None else dos, use_container_width=True)
+
+with st.expander("Frente completo"):
+    st.dataframe(tabla, hide_index=True, use_container_width=True)
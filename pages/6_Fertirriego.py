@@ -0,0 +1,119 @@
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from submain_engine import PVC_SDR, PE_PN, Entrada, disenar
+from submain_fertirriego import Programa, fertirriego
+from submain_graficos import grafico_fertirriego
+
+# ===============================
+# CONFIGURACIÓN GENERAL
+# ===============================
+st.set_page_config(page_title="Fertirriego", layout="wide")
+st.title("🧪 Fertirriego – transporte de la inyección")
+st.caption("Llegada, lavado y uniformidad de la dosis con el tiempo de avance discreto | Prof. Gregory Guevara")
+
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def diseno(entrada):
+    return disenar(entrada)
+
+
+@st.cache_data(max_entries=32, show_spinner="Simulando programas...")
+def simular(entrada, combinado, pulsos, desplazamientos, T_riego):
+    inicio, duracion, concentracion = (np.asarray(v, dtype=float) for v in zip(*pulsos))
+    programa = Programa(inicio + np.asarray(desplazamientos)[:, None], duracion, concentracion)
+    return fertirriego(diseno(entrada).avance, programa, T_riego, combinado)
+
+
+# ===============================
+# ENTRADAS
+# ===============================
+st.sidebar.header("📥 Datos de entrada")
+
+Q = st.sidebar.number_input("Caudal total (m³/h)", value=20.0)
+S = st.sidebar.number_input("Espaciamiento entre salidas (m)", value=1.0)
+LL = st.sidebar.number_input("Longitud total (m)", value=500.0)
+HF_disp = st.sidebar.number_input("Pérdida disponible (m)", value=2.0)
+C = st.sidebar.number_input("Coeficiente Hazen–Williams (C)", value=150)
+
+material = st.sidebar.selectbox("Material", ["PVC", "PE (HDPE)"])
+
+if material == "PVC":
+    clase = st.sidebar.selectbox("SDR", list(PVC_SDR.keys()), index=3)
+else:
+    clase = st.sidebar.selectbox("Clase PN", list(PE_PN.keys()))
+
+opcion = st.sidebar.radio("Diseño a evaluar", ["Un diámetro", "Dos diámetros"])
+
+st.sidebar.header("⏲️ Riego")
+
+hasta_lavar = st.sidebar.checkbox("Regar hasta lavar la tubería", value=False)
+T_riego = None if hasta_lavar else st.sidebar.number_input(
+    "Duración del riego (min)", value=120.0, min_value=1.0)
+
+st.sidebar.header("🔁 Comparar programas")
+
+n_programas = st.sidebar.slider("Programas (desplazando el inicio)", 1, 500, 100)
+desplazamiento_max = st.sidebar.number_input("Desplazamiento máximo (min)", value=60.0,
+                                             min_value=0.0)
+
+try:
+    entrada = Entrada(Q, S, LL, HF_disp, C, material, clase)
+except ValueError as ex:
+    st.error(f"❌ {ex}")
+    st.stop()
+
+d = diseno(entrada)
+combinado = opcion == "Dos diámetros"
+if (combinado and d.sol2 is None) or (not combinado and d.sol1.d1 is None):
+    st.warning("⚠️ Ningún diseño cumple con los datos ingresados.")
+    st.stop()
+
+# ===============================
+# PROGRAMA DE INYECCIÓN
+# ===============================
+st.markdown("## Programa de inyección")
+st.caption("Pulsos desde el inicio del riego; concentración en el agua de riego (g/L = kg/m³).")
+
+pulsos = st.data_editor(
+    pd.DataFrame({"Inicio (min)": [10.0], "Duración (min)": [30.0],
+                  "Concentración (g/L)": [1.0]}),
+    num_rows="dynamic", hide_index=True, use_container_width=True).dropna()
+if pulsos.empty:
+    st.warning("⚠️ Agregue al menos un pulso de inyección.")
+    st.stop()
+
+desplazamientos = np.linspace(0.0, desplazamiento_max, n_programas)
+
+try:
+    res = simular(entrada, combinado, tuple(pulsos.itertuples(index=False, name=None)),
+                  tuple(desplazamientos), T_riego)
+except ValueError as ex:
+    st.error(f"❌ {ex}")
+    st.stop()
+
+# ===============================
+# RESULTADOS
+# ===============================
+tabla = res.tabla()
+tabla.insert(0, "Desplazamiento (min)", np.round(desplazamientos, 2))
+
+mejor = int(np.nanargmax(res.UE)) if np.isfinite(res.UE).any() else 0
+i = st.number_input(f"Programa a detallar (0 a {len(res) - 1}; mejor UE: {mejor})",
+                    min_value=0, max_value=len(res) - 1, value=mejor, step=1)
+
+c1, c2, c3, c4 = st.columns(4)
+c1.metric("Lavado mínimo [min]", f"{res.lavado_min:.2f}")
+c2.metric("Riego mínimo [min]", f"{res.riego_min[i]:.2f}")
+c3.metric("UE de la dosis", f"{res.UE[i]:.3f}")
+c4.metric("Remanente en la tubería", f"{res.remanente[i]:.1%}")
+
+st.vega_lite_chart(grafico_fertirriego(res, i), use_container_width=True)
+st.caption("Rojo: dosis por salida. Azul: llegada del fertilizante (continua) y paso de la cola (trazos).")
+
+st.markdown("## Comparación de programas")
+st.dataframe(tabla, hide_index=True, use_container_width=True)
+
+with st.expander("Llegada, lavado y dosis por salida"):
+    st.dataframe(res.tabla_salidas(i), hide_index=True, use_container_width=True)
@@ -0,0 +1,202 @@
+"""
+Servicio HTTP/JSON local del diseño de secundarias.
+
+Expone el diseño con un diámetro, con dos diámetros y el tiempo de avance
+para otros sistemas. Cada solicitud se atiende en su propio hilo (con
+conexiones persistentes HTTP/1.1) y los resultados se memorizan en cachés
+LRU indexadas por la Entrada normalizada, de modo que las consultas
+repetidas no recalculan.
+
+Rutas (POST, cuerpo JSON con una entrada, una lista o {"lotes": [...]}):
+    /un_diametro  /dos_diametros  /avance  /diseno (las tres)
+    GET /salud    estado y estadísticas de las cachés
+
+Uso:
+    python submain_api.py --puerto 8765 --cache 4096
+
+Ejemplo:
+    curl -d '{"Q": 20, "S": 10, "LL": 100, "HF_disp": 1}' localhost:8765/diseno
+"""
+import argparse
+import json
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from submain_batch import (
+    ALIAS, MATERIAL_ALIAS, MODELO_ALIAS, VALORES_DEFECTO, texto_clase,
+)
+from submain_engine import (
+    Entrada, solucion_un_diametro, solucion_dos_diametros, t_avance_rapido,
+)
+
+CAMPOS = ("Q", "S", "LL", "HF_disp", "C", "material", "clase", "modelo", "temperatura")
+RUTAS = {
+    "/un_diametro": ("un_diametro",),
+    "/dos_diametros": ("dos_diametros",),
+    "/avance": ("avance",),
+    "/diseno": ("un_diametro", "dos_diametros", "avance"),
+}
+# Topes por solicitud: acotan la memoria y el tiempo de cada hilo
+MAX_SALIDAS = 10_000        # salidas (LL/S) por entrada
+MAX_LOTE = 1_000            # entradas por lote
+MAX_CUERPO = 1 << 20        # bytes del cuerpo JSON
+
+
+def entrada_desde_json(datos):
+    """
+    Entrada normalizada (alias, valores por defecto y tipos) desde un objeto
+    JSON. Toda entrada inválida (incluidos valores no finitos y más de
+    MAX_SALIDAS salidas) se informa con ValueError.
+    """
+    if not isinstance(datos, dict):
+        raise ValueError("Cada entrada debe ser un objeto JSON")
+    datos = {ALIAS.get(k, k): v for k, v in datos.items()}
+    datos = {**VALORES_DEFECTO, **datos}
+    faltan = [c for c in CAMPOS if c not in datos]
+    if faltan:
+        raise ValueError(f"Faltan campos: {', '.join(faltan)}")
+    material = str(datos["material"])
+    modelo = str(datos["modelo"])
+    try:
+        e = Entrada(
+            Q=float(datos["Q"]), S=float(datos["S"]), LL=float(datos["LL"]),
+            HF_disp=float(datos["HF_disp"]), C=float(datos["C"]),
+            material=MATERIAL_ALIAS.get(material, material),
+            clase=texto_clase(datos["clase"]),
+            modelo=MODELO_ALIAS.get(modelo, modelo),
+            temperatura=float(datos["temperatura"]),
+        )
+    except (TypeError, OverflowError) as err:
+        raise ValueError(str(err)) from None
+    if e.Salidas > MAX_SALIDAS:
+        raise ValueError(f"Demasiadas salidas (LL/S = {e.Salidas}); "
+                         f"el máximo es {MAX_SALIDAS}")
+    return e
+
+
+class Servicio:
+    """Cálculos del servicio, cada uno con su caché LRU de `cache` entradas."""
+
+    def __init__(self, cache=4096):
+        self.un_diametro = lru_cache(maxsize=cache)(self._un_diametro)
+        self.dos_diametros = lru_cache(maxsize=cache)(self._dos_diametros)
+        self.avance = lru_cache(maxsize=cache)(self._avance)
+        self._sol1 = lru_cache(maxsize=cache)(solucion_un_diametro)
+        self._sol2 = lru_cache(maxsize=cache)(solucion_dos_diametros)
+
+    def _un_diametro(self, e):
+        sol1 = self._sol1(e)
+        if sol1.d1 is None:
+            return {"d1": None}
+        i = int(sol1.cumple.argmax())
+        return {"d1": sol1.d1, "HF": float(sol1.hf[i]),
+                "V": float(sol1.velocidades[i]), "Salidas": e.Salidas}
+
+    def _dos_diametros(self, e):
+        sol2 = self._sol2(e)
+        if sol2 is None:
+            return None
+        return {"D1": sol2.D1, "L1": sol2.L1, "V1": sol2.V1,
+                "D2": sol2.D2, "L2": sol2.L2, "V2": sol2.V2, "HF": sol2.HF}
+
+    def _avance(self, e):
+        t_avance, t_avance_comb = t_avance_rapido(e, self._sol1(e).d1, self._sol2(e))
+        return {"t_avance": t_avance, "t_avance_comb": t_avance_comb}
+
+    def resolver(self, partes, datos):
+        try:
+            e = entrada_desde_json(datos)
+        except ValueError as err:
+            return {"error": str(err)}
+        return {p: getattr(self, p)(e) for p in partes}
+
+    def estadisticas(self):
+        return {nombre: getattr(self, nombre).cache_info()._asdict()
+                for nombre in ("un_diametro", "dos_diametros", "avance")}
+
+
+# ===============================
+# SERVIDOR HTTP
+# ===============================
+class Manejador(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"       # conexiones persistentes
+    disable_nagle_algorithm = True      # sin la espera de 40 ms del ACK retardado
+    servicio = None
+
+    def _responder(self, codigo, cuerpo):
+        datos = json.dumps(cuerpo, ensure_ascii=False).encode("utf-8")
+        self.send_response(codigo)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(datos)))
+        self.end_headers()
+        self.wfile.write(datos)
+
+    def do_GET(self):
+        if self.path != "/salud":
+            return self._responder(404, {"error": f"Ruta desconocida: {self.path}"})
+        self._responder(200, {"estado": "ok", "cache": self.servicio.estadisticas()})
+
+    def do_POST(self):
+        partes = RUTAS.get(self.path)
+        try:
+            largo = int(self.headers.get("Content-Length", 0))
+        except ValueError:
+            largo = -1
+        if not 0 <= largo <= MAX_CUERPO:
+            # El cuerpo no se puede leer ni descartar: se cierra la conexión
+            self.close_connection = True
+            return self._responder(400, {"error": "Content-Length inválido o mayor que "
+                                                  f"{MAX_CUERPO} bytes"})
+        cuerpo = self.rfile.read(largo)
+        if partes is None:
+            return self._responder(404, {"error": f"Ruta desconocida: {self.path}"})
+        try:
+            datos = json.loads(cuerpo)
+        except ValueError:
+            return self._responder(400, {"error": "JSON inválido"})
+
+        if isinstance(datos, dict) and "lotes" in datos:
+            datos = datos["lotes"]
+        if isinstance(datos, list):
+            if len(datos) > MAX_LOTE:
+                return self._responder(400, {
+                    "error": f"Demasiadas entradas en el lote ({len(datos)}); "
+                             f"el máximo es {MAX_LOTE}"})
+            self._responder(200, {"resultados": [
+                self.servicio.resolver(partes, d) for d in datos]})
+        else:
+            res = self.servicio.resolver(partes, datos)
+            self._responder(400 if "error" in res else 200, res)
+
+    def log_message(self, formato, *args):
+        # Sin una línea por solicitud: con miles por segundo domina el costo
+        pass
+
+
+def crear_servidor(host="127.0.0.1", puerto=8765, cache=4096):
+    manejador = type("ManejadorServicio", (Manejador,), {"servicio": Servicio(cache)})
+    servidor = ThreadingHTTPServer((host, puerto), manejador)
+    servidor.daemon_threads = True
+    return servidor
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Servicio HTTP/JSON del diseño de secundarias")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--puerto", type=int, default=8765)
+    parser.add_argument("--cache", type=int, default=4096,
+                        help="entradas de cada caché LRU (por defecto 4096)")
+    args = parser.parse_args(argv)
+
+    servidor = crear_servidor(args.host, args.puerto, args.cache)
+    print(f"Sirviendo en http://{args.host}:{args.puerto}")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+
+
+if __name__ == "__main__":
+    main()
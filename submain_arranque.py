@@ -0,0 +1,122 @@
+"""
+Perfil de arranque en frío de la interfaz web.
+
+En un intérprete nuevo (sin módulos ya cargados, como un contenedor recién
+escalado) mide:
+
+- la importación de streamlit;
+- la primera ejecución completa de submain_web.py (importaciones del
+  script y primer dibujo, con streamlit.testing) y una segunda ya en
+  caliente;
+- el tiempo de importación acumulado de cada paquete de primer nivel
+  (python -X importtime) y si matplotlib y ReportLab quedaron cargados.
+
+Con --presupuesto-ms termina con código 1 si la importación de streamlit
+más la primera ejecución superan el presupuesto.
+
+Uso:
+    python submain_arranque.py
+    python submain_arranque.py --presupuesto-ms 4000 --salida arranque.json
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent
+APP = RAIZ / "submain_web.py"
+
+# Se ejecuta en el intérprete nuevo; escribe el resultado en stdout
+_HIJO = """
+import json, sys, time
+t0 = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+t1 = time.perf_counter()
+at = AppTest.from_file(sys.argv[1], default_timeout=300)
+at.run()
+t2 = time.perf_counter()
+at.run()
+t3 = time.perf_counter()
+print(json.dumps({
+    "importar_streamlit_ms": (t1 - t0) * 1e3,
+    "primera_ejecucion_ms": (t2 - t1) * 1e3,
+    "segunda_ejecucion_ms": (t3 - t2) * 1e3,
+    "excepciones": [str(e.value) for e in at.exception],
+    "cargados": {m: m in sys.modules for m in ("matplotlib", "reportlab", "scipy")},
+}))
+"""
+
+# "import time: <propio> | <acumulado> | <módulo>"; sin sangría = primer nivel
+_LINEA = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def importaciones(texto, n=12):
+    """Los `n` paquetes de primer nivel con mayor tiempo de importación (ms)."""
+    paquetes = {}
+    for linea in texto.splitlines():
+        m = _LINEA.match(linea)
+        if m is None or len(m.group(3)) > 1:
+            continue
+        paquete = m.group(4).split(".")[0]
+        paquetes[paquete] = paquetes.get(paquete, 0.0) + int(m.group(2)) / 1e3
+    orden = sorted(paquetes.items(), key=lambda kv: -kv[1])[:n]
+    return {k: round(v, 1) for k, v in orden}
+
+
+def perfil_arranque(app=APP, env=None):
+    """Perfil de arranque de `app` en un intérprete nuevo."""
+    entorno = {**os.environ, **(env or {})}
+    entorno["PYTHONPATH"] = os.pathsep.join(
+        p for p in (str(RAIZ), entorno.get("PYTHONPATH")) if p)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _HIJO, str(app)],
+        cwd=RAIZ, env=entorno, capture_output=True, text=True, check=False)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr[-2000:])
+    res = json.loads(proc.stdout.strip().splitlines()[-1])
+    res["arranque_ms"] = res["importar_streamlit_ms"] + res["primera_ejecucion_ms"]
+    res["importaciones_ms"] = importaciones(proc.stderr)
+    return res
+
+
+# ===============================
+# LÍNEA DE COMANDOS
+# ===============================
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Perfil de arranque en frío de la interfaz web")
+    parser.add_argument("--app", default=str(APP), help="script de streamlit a medir")
+    parser.add_argument("--presupuesto-ms", type=float, default=None,
+                        help="arranque máximo admitido (ms)")
+    parser.add_argument("--salida", help="archivo JSON de resultados")
+    args = parser.parse_args(argv)
+
+    res = perfil_arranque(args.app)
+    print(f"Importar streamlit     {res['importar_streamlit_ms']:10.1f} ms")
+    print(f"Primera ejecución      {res['primera_ejecucion_ms']:10.1f} ms")
+    print(f"Segunda ejecución      {res['segunda_ejecucion_ms']:10.1f} ms")
+    print(f"Arranque en frío       {res['arranque_ms']:10.1f} ms")
+    print("Paquetes cargados: " + ", ".join(
+        f"{m}={'sí' if v else 'no'}" for m, v in res["cargados"].items()))
+    for paquete, ms in res["importaciones_ms"].items():
+        print(f"  import {paquete:20s} {ms:10.1f} ms")
+    for ex in res["excepciones"]:
+        print(f"EXCEPCIÓN: {ex}", file=sys.stderr)
+
+    if args.salida:
+        Path(args.salida).write_text(json.dumps(res, indent=2, ensure_ascii=False),
+                                     encoding="utf-8")
+    if res["excepciones"]:
+        return 1
+    if args.presupuesto_ms is not None and res["arranque_ms"] > args.presupuesto_ms:
+        print(f"PRESUPUESTO EXCEDIDO: {res['arranque_ms']:.0f} ms > "
+              f"{args.presupuesto_ms:.0f} ms", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,208 @@
+"""
+Diseño por lotes de tuberías secundarias.
+
+Lee filas (Q, S, LL, HF_disp, C, material, clase y, opcionalmente, modelo
+de fricción y temperatura) desde CSV o Parquet por
+bloques, resuelve el diseño con uno y dos diámetros y los tiempos de avance
+en un conjunto de procesos, y escribe los resultados por bloques, de modo
+que la memoria queda acotada sin importar el tamaño del archivo. Con
+--cache las soluciones se leen y guardan en la caché persistente en disco
+(submain_cache), compartida entre procesos, corridas y la interfaz web.
+
+Uso:
+    python submain_batch.py entrada.csv salida.csv --workers 8 --chunk 5000
+    python submain_batch.py entrada.csv salida.csv --cache ~/.cache/submain/disenos.sqlite
+"""
+import argparse
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from submain_engine import (
+    DARCY, HAZEN, Entrada, solucion_un_diametro, solucion_dos_diametros,
+    t_avance_rapido,
+)
+
+COLUMNAS = ("Q", "S", "LL", "HF_disp", "C", "material", "clase",
+            "modelo", "temperatura")
+ALIAS = {"L": "LL"}
+MATERIAL_ALIAS = {"PE": "PE (HDPE)", "HDPE": "PE (HDPE)"}
+MODELO_ALIAS = {"HW": HAZEN, "DW": DARCY}
+VALORES_DEFECTO = {"C": 150, "material": "PVC", "clase": "41",
+                   "modelo": HAZEN, "temperatura": 20.0}
+
+
+# ===============================
+# LECTURA Y ESCRITURA POR BLOQUES
+# ===============================
+def _es_parquet(ruta):
+    return str(ruta).lower().endswith((".parquet", ".pq"))
+
+
+def leer_bloques(ruta, chunk):
+    """Itera DataFrames de a lo sumo `chunk` filas."""
+    if _es_parquet(ruta):
+        import pyarrow.parquet as pq
+        for lote in pq.ParquetFile(ruta).iter_batches(batch_size=chunk):
+            yield lote.to_pandas()
+    else:
+        yield from pd.read_csv(ruta, chunksize=chunk,
+                               dtype={"material": str, "clase": str})
+
+
+class Escritor:
+    """Escribe bloques de resultados en CSV o Parquet, en orden."""
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+        self._parquet = None
+        self._primero = True
+
+    def escribir(self, df):
+        if _es_parquet(self.ruta):
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            tabla = pa.Table.from_pandas(df, preserve_index=False)
+            if self._parquet is None:
+                self._parquet = pq.ParquetWriter(self.ruta, tabla.schema)
+            self._parquet.write_table(tabla.cast(self._parquet.schema))
+        else:
+            df.to_csv(self.ruta, mode="w" if self._primero else "a",
+                      header=self._primero, index=False)
+        self._primero = False
+
+    def cerrar(self):
+        if self._parquet is not None:
+            self._parquet.close()
+
+
+# ===============================
+# DISEÑO DE UN BLOQUE
+# ===============================
+def texto_clase(clase):
+    """Clase SDR/PN como texto; 41.0 (leído como número) es la clase "41"."""
+    if isinstance(clase, (float, np.floating)) and float(clase).is_integer():
+        return str(int(clase))
+    return str(clase)
+
+
+def normalizar(df):
+    df = df.rename(columns=ALIAS)
+    faltan = [c for c in ("Q", "S", "LL", "HF_disp") if c not in df]
+    if faltan:
+        raise ValueError(f"Faltan columnas: {', '.join(faltan)}")
+    for col, valor in VALORES_DEFECTO.items():
+        if col not in df:
+            df[col] = valor
+    df["material"] = df["material"].astype(str).replace(MATERIAL_ALIAS)
+    df["clase"] = df["clase"].map(texto_clase)
+    df["modelo"] = df["modelo"].astype(str).replace(MODELO_ALIAS)
+    return df
+
+
+def disenar_fila(Q, S, LL, HF_disp, C, material, clase, modelo, temperatura,
+                 cache=None):
+    res = dict(Salidas=None, d1=None, HF1=None, V1=None, t_avance=None,
+               D1=None, L1=None, D2=None, L2=None, V2_1=None, V2_2=None,
+               HF2=None, t_avance_comb=None, error=None)
+    try:
+        e = Entrada(float(Q), float(S), float(LL), float(HF_disp),
+                    float(C), material, clase, modelo, float(temperatura))
+    except (ValueError, TypeError) as err:
+        res["error"] = str(err)
+        return res
+
+    try:
+        if cache is None:
+            sol1 = solucion_un_diametro(e)
+            sol2 = solucion_dos_diametros(e)
+        else:
+            sol1, sol2 = cache.sol1(e), cache.sol2(e)
+        t_avance, t_avance_comb = t_avance_rapido(e, sol1.d1, sol2)
+    except (ArithmeticError, MemoryError, ValueError) as err:
+        # Una fila inresoluble se informa como fallida sin detener el lote.
+        res["error"] = f"{type(err).__name__}: {err}"
+        return res
+    res["Salidas"] = e.Salidas
+    if sol1.d1 is not None:
+        i = int(sol1.cumple.argmax())
+        res.update(d1=sol1.d1, HF1=float(sol1.hf[i]),
+                   V1=float(sol1.velocidades[i]), t_avance=t_avance)
+    if sol2 is not None:
+        res.update(D1=sol2.D1, L1=sol2.L1, D2=sol2.D2, L2=sol2.L2,
+                   V2_1=sol2.V1, V2_2=sol2.V2, HF2=sol2.HF,
+                   t_avance_comb=t_avance_comb)
+    return res
+
+
+def disenar_bloque(df, cache=None):
+    """Diseña las filas de `df`; `cache` es la ruta de la caché en disco o None."""
+    df = normalizar(df)
+    if cache is not None:
+        from submain_cache import abrir
+        cache = abrir(cache)
+    filas = [disenar_fila(*fila, cache=cache) for fila in
+             zip(*(df[c].tolist() for c in COLUMNAS))]
+    res = pd.DataFrame(filas, index=df.index)
+    return pd.concat([df, res], axis=1)
+
+
+def procesar(bloques, workers, cache=None):
+    """
+    Resuelve los bloques en `workers` procesos, manteniendo el orden y a lo
+    sumo 2 * workers bloques en vuelo.
+    """
+    if workers <= 1:
+        yield from (disenar_bloque(b, cache) for b in bloques)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        en_vuelo = deque()
+        for bloque in bloques:
+            en_vuelo.append(pool.submit(disenar_bloque, bloque, cache))
+            if len(en_vuelo) >= 2 * workers:
+                yield en_vuelo.popleft().result()
+        while en_vuelo:
+            yield en_vuelo.popleft().result()
+
+
+# ===============================
+# LÍNEA DE COMANDOS
+# ===============================
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Diseño por lotes de tuberías secundarias de riego")
+    parser.add_argument("entrada", help="archivo CSV o Parquet de entrada")
+    parser.add_argument("salida", help="archivo CSV o Parquet de salida")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="procesos de cálculo (por defecto 1)")
+    parser.add_argument("--chunk", type=int, default=5000,
+                        help="filas por bloque (por defecto 5000)")
+    parser.add_argument("--cache", default=None,
+                        help="archivo de la caché persistente de diseños (SQLite)")
+    args = parser.parse_args(argv)
+
+    escritor = Escritor(args.salida)
+    filas = 0
+    t0 = time.perf_counter()
+    try:
+        for res in procesar(leer_bloques(args.entrada, args.chunk), args.workers,
+                            args.cache):
+            escritor.escribir(res)
+            filas += len(res)
+            dt = time.perf_counter() - t0
+            print(f"{filas} filas  {filas / dt:.0f} filas/s", file=sys.stderr)
+    finally:
+        escritor.cerrar()
+
+    dt = time.perf_counter() - t0
+    print(f"Total: {filas} filas en {dt:.2f} s ({filas / dt if dt else 0:.0f} filas/s)",
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+"""
+Banco de pruebas de rendimiento del diseño de secundarias.
+
+Genera escenarios realistas (100 m a 10 km, espaciamiento de 0.3 a 20 m,
+todas las clases SDR/PN), mide por separado cada etapa del cálculo y
+escribe los tiempos en JSON. Compara la mediana de cada etapa con la base
+guardada y termina con código 1 cuando alguna empeora más que la
+tolerancia, o con código 2 si la base no existe (la compuerta nunca pasa
+en silencio sin base; créela con --guardar-base en la máquina de
+referencia).
+
+Uso:
+    python submain_bench.py --escenarios 200 --salida bench.json
+    python submain_bench.py --guardar-base          # fija la base actual
+    python submain_bench.py --base bench_base.json  # compara contra la base
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+from submain_engine import (
+    MATERIALES, Entrada, factor_christiansen, solucion_un_diametro,
+    solucion_dos_diametros, tiempo_avance,
+)
+from submain_telescoping import solucion_telescopica
+
+BASE_DEFECTO = "bench_base.json"
+ETAPAS = (
+    "factor_christiansen",
+    "un_diametro",
+    "dos_diametros",
+    "telescopica",
+    "tiempo_avance",
+    "tabla_avance",
+    "grafico",
+    "pdf",
+)
+# Etapas de microsegundos: se repiten para que el reloj las resuelva
+REPETICIONES = {"factor_christiansen": 1000}
+
+
+# ===============================
+# ESCENARIOS
+# ===============================
+def escenarios(n, semilla=0):
+    """
+    n entradas con longitud y espaciamiento log-uniformes; las clases
+    SDR/PN se recorren en orden para que todas aparezcan.
+    """
+    rng = np.random.default_rng(semilla)
+    clases = [(m, c) for m in MATERIALES for c in MATERIALES[m]]
+    for i in range(n):
+        material, clase = clases[i % len(clases)]
+        LL = float(np.exp(rng.uniform(np.log(100), np.log(10_000))))
+        S = float(np.exp(rng.uniform(np.log(0.3), np.log(20))))
+        yield Entrada(
+            Q=round(float(rng.uniform(2, 100)), 1),
+            S=round(S, 2),
+            LL=round(LL),
+            HF_disp=round(float(rng.uniform(0.5, 10)), 2),
+            C=float(rng.choice([130, 140, 150])),
+            material=material,
+            clase=clase,
+        )
+
+
+# ===============================
+# MEDICIÓN
+# ===============================
+def _medir(tiempos, etapa, fn, *args):
+    rep = REPETICIONES.get(etapa, 1)
+    t0 = time.perf_counter()
+    for _ in range(rep):
+        res = fn(*args)
+    tiempos[etapa].append((time.perf_counter() - t0) / rep)
+    return res
+
+
+def medir(entradas, n_graficos=5):
+    """
+    Tiempos (s) por etapa y escenario. El gráfico y el PDF se miden sólo
+    en los primeros `n_graficos` escenarios (0 para omitirlos).
+    """
+    tiempos = {etapa: [] for etapa in ETAPAS}
+    for i, e in enumerate(entradas):
+        _medir(tiempos, "factor_christiansen", factor_christiansen, e.Salidas)
+        sol1 = _medir(tiempos, "un_diametro", solucion_un_diametro, e)
+        sol2 = _medir(tiempos, "dos_diametros", solucion_dos_diametros, e)
+        _medir(tiempos, "telescopica", solucion_telescopica, e)
+        avance = _medir(tiempos, "tiempo_avance", tiempo_avance, e, sol1.d1, sol2)
+        _medir(tiempos, "tabla_avance", avance.tabla)
+
+        if i < n_graficos and sol1.d1 is not None:
+            from submain_report import grafico_png, memoria_pdf
+            png = _medir(tiempos, "grafico", grafico_png, avance, sol2)
+            _medir(tiempos, "pdf", memoria_pdf, e, sol1.d1, avance, sol2, png)
+    return tiempos
+
+
+def resumir(tiempos):
+    res = {}
+    for etapa, t in tiempos.items():
+        if not t:
+            continue
+        t = np.array(t)
+        res[etapa] = {
+            "n": int(t.size),
+            "mediana_ms": float(np.median(t) * 1e3),
+            "p95_ms": float(np.percentile(t, 95) * 1e3),
+            "max_ms": float(t.max() * 1e3),
+            "total_s": float(t.sum()),
+        }
+    return res
+
+
+def comparar(actual, base, tolerancia):
+    """Etapas cuya mediana supera la de la base en más de `tolerancia`."""
+    regresiones = {}
+    for etapa, r in actual.items():
+        if etapa not in base:
+            continue
+        razon = r["mediana_ms"] / max(base[etapa]["mediana_ms"], 1e-9)
+        if razon > 1 + tolerancia:
+            regresiones[etapa] = razon
+    return regresiones
+
+
+# ===============================
+# LÍNEA DE COMANDOS
+# ===============================
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Banco de rendimiento por etapas del diseño de secundarias")
+    parser.add_argument("--escenarios", type=int, default=100)
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--graficos", type=int, default=5,
+                        help="escenarios en los que se mide gráfico y PDF")
+    parser.add_argument("--salida", help="archivo JSON de resultados")
+    parser.add_argument("--base", default=BASE_DEFECTO,
+                        help=f"base de comparación (por defecto {BASE_DEFECTO})")
+    parser.add_argument("--guardar-base", action="store_true",
+                        help="guarda los resultados como nueva base")
+    parser.add_argument("--tolerancia", type=float, default=0.25,
+                        help="empeoramiento relativo admitido (por defecto 0.25)")
+    args = parser.parse_args(argv)
+
+    tiempos = medir(escenarios(args.escenarios, args.semilla), args.graficos)
+    etapas = resumir(tiempos)
+    resultado = {
+        "meta": {
+            "fecha": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "plataforma": platform.platform(),
+            "escenarios": args.escenarios,
+            "semilla": args.semilla,
+        },
+        "etapas": etapas,
+    }
+
+    for etapa, r in etapas.items():
+        print(f"{etapa:20s} mediana {r['mediana_ms']:10.4f} ms   "
+              f"p95 {r['p95_ms']:10.4f} ms   n={r['n']}")
+
+    texto = json.dumps(resultado, indent=2, ensure_ascii=False)
+    if args.salida:
+        Path(args.salida).write_text(texto, encoding="utf-8")
+    if args.guardar_base:
+        Path(args.base).write_text(texto, encoding="utf-8")
+        print(f"Base guardada en {args.base}")
+        return 0
+
+    base = Path(args.base)
+    if not base.exists():
+        print(f"ERROR: sin base en {base}; use --guardar-base para crearla",
+              file=sys.stderr)
+        return 2
+    regresiones = comparar(etapas, json.loads(base.read_text(encoding="utf-8"))["etapas"],
+                           args.tolerancia)
+    for etapa, razon in regresiones.items():
+        print(f"REGRESIÓN {etapa}: {razon:.2f}x la base", file=sys.stderr)
+    return 1 if regresiones else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,179 @@
+"""
+Caché persistente de diseños en disco (SQLite).
+
+Guarda los resultados de solucion_un_diametro, solucion_dos_diametros y
+tiempo_avance indexados por contenido: la clave es un hash SHA-256 de los
+campos de la Entrada (o Perfil, incluidas sus posiciones y caudales), del
+tipo de resultado y de la versión del motor. Así las secundarias repetidas
+entre proyectos, reinicios de Streamlit o procesos del diseño por lotes se
+leen en lugar de recalcularse.
+
+- Concurrencia: SQLite en modo WAL (lectores sin bloqueo mientras otro
+  proceso escribe) con espera ante bloqueos; una conexión por hilo y por
+  proceso.
+- Desalojo: cuando el tamaño de los resultados supera `max_mb` se borran
+  los menos usados recientemente hasta bajar al 90 %. El último uso se
+  actualiza con resolución de una hora para que las lecturas no escriban.
+- Versión: la versión del motor es el hash del código de submain_engine y
+  forma parte de la clave, de modo que cualquier cambio de las fórmulas
+  deja de leer las entradas anteriores. Éstas no se borran al abrir (otro
+  proceso con otra versión puede compartir el archivo): salen por el
+  desalojo de las menos usadas o, al abrir, si llevan más de EDAD_VERSION
+  sin usarse.
+
+Los resultados se guardan con pickle: la caché es local y del usuario.
+"""
+import dataclasses
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+
+import submain_engine
+from submain_engine import solucion_un_diametro, solucion_dos_diametros, tiempo_avance
+
+RUTA_DEFECTO = Path.home() / ".cache" / "submain" / "disenos.sqlite"
+MAX_MB = 256
+RESOLUCION_USO = 3600       # s entre actualizaciones del último uso de una entrada
+REVISION_TAMANO = 64        # escrituras entre revisiones del tamaño total
+EDAD_VERSION = 30 * 86400   # s sin uso tras los que se borran entradas de otra versión
+
+
+@lru_cache(maxsize=None)
+def version_motor():
+    """Hash del código fuente del motor hidráulico."""
+    return hashlib.sha256(Path(submain_engine.__file__).read_bytes()).hexdigest()[:16]
+
+
+def clave(tipo, e):
+    """Dirección por contenido del resultado `tipo` para la entrada `e`."""
+    h = hashlib.sha256(f"{version_motor()}|{tipo}|{type(e).__name__}".encode())
+    for f in dataclasses.fields(e):
+        if not f.init:
+            continue
+        valor = getattr(e, f.name)
+        if isinstance(valor, np.ndarray):
+            h.update(np.ascontiguousarray(valor, dtype=float).tobytes())
+        elif isinstance(valor, (int, float, np.number)) and not isinstance(valor, bool):
+            # C=150 y C=150.0 son la misma entrada
+            h.update(repr(float(valor)).encode())
+        else:
+            h.update(repr(valor).encode())
+        h.update(b"|")
+    return h.hexdigest()
+
+
+class CacheDisenos:
+    """Caché de diseños en el archivo SQLite `ruta`, de a lo sumo `max_mb` MB."""
+
+    def __init__(self, ruta=RUTA_DEFECTO, max_mb=MAX_MB):
+        self.ruta = Path(ruta)
+        self.max_bytes = int(max_mb * 2**20)
+        self.aciertos = 0
+        self.fallos = 0
+        self._local = threading.local()
+        self._cerrojo = threading.Lock()      # contadores compartidos entre hilos
+        self._escrituras = 0
+        self.ruta.parent.mkdir(parents=True, exist_ok=True)
+
+        con = self._conexion()
+        con.execute("""CREATE TABLE IF NOT EXISTS disenos (
+                           clave TEXT PRIMARY KEY,
+                           version TEXT NOT NULL,
+                           tipo TEXT NOT NULL,
+                           valor BLOB NOT NULL,
+                           tamano INTEGER NOT NULL,
+                           usado REAL NOT NULL)""")
+        con.execute("CREATE INDEX IF NOT EXISTS disenos_usado ON disenos (usado)")
+        con.execute("DELETE FROM disenos WHERE version != ? AND usado < ?",
+                    (version_motor(), time.time() - EDAD_VERSION))
+
+    def _conexion(self):
+        """Conexión propia del hilo y del proceso (no se heredan al bifurcar)."""
+        con = getattr(self._local, "con", None)
+        if con is None or self._local.pid != os.getpid():
+            con = sqlite3.connect(self.ruta, timeout=30, isolation_level=None)
+            con.execute("PRAGMA journal_mode=WAL")
+            con.execute("PRAGMA synchronous=NORMAL")
+            self._local.con, self._local.pid = con, os.getpid()
+        return con
+
+    # ===============================
+    # LECTURA Y ESCRITURA
+    # ===============================
+    def obtener(self, tipo, e, calcular):
+        """Resultado `tipo` de `e` desde la caché o, si falta, calcular(e)."""
+        k = clave(tipo, e)
+        con = self._conexion()
+        fila = con.execute("SELECT valor, usado FROM disenos WHERE clave = ?",
+                           (k,)).fetchone()
+        ahora = time.time()
+        if fila is not None:
+            with self._cerrojo:
+                self.aciertos += 1
+            if ahora - fila[1] > RESOLUCION_USO:
+                con.execute("UPDATE disenos SET usado = ? WHERE clave = ?", (ahora, k))
+            return pickle.loads(fila[0])
+
+        with self._cerrojo:
+            self.fallos += 1
+        valor = calcular(e)
+        datos = pickle.dumps(valor, protocol=pickle.HIGHEST_PROTOCOL)
+        con.execute("INSERT OR REPLACE INTO disenos VALUES (?, ?, ?, ?, ?, ?)",
+                    (k, version_motor(), tipo, datos, len(datos), ahora))
+        with self._cerrojo:
+            self._escrituras += 1
+            revisar = self._escrituras % REVISION_TAMANO == 0
+        if revisar:
+            self.desalojar()
+        return valor
+
+    def desalojar(self):
+        """Borra las entradas menos usadas hasta bajar al 90 % de max_bytes."""
+        con = self._conexion()
+        total = con.execute("SELECT COALESCE(SUM(tamano), 0) FROM disenos").fetchone()[0]
+        if total <= self.max_bytes:
+            return 0
+        sobra = total - int(0.9 * self.max_bytes)
+        cur = con.execute("""
+            DELETE FROM disenos WHERE clave IN (
+                SELECT clave FROM (
+                    SELECT clave, tamano,
+                           SUM(tamano) OVER (ORDER BY usado, clave) AS acumulado
+                    FROM disenos)
+                WHERE acumulado - tamano < ?)""", (sobra,))
+        return cur.rowcount
+
+    def vaciar(self):
+        self._conexion().execute("DELETE FROM disenos")
+
+    def estadisticas(self):
+        n, tamano = self._conexion().execute(
+            "SELECT COUNT(*), COALESCE(SUM(tamano), 0) FROM disenos").fetchone()
+        return {"entradas": n, "MB": tamano / 2**20, "aciertos": self.aciertos,
+                "fallos": self.fallos, "version": version_motor()}
+
+    # ===============================
+    # RESULTADOS DEL DISEÑO
+    # ===============================
+    def sol1(self, e):
+        return self.obtener("sol1", e, solucion_un_diametro)
+
+    def sol2(self, e):
+        return self.obtener("sol2", e, solucion_dos_diametros)
+
+    def avance(self, e):
+        return self.obtener(
+            "avance", e, lambda e: tiempo_avance(e, self.sol1(e).d1, self.sol2(e)))
+
+
+@lru_cache(maxsize=None)
+def abrir(ruta=RUTA_DEFECTO, max_mb=MAX_MB):
+    """Caché compartida por todo el proceso para `ruta`."""
+    return CacheDisenos(ruta, max_mb)
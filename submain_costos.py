@@ -0,0 +1,308 @@
+"""
+Diseño por costo: frente de Pareto sobre todo el catálogo.
+
+La selección de la interfaz toma, dentro de la clase elegida, el menor
+diámetro que cumple o el primer par adyacente que cumple. Aquí se
+enumeran todas las clases SDR/PN de todos los materiales, todos los
+diámetros solos y todos los pares D1 > D2 (no sólo adyacentes) con cada
+longitud de corte L1, y se conservan los diseños factibles (HF <= HF_disp
+y V <= V_MAX) no dominados en
+
+    costo de la tubería ($)  ·  pérdida HF (m)  ·  tiempo de avance (min)
+
+Por clase todo se evalúa con arreglos de NumPy sobre la malla
+(pares × cortes); el tiempo de avance de cada corte sale de la suma
+acumulada de ΔL / q por tramo, con el mismo criterio que tiempo_avance.
+Con Hazen–Williams se usa el C de la entrada para todas las clases.
+
+Uso:
+    python submain_costos.py --Q 20 --S 1 --LL 2000 --HF 4
+"""
+import argparse
+import dataclasses
+import sys
+import time
+from dataclasses import dataclass
+
+import numpy as np
+
+from submain_engine import (
+    DARCY, MATERIALES, V_MAX, Entrada, SolucionDosDiametros,
+    etiqueta_material, hf_tramos, tabla_un_diametro,
+)
+
+# ===============================
+# PRECIOS DE REFERENCIA
+# ===============================
+# $/m de tubería, en el mismo orden que PVC_SDR y PE_PN. Calculados por
+# peso (espesor según SDR; PE100 con PN6 ≈ SDR 26, PN8 ≈ SDR 21 y
+# PN10 ≈ SDR 17); deben reemplazarse por la lista del proveedor.
+PRECIO_PVC_SDR = {
+    "17": [1.12, 1.47, 2.3, 2.41, 5.0, 8.27, 17.92, 30.38],
+    "26": [0.46, 0.75, 0.99, 1.54, 2.26, 3.34, 5.53,
+           11.97, 20.3, 31.54, 44.36],
+    "32.5": [0.59, 0.79, 1.24, 1.82, 2.69, 4.46,
+             9.66, 16.37, 25.42, 35.77],
+    "41": [0.48, 0.63, 0.99, 1.45, 2.15, 3.55,
+           7.71, 13.06, 20.29, 28.54, 41.1]
+}
+
+PRECIO_PE_PN = {
+    "PN6": [0.51, 0.8, 1.27, 1.81, 2.64, 3.96,
+            5.14, 6.45, 8.37, 10.59, 13.08],
+    "PN8": [0.39, 0.61, 0.96, 1.52, 2.19, 3.15,
+            4.73, 6.1, 7.67, 9.98, 12.67, 15.46],
+    "PN10": [0.45, 0.7, 1.1, 1.75, 2.49, 3.58,
+             5.36, 6.91, 8.69, 11.32, 14.33, 17.7]
+}
+
+PRECIOS = {
+    "PVC": PRECIO_PVC_SDR,
+    "PE (HDPE)": PRECIO_PE_PN,
+}
+
+
+def clases_catalogo():
+    """Todas las clases (material, clase) de MATERIALES."""
+    return tuple((m, c) for m in MATERIALES for c in MATERIALES[m])
+
+
+def _precios_ordenados(material, clase, precios):
+    """Precios de la clase en el orden de catalogo() (diámetro creciente)."""
+    d = np.asarray(MATERIALES[material][clase], dtype=float)
+    try:
+        p = np.asarray(precios[material][clase], dtype=float)
+    except KeyError:
+        raise ValueError(f"Sin precios para {etiqueta_material(material, clase)}") from None
+    if p.shape != d.shape:
+        raise ValueError(f"{etiqueta_material(material, clase)}: se esperaban "
+                         f"{d.size} precios y hay {p.size}")
+    if not (np.isfinite(p).all() and (p > 0).all()):
+        raise ValueError(f"{etiqueta_material(material, clase)}: los precios deben ser positivos")
+    return p[np.argsort(d, kind="stable")]
+
+
+# ===============================
+# ALTERNATIVAS
+# ===============================
+@dataclass(frozen=True)
+class Alternativas:
+    """
+    Diseños factibles, uno por fila. Un diámetro solo tiene D2 = NaN y
+    L2 = 0; `grupo` indexa `clases`.
+    """
+    clases: tuple
+    grupo: np.ndarray
+    D1: np.ndarray
+    L1: np.ndarray
+    V1: np.ndarray
+    D2: np.ndarray
+    L2: np.ndarray
+    V2: np.ndarray
+    costo: np.ndarray       # $
+    HF: np.ndarray          # m
+    t_avance: np.ndarray    # min
+    evaluadas: int = 0      # diseños enumerados, factibles o no
+
+    def __len__(self):
+        return len(self.costo)
+
+    def subconjunto(self, idx):
+        return dataclasses.replace(self, **{
+            f.name: getattr(self, f.name)[idx] for f in dataclasses.fields(self)
+            if isinstance(getattr(self, f.name), np.ndarray)})
+
+    def etiquetas(self):
+        return np.array([etiqueta_material(*c) for c in self.clases], dtype=object)[self.grupo]
+
+    def tabla(self):
+        import pandas as pd
+        return pd.DataFrame({
+            "Clase": self.etiquetas(),
+            "D1 (mm)": self.D1,
+            "L1 (m)": np.round(self.L1, 2),
+            "D2 (mm)": self.D2,
+            "L2 (m)": np.round(self.L2, 2),
+            "Costo ($)": np.round(self.costo, 2),
+            "HF (m)": np.round(self.HF, 3),
+            "Tiempo de avance (min)": np.round(self.t_avance, 2),
+        })
+
+    def solucion(self, e, i):
+        """
+        (entrada con la clase de la fila i, d1, sol2) para calcular el
+        perfil de avance o la memoria del diseño elegido.
+        """
+        material, clase = self.clases[self.grupo[i]]
+        ei = dataclasses.replace(e, material=material, clase=clase)
+        if np.isnan(self.D2[i]):
+            return ei, float(self.D1[i]), None
+        return ei, None, SolucionDosDiametros(
+            D1=float(self.D1[i]), L1=float(self.L1[i]), V1=float(self.V1[i]),
+            D2=float(self.D2[i]), L2=float(self.L2[i]), V2=float(self.V2[i]),
+            HF=float(self.HF[i]))
+
+
+def _clase(e, precios, W, m1, bloque):
+    """Columnas de los diseños factibles de la clase de `e`."""
+    cat = e.catalogo
+    p = _precios_ordenados(e.material, e.clase, precios)
+    n = len(cat)
+    cols = []
+
+    # --- Un diámetro
+    V, HF = tabla_un_diametro(e)
+    ok = np.flatnonzero((V <= V_MAX) & (HF <= e.HF_disp))
+    nan = np.full(ok.size, np.nan)
+    cols.append((cat.d[ok], np.full(ok.size, e.LL), V[ok], nan, np.zeros(ok.size),
+                 nan, p[ok] * e.LL, HF[ok], 60 * cat.A[ok] * W[-1]))
+    evaluadas = n
+
+    # --- Dos diámetros: D1 = d[i] aguas arriba, D2 = d[j] aguas abajo, i > j
+    L1, L2, Q2, hf_up, hf_dn = e.particiones()
+    if n < 2 or L1.size == 0:
+        return cols, evaluadas
+    if e.modelo == DARCY:
+        P = np.zeros((n, e.Salidas + 1))
+        np.cumsum(hf_tramos(e), axis=1, out=P[:, 1:])
+        corte = np.minimum(np.arange(1, L1.size + 1), e.Salidas)
+    sup, inf = np.nonzero(np.tri(n, k=-1, dtype=bool))
+    evaluadas += sup.size * L1.size
+    V1 = e.Q / cat.A / 3600
+    pares = np.flatnonzero(V1[sup] <= V_MAX)
+    sup, inf = sup[pares], inf[pares]
+
+    filas = max(1, bloque // L1.size)
+    for b0 in range(0, sup.size, filas):
+        i, j = sup[b0:b0 + filas], inf[b0:b0 + filas]
+        if e.modelo == DARCY:
+            HF = P[i][:, corte] + P[j, -1:] - P[j][:, corte]
+        else:
+            HF = hf_up * cat.k[i, None] + hf_dn * cat.k[j, None]
+        V2 = Q2 / cat.A[j, None] / 3600
+        r, c = np.nonzero((HF <= e.HF_disp) & (V2 <= V_MAX))
+        if r.size == 0:
+            continue
+        i, j = i[r], j[r]
+        w = W[m1[c]]
+        cols.append((cat.d[i], L1[c], V1[i], cat.d[j], L2[c], V2[r, c],
+                     p[i] * L1[c] + p[j] * L2[c], HF[r, c],
+                     60 * (cat.A[i] * w + cat.A[j] * (W[-1] - w))))
+    return cols, evaluadas
+
+
+def alternativas(e, precios=PRECIOS, clases=None, bloque=1_000_000):
+    """
+    Todos los diseños factibles de `e` (Entrada o Perfil) con uno o dos
+    diámetros en las `clases` (por defecto, todo el catálogo). La malla de
+    cada clase se recorre en bloques de a lo sumo `bloque` elementos.
+    """
+    clases = clases_catalogo() if clases is None else tuple(clases)
+    long_acum, dl, q = e.tramos()
+    # W[m]: Σ ΔL / q de las primeras m salidas; m1: salidas con long_acum <= L1
+    W = np.concatenate(([0.0], np.cumsum(dl / q)))
+    m1 = np.searchsorted(long_acum, e.particiones()[0], side="right")
+
+    grupos, columnas, evaluadas = [], [], 0
+    for g, (material, clase) in enumerate(clases):
+        cols, n = _clase(dataclasses.replace(e, material=material, clase=clase),
+                         precios, W, m1, bloque)
+        evaluadas += n
+        for col in cols:
+            grupos.append(np.full(col[0].size, g, dtype=np.int16))
+            columnas.append(col)
+
+    nombres = ("D1", "L1", "V1", "D2", "L2", "V2", "costo", "HF", "t_avance")
+    datos = {k: np.concatenate([c[n] for c in columnas]) if columnas else np.empty(0)
+             for n, k in enumerate(nombres)}
+    return Alternativas(clases, np.concatenate(grupos) if grupos else np.empty(0, np.int16),
+                        evaluadas=evaluadas, **datos)
+
+
+# ===============================
+# FRENTE DE PARETO
+# ===============================
+def no_dominados(a, b, c, bloque=1024):
+    """
+    Índices de los puntos (a, b, c) no dominados al minimizar las tres
+    columnas, ordenados por a. Se recorren en bloques en orden de a y se
+    mantiene la escalera de (b, c) ya vistos: un punto está dominado si
+    algún punto de la escalera con b <= su b tiene c <= su c. Los
+    repetidos se conservan una vez.
+    """
+    a, b, c = (np.asarray(x, dtype=float) for x in (a, b, c))
+    orden = np.argsort(a, kind="stable")
+    a, b, c = a[orden], b[orden], c[orden]
+    # Los empates de a no se reparten entre dos bloques
+    cortes = np.unique(np.searchsorted(a, a[::bloque], side="left"))
+    cortes = np.append(cortes, a.size)
+
+    esc_b = esc_c = np.empty(0)     # b creciente, c decreciente
+    frente = []
+    for s, f in zip(cortes[:-1], cortes[1:]):
+        idx = np.arange(s, f)
+        if esc_b.size:
+            k = np.searchsorted(esc_b, b[idx], side="right") - 1
+            idx = idx[(k < 0) | (esc_c[np.maximum(k, 0)] > c[idx])]
+        # Dominancia entre los candidatos del bloque: j domina a i si es
+        # anterior, o si empata en a y mejora en b o en c
+        aa, bb, cc = a[idx, None], b[idx, None], c[idx, None]
+        mejor = (bb.T < bb) | (cc.T < cc)
+        antes = np.tri(idx.size, k=-1, dtype=bool) | ((aa.T == aa) & mejor)
+        idx = idx[~((bb.T <= bb) & (cc.T <= cc) & antes).any(axis=1)]
+        if idx.size == 0:
+            continue
+        frente.append(idx)
+
+        # Inserción ordenada en la escalera; a igual b el nuevo queda antes
+        bb, cc = b[idx], c[idx]
+        o = np.lexsort((cc, bb))
+        bb, cc = bb[o], cc[o]
+        pos = np.searchsorted(esc_b, bb, side="left")
+        bb, cc = np.insert(esc_b, pos, bb), np.insert(esc_c, pos, cc)
+        previo = np.minimum.accumulate(cc)
+        queda = np.concatenate(([True], cc[1:] < previo[:-1]))
+        esc_b, esc_c = bb[queda], cc[queda]
+    return orden[np.concatenate(frente)] if frente else np.empty(0, dtype=int)
+
+
+def frente_pareto(e, precios=PRECIOS, clases=None):
+    """Diseños factibles no dominados en costo, HF y tiempo de avance."""
+    alt = alternativas(e, precios, clases)
+    return alt.subconjunto(no_dominados(alt.costo, alt.HF, alt.t_avance))
+
+
+# ===============================
+# LÍNEA DE COMANDOS
+# ===============================
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Frente de Pareto costo–pérdida–tiempo de avance sobre todo el catálogo")
+    parser.add_argument("--Q", type=float, required=True, help="caudal total (m³/h)")
+    parser.add_argument("--S", type=float, required=True, help="espaciamiento (m)")
+    parser.add_argument("--LL", type=float, required=True, help="longitud total (m)")
+    parser.add_argument("--HF", type=float, required=True, help="pérdida disponible (m)")
+    parser.add_argument("--C", type=float, default=150)
+    parser.add_argument("--salida", help="CSV del frente")
+    args = parser.parse_args(argv)
+
+    e = Entrada(args.Q, args.S, args.LL, args.HF, args.C)
+    t0 = time.perf_counter()
+    alt = alternativas(e)
+    t1 = time.perf_counter()
+    frente = alt.subconjunto(no_dominados(alt.costo, alt.HF, alt.t_avance))
+    t2 = time.perf_counter()
+
+    print(f"{alt.evaluadas:,} diseños enumerados, {len(alt):,} factibles, "
+          f"{len(frente):,} en el frente")
+    print(f"Enumeración {1e3 * (t1 - t0):.0f} ms, frente {1e3 * (t2 - t1):.0f} ms")
+    tabla = frente.tabla()
+    if args.salida:
+        tabla.to_csv(args.salida, index=False)
+    else:
+        print(tabla.head(20).to_string(index=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,177 @@
+"""
+Caudal de emisores dependiente de la presión.
+
+Cada salida entrega q = k·h**x, con h la presión en la salida, de modo que
+los caudales dependen de la pérdida por fricción que ellos mismos generan.
+Para un diseño dado (un diámetro por tramo), la cota de cada salida y la
+presión a la entrada se resuelve el perfil acoplado presión/caudal con una
+iteración de punto fijo sobre todas las salidas a la vez,
+
+    h = H0 - cota - cumsum(hf(Q_tramo(q(h))))
+
+acelerada con el método de Anderson (combinación por mínimos cuadrados de
+las últimas iteraciones). Cada iteración es lineal en el número de salidas.
+Si el residuo crece se reinicia la memoria y se amortigua el paso. Cuando
+la presión llega a cero en parte de la tubería (salidas secas) el perfil
+deja de ser suave y puede no converger; se informa en `convergio`.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+from submain_engine import K_HW, area
+
+
+@dataclass(frozen=True)
+class Emisor:
+    k: float            # coeficiente de descarga (m³/h por m**x)
+    x: float = 0.5      # exponente de descarga (0.5 orificio, 0 autocompensado)
+
+    @classmethod
+    def nominal(cls, q, h, x=0.5):
+        """Emisor que entrega el caudal q (m³/h) a la presión h (m)."""
+        return cls(k=q / h**x, x=x)
+
+    def caudal(self, h):
+        """Caudal (m³/h) a la presión h; nulo si h <= 0."""
+        return np.where(h > 0, self.k * np.maximum(h, 0.0)**self.x, 0.0)
+
+
+@dataclass(frozen=True)
+class PerfilPresion:
+    long_acum: np.ndarray       # posición de cada salida (m)
+    presion: np.ndarray         # presión en cada salida (m)
+    caudal: np.ndarray          # caudal de cada salida (m³/h)
+    q_tramo: np.ndarray         # caudal de cada tramo (m³/h)
+    v_tramo: np.ndarray         # velocidad de cada tramo (m/s)
+    hf_tramo: np.ndarray        # pérdida por fricción de cada tramo (m)
+    convergio: bool
+    iteraciones: int
+    residuo: float              # máxima corrección de presión al terminar (m)
+    historial: np.ndarray       # residuo de cada iteración (m)
+
+    @property
+    def Q(self):
+        return float(self.q_tramo[0])
+
+    @property
+    def HF(self):
+        return float(self.hf_tramo.sum())
+
+    @property
+    def CU(self):
+        """
+        Coeficiente de uniformidad de Christiansen del caudal; las salidas
+        secas cuentan con caudal nulo, y el valor se acota en 0.
+        """
+        q = self.caudal
+        if q.mean() <= 0:
+            return 0.0
+        return max(0.0, float(1 - np.abs(q - q.mean()).mean() / q.mean()))
+
+    @property
+    def UE(self):
+        """Uniformidad de emisión: media del cuarto inferior / media."""
+        q = np.sort(self.caudal)
+        return float(q[:max(1, len(q) // 4)].mean() / q.mean())
+
+    @property
+    def secas(self):
+        """Salidas sin presión (no entregan caudal)."""
+        return int((self.presion <= 0).sum())
+
+    @property
+    def q_var(self):
+        """Variación de caudal (q_max - q_min) / q_max."""
+        return float(1 - self.caudal.min() / self.caudal.max())
+
+    def tabla(self):
+        import pandas as pd
+        return pd.DataFrame({
+            "Longitud acumulada (m)": self.long_acum,
+            "Presión (m)": np.round(self.presion, 3),
+            "Caudal salida (m³/h)": np.round(self.caudal, 4),
+            "Caudal tramo (m³/h)": np.round(self.q_tramo, 3),
+            "Velocidad (m/s)": np.round(self.v_tramo, 3),
+        })
+
+
+# ===============================
+# SOLUCIÓN ACOPLADA PRESIÓN / CAUDAL
+# ===============================
+def resolver_presiones(e, diametros, emisor, H0, cota=None, tol=1e-6,
+                       max_iter=300, memoria=5):
+    """
+    Perfil de presión y caudal para la entrada `e` (Entrada o Perfil; se
+    usan sus posiciones y C) con `diametros` por tramo entre salidas.
+
+    H0:   presión a la entrada (m).
+    cota: elevación de cada salida respecto de la entrada (m), o None.
+    Itera hasta que la corrección máxima de presión es menor que `tol` (m).
+    """
+    long_acum, dl, _ = e.tramos()
+    n = e.Salidas
+    dl = np.broadcast_to(np.asarray(dl, dtype=float), (n,))
+    diametros = np.broadcast_to(np.asarray(diametros, dtype=float), (n,))
+    cota = np.zeros(n) if cota is None else np.asarray(cota, dtype=float)
+    if cota.shape != (n,):
+        raise ValueError("Debe haber una cota por salida")
+
+    # Pérdida del tramo = r·Q**1.852
+    r = K_HW * e.C**-1.852 * dl * diametros**-4.872
+    estatica = H0 - cota
+
+    def g(h):
+        q_tramo = np.cumsum(emisor.caudal(h)[::-1])[::-1]
+        return estatica - np.cumsum(r * q_tramo**1.852)
+
+    h = estatica.copy()
+    dX, dF = [], []
+    h_ant = f_ant = None
+    beta = 1.0
+    historial = []
+    for it in range(1, max_iter + 1):
+        f = g(h) - h
+        res = float(np.abs(f).max())
+        historial.append(res)
+        if res < tol:
+            break
+
+        if f_ant is not None:
+            dX.append(h - h_ant)
+            dF.append(f - f_ant)
+            if len(dF) > memoria:
+                dX.pop(0)
+                dF.pop(0)
+            # Si el residuo crece se amortigua el paso y se reinicia la memoria
+            if res > historial[-2]:
+                beta = max(beta / 2, 1 / 64)
+                dX, dF = [], []
+        h_ant, f_ant = h, f
+
+        if dF:
+            X, Fm = np.column_stack(dX), np.column_stack(dF)
+            gamma = np.linalg.lstsq(Fm, f, rcond=None)[0]
+            h = h + beta * f - (X + beta * Fm) @ gamma
+        else:
+            h = h + beta * f
+
+    caudal = emisor.caudal(h)
+    q_tramo = np.cumsum(caudal[::-1])[::-1]
+    return PerfilPresion(
+        long_acum=np.asarray(long_acum, dtype=float),
+        presion=h,
+        caudal=caudal,
+        q_tramo=q_tramo,
+        v_tramo=q_tramo / area(diametros) / 3600,
+        hf_tramo=r * q_tramo**1.852,
+        convergio=res < tol,
+        iteraciones=it,
+        residuo=res,
+        historial=np.array(historial),
+    )
+
+
+def emisor_del_diseno(e, h_nominal, x=0.5):
+    """Emisor que entrega el caudal medio por salida de `e` a h_nominal."""
+    return Emisor.nominal(e.Q / e.Salidas, h_nominal, x)
@@ -0,0 +1,669 @@
+"""
+Motor hidráulico de la tubería secundaria de riego.
+
+Contiene las bases de datos de tuberías y todas las fórmulas del diseño
+(factor de Christiansen, Hazen–Williams, solución con uno y dos diámetros,
+tiempo de avance discreto). No importa streamlit, matplotlib, reportlab ni
+tkinter, de modo que puede usarse desde submain_web.py, submain.py o desde
+procesos por lotes sin costo de arranque de las interfaces.
+"""
+import math
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Optional
+
+import numpy as np
+
+# ===============================
+# BASES DE DATOS
+# ===============================
+PVC_SDR = {
+    "17": [37.18, 42.58, 53.21, 54.45, 78.44, 100.84, 148.46, 193.28],
+    "26": [30.36, 38.9, 44.56, 55.71, 67.45, 82.04, 105.52,
+           155.32, 202.22, 252.07, 298.95],
+    "32.5": [39.0, 45.22, 56.63, 68.55, 83.42, 107.28,
+             157.92, 205.62, 256.23, 303.93],
+    "41": [39.8, 45.9, 57.38, 69.46, 84.58, 108.72,
+           160.08, 208.42, 259.75, 308.05, 369.7]
+}
+
+PE_PN = {
+    "PN6": [35.4, 44.6, 56.0, 67.0, 80.8, 99.0,
+            112.8, 126.4, 144.0, 162.0, 180.0],
+    "PN8": [27.4, 34.4, 43.2, 54.4, 65.2, 78.2,
+            95.8, 108.8, 122.0, 139.2, 156.8, 173.2],
+    "PN10": [26.0, 32.6, 40.8, 51.4, 61.4, 73.6,
+             90.0, 102.2, 114.6, 130.8, 147.2, 163.6]
+}
+
+MATERIALES = {
+    "PVC": PVC_SDR,
+    "PE (HDPE)": PE_PN,
+}
+
+# ===============================
+# CONSTANTES DE DISEÑO
+# ===============================
+K_HW = 1.131e9      # Hazen–Williams con Q en m³/h, D en mm, L en m
+V_MAX = 3.0         # velocidad máxima admisible (m/s)
+G = 9.81            # gravedad (m/s²)
+
+# ===============================
+# MODELOS DE FRICCIÓN
+# ===============================
+HAZEN = "Hazen–Williams"
+DARCY = "Darcy–Weisbach"
+MODELOS = (HAZEN, DARCY)
+
+# Rugosidad absoluta (mm) por material, para Darcy–Weisbach
+RUGOSIDAD = {
+    "PVC": 0.0015,
+    "PE (HDPE)": 0.007,
+}
+
+# Viscosidad cinemática del agua (m²/s) según temperatura (°C)
+_T_AGUA = np.array([0, 5, 10, 15, 20, 25, 30, 35, 40], dtype=float)
+_NU_AGUA = np.array([1.787, 1.519, 1.307, 1.139, 1.004,
+                     0.893, 0.801, 0.724, 0.658]) * 1e-6
+
+
+def diametros(material, clase):
+    """Diámetros internos (mm) de la clase SDR/PN del material."""
+    return np.array(MATERIALES[material][clase])
+
+
+def etiqueta_material(material, clase):
+    if material == "PVC":
+        return f"PVC SDR {clase}"
+    return f"PE100 {clase}"
+
+
+# ===============================
+# FÓRMULAS
+# ===============================
+def factor_christiansen(Salidas):
+    """Factor F de corrección por múltiples salidas."""
+    return 2 * Salidas / (2 * Salidas - 1) * ((1 / 2.852) + 0.852**0.5 / (6 * Salidas**2))
+
+
+def area(d):
+    """Área hidráulica (m²) para un diámetro en mm."""
+    return np.pi * (d / 2000)**2
+
+
+def velocidad(Q, d):
+    """Velocidad (m/s) para un caudal en m³/h y diámetro en mm."""
+    return Q / area(d) / 3600
+
+
+def hf_hazen(Q, C, L, d, F=1.0):
+    """Pérdida por fricción (m) de Hazen–Williams, corregida por F."""
+    return K_HW * (Q / C)**1.852 * L * d**-4.872 * F
+
+
+@lru_cache(maxsize=64)
+def viscosidad(temperatura):
+    """Viscosidad cinemática del agua (m²/s), interpolada en la tabla."""
+    if not _T_AGUA[0] <= temperatura <= _T_AGUA[-1]:
+        raise ValueError("La temperatura del agua debe estar entre 0 y 40 °C")
+    return float(np.interp(temperatura, _T_AGUA, _NU_AGUA))
+
+
+def factor_friccion(Re, rel):
+    """
+    Factor de fricción de Darcy para arreglos de Re y rugosidad relativa:
+    64/Re en régimen laminar (Re < 2000), Swamee–Jain (aproximación
+    explícita de Colebrook) en turbulento (Re > 4000) e interpolación
+    lineal en la transición.
+    """
+    Re = np.maximum(Re, 1e-9)
+    turb = 0.25 / np.log10(rel / 3.7 + 5.74 / np.maximum(Re, 4000)**0.9)**2
+    t = np.clip((Re - 2000) / 2000, 0, 1)
+    return np.where(Re < 2000, 64 / Re, (1 - t) * (64 / 2000) + t * turb)
+
+
+def hf_darcy(Q, L, d, nu, rel):
+    """Pérdida por fricción (m) de Darcy–Weisbach; Q en m³/h, d en mm."""
+    V = Q / area(d) / 3600
+    f = factor_friccion(V * d / 1000 / nu, rel)
+    return f * L / (d / 1000) * V**2 / (2 * G)
+
+
+def diametro_teorico(Q, LL, HF_disp, C=150, F=1.0):
+    """
+    Diámetro interno mínimo (mm) que cumple HF <= HF_disp y V <= V_MAX,
+    obtenido invirtiendo Hazen–Williams y la ecuación de continuidad.
+    Acepta escalares o arreglos.
+    """
+    d_hf = (HF_disp / (K_HW * (Q / C)**1.852 * LL * F))**(-1 / 4.872)
+    d_v = 2000 * np.sqrt(Q / (3600 * V_MAX * np.pi))
+    return np.maximum(d_hf, d_v)
+
+
+# ===============================
+# CATÁLOGO ORDENADO
+# ===============================
+class Catalogo:
+    """
+    Clase SDR/PN ordenada por diámetro, con las columnas d**-4.872, área y
+    rugosidad relativa precalculadas. Responde "menor diámetro que cumple" con searchsorted,
+    vectorizado sobre arreglos de Q, LL, HF_disp, C y F.
+    """
+
+    def __init__(self, material, clase):
+        self.material = material
+        self.clase = clase
+        self.d = np.sort(diametros(material, clase))
+        self.k = self.d**-4.872
+        self.A = area(self.d)
+        self.rel = RUGOSIDAD[material] / self.d
+        self._menos_k = -self.k  # creciente, para searchsorted
+        for col in (self.d, self.k, self.A, self.rel, self._menos_k):
+            col.flags.writeable = False
+
+    def __len__(self):
+        return len(self.d)
+
+    def __repr__(self):
+        return f"Catalogo({etiqueta_material(self.material, self.clase)!r})"
+
+    def cumple(self, i, Q, LL, HF_disp, C=150, F=1.0):
+        """Criterio exacto de la tabla sol1 para los índices i (o -1)."""
+        i = np.clip(i, 0, len(self.d) - 1)
+        V = Q / self.A[i] / 3600
+        HF = K_HW * (Q / C)**1.852 * LL * self.k[i] * F
+        return (V <= V_MAX) & (HF <= HF_disp)
+
+    def indice_minimo(self, Q, LL, HF_disp, C=150, F=1.0):
+        """
+        Índice del menor diámetro que cumple con HF_disp y V_MAX, o -1 si
+        ninguno cumple. Equivale a tomar la primera fila "Cumple" de sol1.
+        """
+        Q, LL, HF_disp, C, F = np.broadcast_arrays(*(
+            np.asarray(x, dtype=float) for x in (Q, LL, HF_disp, C, F)))
+        n = len(self.d)
+
+        k_max = HF_disp / (K_HW * (Q / C)**1.852 * LL * F)
+        A_min = Q / (3600 * V_MAX)
+        i = np.maximum(np.searchsorted(self._menos_k, -k_max),
+                       np.searchsorted(self.A, A_min))
+
+        # La inversión puede errar por redondeo en la frontera: se corrige
+        # con el criterio exacto en los vecinos (ambos criterios son
+        # monótonos en d, así que basta un paso).
+        atras = (i > 0) & self.cumple(i - 1, Q, LL, HF_disp, C, F)
+        i = np.where(atras, i - 1, i)
+        adelante = (i < n) & ~self.cumple(i, Q, LL, HF_disp, C, F)
+        i = np.where(adelante, i + 1, i)
+        i = np.where(i < n, i, -1)
+        return i if i.ndim else int(i)
+
+    def diametro_minimo(self, Q, LL, HF_disp, C=150, F=1.0):
+        """Menor diámetro (mm) que cumple, o NaN si ninguno cumple."""
+        i = self.indice_minimo(Q, LL, HF_disp, C, F)
+        d = np.where(np.asarray(i) >= 0, self.d[i], np.nan)
+        return d if d.ndim else float(d)
+
+
+@lru_cache(maxsize=None)
+def catalogo(material, clase):
+    """Catálogo ordenado (compartido) de la clase SDR/PN."""
+    return Catalogo(material, clase)
+
+
+# ===============================
+# ENTRADAS Y RESULTADOS
+# ===============================
+def _validar_comunes(e):
+    if e.material not in MATERIALES:
+        raise ValueError(f"Material desconocido: {e.material}")
+    if e.clase not in MATERIALES[e.material]:
+        raise ValueError(f"Clase desconocida para {e.material}: {e.clase}")
+    if e.modelo not in MODELOS:
+        raise ValueError(f"Modelo de fricción desconocido: {e.modelo}")
+    if e.modelo == DARCY:
+        viscosidad(e.temperatura)
+
+
+def hf_tramos(e, tramos=None):
+    """
+    Pérdida de cada tramo entre salidas con cada diámetro del catálogo
+    (diámetros × tramos), según el modelo de fricción de la entrada.
+    `tramos` es e.tramos() ya calculado, si se tiene.
+    """
+    cat = e.catalogo
+    _, dl, q = e.tramos() if tramos is None else tramos
+    if e.modelo == DARCY:
+        return hf_darcy(q, dl, cat.d[:, None], viscosidad(e.temperatura),
+                        cat.rel[:, None])
+    return K_HW * (q / e.C)**1.852 * dl * cat.k[:, None]
+
+
+@dataclass(frozen=True)
+class Entrada:
+    Q: float                    # caudal total (m³/h)
+    S: float                    # espaciamiento entre salidas (m)
+    LL: float                   # longitud total (m)
+    HF_disp: float              # pérdida disponible (m)
+    C: float = 150              # coeficiente Hazen–Williams
+    material: str = "PVC"
+    clase: str = "41"
+    modelo: str = HAZEN         # modelo de fricción (MODELOS)
+    temperatura: float = 20.0   # temperatura del agua (°C), para Darcy–Weisbach
+
+    def __post_init__(self):
+        for nombre in ("Q", "S", "LL", "HF_disp", "C"):
+            valor = getattr(self, nombre)
+            if not (valor > 0 and math.isfinite(valor)):
+                raise ValueError(f"{nombre} debe ser positivo y finito")
+        _validar_comunes(self)
+        if int(self.LL / self.S) < 1:
+            raise ValueError("La longitud total debe ser mayor que el espaciamiento")
+
+    @property
+    def Salidas(self):
+        return int(self.LL / self.S)
+
+    @property
+    def Q_salida(self):
+        return self.Q / self.Salidas
+
+    @property
+    def F(self):
+        return factor_christiansen(self.Salidas)
+
+    @property
+    def catalogo(self):
+        return catalogo(self.material, self.clase)
+
+    @property
+    def dia(self):
+        return self.catalogo.d
+
+    @property
+    def mat_label(self):
+        return etiqueta_material(self.material, self.clase)
+
+    def tramos(self):
+        """(long_acum, ΔL, q_tramo) de cada tramo entre salidas."""
+        salida = np.arange(1, self.Salidas + 1)
+        return salida * self.S, self.S, self.Q - self.Q_salida * (salida - 1)
+
+    def particiones(self):
+        """
+        Cortes candidatos L1 (múltiplos de S) para dos diámetros, con la
+        pérdida aguas arriba y aguas abajo del corte sin el término
+        d**-4.872, y el caudal Q2 del primer tramo aguas abajo.
+        """
+        L1 = np.arange(self.S, self.LL, self.S)
+        L2 = self.LL - L1
+        Q2 = self.Q * L2 / self.LL
+        hf_up = K_HW * (self.Q / self.C)**1.852 * L1 * self.F
+        hf_dn = K_HW * (Q2 / self.C)**1.852 * L2 * self.F
+        return L1, L2, Q2, hf_up, hf_dn
+
+
+@dataclass(frozen=True, eq=False)
+class Perfil:
+    """
+    Secundaria con salidas de posición y caudal arbitrarios. La pérdida se
+    suma tramo a tramo con el caudal acumulado aguas abajo (sin factor de
+    Christiansen), en tiempo lineal sobre las salidas.
+
+    posicion: distancia de cada salida a la entrada (m), creciente.
+    caudal:   caudal de cada salida (m³/h).
+    """
+    posicion: np.ndarray
+    caudal: np.ndarray
+    HF_disp: float
+    C: float = 150
+    material: str = "PVC"
+    clase: str = "41"
+    modelo: str = HAZEN
+    temperatura: float = 20.0
+    dl: np.ndarray = field(init=False, repr=False)          # longitud de cada tramo
+    q_tramo: np.ndarray = field(init=False, repr=False)     # caudal aguas abajo
+    hf_acum: np.ndarray = field(init=False, repr=False)     # Σ ΔL·q**1.852 desde la entrada
+
+    def __post_init__(self):
+        x = np.array(self.posicion, dtype=float).ravel()
+        q = np.array(self.caudal, dtype=float).ravel()
+        if x.size == 0 or x.shape != q.shape:
+            raise ValueError("posicion y caudal deben tener la misma longitud (al menos una salida)")
+        if not (np.isfinite(x).all() and x[0] > 0 and (np.diff(x) > 0).all()):
+            raise ValueError("Las posiciones deben ser positivas y estrictamente crecientes")
+        if not (np.isfinite(q).all() and (q > 0).all()):
+            raise ValueError("El caudal de cada salida debe ser positivo")
+        for nombre in ("HF_disp", "C"):
+            valor = getattr(self, nombre)
+            if not (valor > 0 and math.isfinite(valor)):
+                raise ValueError(f"{nombre} debe ser positivo y finito")
+        _validar_comunes(self)
+        dl = np.diff(x, prepend=0.0)
+        q_tramo = np.cumsum(q[::-1])[::-1]
+        hf_acum = np.cumsum(dl * q_tramo**1.852)
+        for nombre, arr in (("posicion", x), ("caudal", q), ("dl", dl),
+                            ("q_tramo", q_tramo), ("hf_acum", hf_acum)):
+            arr.flags.writeable = False
+            object.__setattr__(self, nombre, arr)
+
+    @property
+    def Salidas(self):
+        return len(self.posicion)
+
+    @property
+    def Q(self):
+        return float(self.q_tramo[0])
+
+    @property
+    def LL(self):
+        return float(self.posicion[-1])
+
+    @property
+    def S(self):
+        """Espaciamiento medio (sólo informativo)."""
+        return self.LL / self.Salidas
+
+    @property
+    def F(self):
+        """Factor de Christiansen equivalente: HF exacto = hf_hazen(Q, C, LL, d, F)."""
+        return float(self.hf_acum[-1] / (self.Q**1.852 * self.LL))
+
+    @property
+    def catalogo(self):
+        return catalogo(self.material, self.clase)
+
+    @property
+    def dia(self):
+        return self.catalogo.d
+
+    @property
+    def mat_label(self):
+        return etiqueta_material(self.material, self.clase)
+
+    def tramos(self):
+        return self.posicion, self.dl, self.q_tramo
+
+    def particiones(self):
+        """Como Entrada.particiones, con los cortes en las salidas."""
+        L1 = self.posicion[:-1]
+        hf_up = K_HW * self.C**-1.852 * self.hf_acum[:-1]
+        hf_dn = K_HW * self.C**-1.852 * (self.hf_acum[-1] - self.hf_acum[:-1])
+        return L1, self.LL - L1, self.q_tramo[1:], hf_up, hf_dn
+
+
+@dataclass(frozen=True)
+class SolucionUnDiametro:
+    diametros: np.ndarray
+    velocidades: np.ndarray
+    hf: np.ndarray
+    cumple: np.ndarray
+    d1: Optional[float]
+
+    def tabla(self):
+        import pandas as pd
+        return pd.DataFrame({
+            "Diámetro (mm)": self.diametros,
+            "Velocidad (m/s)": np.round(self.velocidades, 2),
+            "HF (m)": np.round(self.hf, 2),
+            "Cumple": self.cumple,
+        })
+
+
+@dataclass(frozen=True)
+class SolucionDosDiametros:
+    D1: float
+    L1: float
+    V1: float
+    D2: float
+    L2: float
+    V2: float
+    HF: float
+
+    def tabla(self):
+        import pandas as pd
+        return pd.DataFrame({
+            "Tramo": ["Inicial", "Final"],
+            "Diámetro (mm)": [self.D1, self.D2],
+            "Longitud (m)": [self.L1, self.L2],
+            "Velocidad (m/s)": [self.V1, self.V2],
+        })
+
+
+@dataclass(frozen=True)
+class TiempoAvance:
+    salida: np.ndarray
+    long_acum: np.ndarray
+    q_tramo: np.ndarray
+    v_tramo: Optional[np.ndarray] = None
+    t_tramo: Optional[np.ndarray] = None
+    t_acum: Optional[np.ndarray] = None
+    v_tramo_comb: Optional[np.ndarray] = None
+    t_tramo_comb: Optional[np.ndarray] = None
+    t_acum_comb: Optional[np.ndarray] = None
+    t_avance: Optional[float] = None
+    t_avance_comb: Optional[float] = None
+
+    def tabla(self):
+        import pandas as pd
+        columnas = ("salida", "long_acum", "q_tramo",
+                    "v_tramo", "t_tramo", "t_acum",
+                    "v_tramo_comb", "t_tramo_comb", "t_acum_comb")
+        return pd.DataFrame({c: getattr(self, c) for c in columnas
+                             if getattr(self, c) is not None})
+
+
+@dataclass(frozen=True)
+class Diseno:
+    entrada: Entrada
+    sol1: SolucionUnDiametro
+    sol2: Optional[SolucionDosDiametros]
+    avance: TiempoAvance
+
+
+# ===============================
+# SOLUCIÓN UN DIÁMETRO
+# ===============================
+def tabla_un_diametro(e, tramos=None):
+    """
+    (V, HF) con cada diámetro del catálogo; no depende de HF_disp, de modo
+    que puede reutilizarse cuando sólo cambia la pérdida disponible.
+    """
+    cat = e.catalogo
+    V = e.Q / cat.A / 3600
+    if e.modelo == DARCY:
+        # Sin forma separable en d: suma tramo a tramo para cada diámetro
+        return V, hf_tramos(e, tramos).sum(axis=1)
+    return V, K_HW * (e.Q / e.C)**1.852 * e.LL * cat.k * e.F
+
+
+def solucion_un_diametro(e, tabla=None):
+    """Diseño con un diámetro; `tabla` es tabla_un_diametro(e) ya calculada."""
+    cat = e.catalogo
+    V, HF = tabla_un_diametro(e) if tabla is None else tabla
+    cumple = (V <= V_MAX) & (HF <= e.HF_disp)
+    if e.modelo == DARCY:
+        d1 = float(cat.d[cumple.argmax()]) if cumple.any() else None
+        return SolucionUnDiametro(cat.d, V, HF, cumple, d1)
+
+    i = cat.indice_minimo(e.Q, e.LL, e.HF_disp, e.C, e.F)
+    d1 = float(cat.d[i]) if i >= 0 else None
+    return SolucionUnDiametro(cat.d, V, HF, cumple, d1)
+
+
+# ===============================
+# SOLUCIÓN DOS DIÁMETROS
+# ===============================
+def solucion_dos_diametros(e, bloque=1_000_000):
+    """
+    Primer par de diámetros adyacentes (dia[i], dia[i-1]) y primera longitud
+    L1 (múltiplo de S, o posición de una salida en un Perfil) que cumplen
+    con HF_disp y V_MAX.
+
+    La malla (pares × L1) se evalúa con arreglos de NumPy, en bloques de
+    pares de a lo sumo `bloque` elementos para acotar la memoria.
+    """
+    Q = e.Q
+    cat = e.catalogo
+
+    # Términos que dependen sólo de L1 (columnas) o sólo del par (filas)
+    L1, L2, Q2, hf_up, hf_dn = e.particiones()
+    if len(cat) < 2 or L1.size == 0:
+        return None
+    if e.modelo == DARCY:
+        # Pérdida acumulada de cada diámetro hasta cada corte, tramo a tramo
+        P = np.zeros((len(cat), e.Salidas + 1))
+        np.cumsum(hf_tramos(e), axis=1, out=P[:, 1:])
+        m = np.minimum(np.arange(1, L1.size + 1), e.Salidas)
+        HF_pares = P[1:, m] + P[:-1, -1:] - P[:-1, m]
+
+    d_up, d_dn = cat.d[1:], cat.d[:-1]
+    k_up, k_dn = cat.k[1:], cat.k[:-1]
+    V1 = Q / cat.A[1:] / 3600
+    A2 = cat.A[:-1]
+
+    # Los pares con V1 > V_MAX no tienen solución para ningún L1
+    pares = np.flatnonzero(V1 <= V_MAX)
+    filas = max(1, bloque // L1.size)
+    for b0 in range(0, len(pares), filas):
+        p = pares[b0:b0 + filas]
+        if e.modelo == DARCY:
+            HF = HF_pares[p]
+        else:
+            HF = hf_up * k_up[p, None] + hf_dn * k_dn[p, None]
+        V2 = Q2 / A2[p, None] / 3600
+        ok = (HF <= e.HF_disp) & (V2 <= V_MAX)
+        if not ok.any():
+            continue
+        r, j = np.unravel_index(np.argmax(ok), ok.shape)
+        i = p[r]
+        return SolucionDosDiametros(
+            D1=float(d_up[i]), L1=float(L1[j]), V1=float(V1[i]),
+            D2=float(d_dn[i]), L2=float(L2[j]), V2=float(V2[r, j]),
+            HF=float(HF[r, j]))
+    return None
+
+
+def diametros_por_tramo(e, d1=None, sol2=None):
+    """Diámetro de cada tramo entre salidas para un diseño de 1 o 2 diámetros."""
+    long_acum = e.tramos()[0]
+    if sol2 is not None:
+        return np.where(long_acum <= sol2.L1, sol2.D1, sol2.D2)
+    return np.full(e.Salidas, float(d1))
+
+
+# ===============================
+# TIEMPO DE AVANCE (ALGORITMO DISCRETO)
+# ===============================
+def salidas_tramo_inicial(S, L1, Salidas):
+    """Número de salidas con long_acum <= L1 (tramo del diámetro inicial)."""
+    if np.ndim(L1) == 0 and np.ndim(S) == 0:
+        m1 = math.floor(L1 / S)
+        m1 = m1 + ((m1 + 1) * S <= L1) - (m1 * S > L1)
+        return min(max(m1, 0), int(Salidas))
+    m1 = np.floor(np.asarray(L1) / S)
+    m1 = m1 + ((m1 + 1) * S <= L1) - (m1 * S > L1)
+    return np.clip(m1, 0, Salidas).astype(int)
+
+
+def tiempo_avance(e, d1, sol2=None, tramos=None):
+    """
+    Perfil de avance salida por salida, vectorizado (tiempo lineal). Con
+    salidas uniformes los caudales por tramo forman una progresión
+    aritmética Q - i·q_salida; en un Perfil son las sumas aguas abajo.
+    `tramos` es e.tramos() ya calculado, si se tiene.
+    """
+    salida = np.arange(1, e.Salidas + 1)
+    long_acum, dl, q_tramo = e.tramos() if tramos is None else tramos
+
+    res = dict(salida=salida, long_acum=long_acum, q_tramo=q_tramo)
+
+    # --- Un diámetro
+    if d1 is not None:
+        v_tramo = q_tramo / area(d1) / 3600
+        t_tramo = dl / v_tramo
+        t_acum = np.cumsum(t_tramo) / 60
+        res.update(v_tramo=v_tramo, t_tramo=t_tramo, t_acum=t_acum,
+                   t_avance=round(float(t_acum[-1]), 2))
+
+    # --- Dos diámetros
+    if sol2 is not None:
+        A = np.where(long_acum <= sol2.L1, area(sol2.D1), area(sol2.D2))
+        v_tramo_comb = q_tramo / A / 3600
+        t_tramo_comb = dl / v_tramo_comb
+        t_acum_comb = np.cumsum(t_tramo_comb) / 60
+        res.update(v_tramo_comb=v_tramo_comb, t_tramo_comb=t_tramo_comb,
+                   t_acum_comb=t_acum_comb,
+                   t_avance_comb=round(float(t_acum_comb[-1]), 2))
+
+    return TiempoAvance(**res)
+
+
+# ===============================
+# TIEMPO DE AVANCE EN FORMA CERRADA
+# ===============================
+# Con caudales q_salida·m (m = Salidas, ..., 1) la suma de ΔL / V_i es
+# S·A·3600/q_salida · H_n, con H_n el número armónico. Se evalúa en O(1)
+# por combinación, útil para barridos de parámetros.
+EULER = 0.5772156649015329
+_H_TABLA = np.concatenate(([0.0], np.cumsum(1 / np.arange(1, 65))))
+
+
+def armonico(n):
+    """Número armónico H_n (exacto hasta n = 64, asintótico después)."""
+    if np.ndim(n) == 0:
+        n = int(n)
+        if n < len(_H_TABLA):
+            return float(_H_TABLA[max(n, 0)])
+        return (math.log(n) + EULER + 1 / (2 * n) - 1 / (12 * n**2)
+                + 1 / (120 * n**4) - 1 / (252 * n**6))
+    n = np.asarray(n, dtype=np.int64)
+    nf = np.maximum(n, 1).astype(float)
+    asint = (np.log(nf) + EULER + 1 / (2 * nf) - 1 / (12 * nf**2)
+             + 1 / (120 * nf**4) - 1 / (252 * nf**6))
+    return np.where(n < len(_H_TABLA),
+                    _H_TABLA[np.clip(n, 0, len(_H_TABLA) - 1)], asint)
+
+
+def t_avance_uno(Q, S, Salidas, d):
+    """Tiempo de avance (min) con un solo diámetro, en forma cerrada."""
+    Q_salida = Q / Salidas
+    return S * area(d) * 3600 / Q_salida * armonico(Salidas) / 60
+
+
+def t_avance_dos(Q, S, Salidas, D1, m1, D2):
+    """
+    Tiempo de avance (min) con D1 en las primeras m1 salidas y D2 en el
+    resto, en forma cerrada.
+    """
+    Q_salida = Q / Salidas
+    H_n = armonico(Salidas)
+    H_2 = armonico(Salidas - m1)
+    return S * 3600 / Q_salida * (area(D1) * (H_n - H_2) + area(D2) * H_2) / 60
+
+
+def t_avance_rapido(e, d1, sol2=None):
+    """
+    (t_avance, t_avance_comb) en minutos, redondeados como en
+    TiempoAvance, sin construir el perfil salida por salida (un Perfil no
+    tiene forma cerrada y se suma tramo a tramo).
+    """
+    if isinstance(e, Perfil):
+        avance = tiempo_avance(e, d1, sol2)
+        return avance.t_avance, avance.t_avance_comb
+
+    t_avance = t_avance_comb = None
+    if d1 is not None:
+        t_avance = round(float(t_avance_uno(e.Q, e.S, e.Salidas, d1)), 2)
+    if sol2 is not None:
+        m1 = salidas_tramo_inicial(e.S, sol2.L1, e.Salidas)
+        t_avance_comb = round(float(
+            t_avance_dos(e.Q, e.S, e.Salidas, sol2.D1, m1, sol2.D2)), 2)
+    return t_avance, t_avance_comb
+
+
+def disenar(e):
+    """Diseño completo: un diámetro, dos diámetros y tiempos de avance."""
+    sol1 = solucion_un_diametro(e)
+    sol2 = solucion_dos_diametros(e)
+    return Diseno(e, sol1, sol2, tiempo_avance(e, sol1.d1, sol2))
@@ -0,0 +1,142 @@
+"""
+Recálculo incremental del diseño con un grafo de etapas.
+
+Cada etapa declara los campos de la entrada que lee (`parametros`) y las
+etapas previas cuyos resultados recibe (`dependencias`). La clave de una
+etapa combina sólo esos campos y las claves de sus dependencias, de modo
+que al cambiar un dato se recalculan únicamente las etapas aguas abajo de
+él: cambiar HF_disp no rehace la tabla de velocidad/pérdida por diámetro,
+y cambiar el material no rehace el perfil de caudales q_tramo.
+
+El diseño de la secundaria queda como
+
+    perfil → christiansen → tabla_hf → un_diametro ┐
+    perfil ──────────────────────→ dos_diametros ──┴→ avance → grafico
+                                                            → memoria
+
+Cada etapa guarda sus últimos resultados (LRU) y cuenta aciertos y fallos,
+expuestos con estadisticas() para el monitoreo.
+"""
+import threading
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from typing import Callable
+
+import numpy as np
+
+from submain_engine import (
+    solucion_un_diametro, solucion_dos_diametros, tabla_un_diametro, tiempo_avance,
+)
+
+# Campos de Entrada (Q, S, LL) o Perfil (posicion, caudal) que fijan las salidas
+GEOMETRIA = ("Q", "S", "LL", "posicion", "caudal")
+# Campos que fijan la tubería y el modelo de fricción
+TUBERIA = ("C", "material", "clase", "modelo", "temperatura")
+
+
+@dataclass(frozen=True)
+class Etapa:
+    nombre: str
+    funcion: Callable           # funcion(e, *resultados de las dependencias)
+    parametros: tuple = ()      # campos de la entrada que lee la etapa
+    dependencias: tuple = ()    # etapas previas, en el orden de los argumentos
+
+
+def _valor_clave(valor):
+    """Valor de un campo apto para la clave (los arreglos por su contenido)."""
+    if isinstance(valor, np.ndarray):
+        return (valor.shape, valor.tobytes())
+    return valor
+
+
+class Grafo:
+    """
+    Etapas con resultados memorizados por clave. Una etapa debe leer de la
+    entrada sólo los campos que declara; lo demás le llega por sus
+    dependencias.
+    """
+
+    def __init__(self, etapas, max_entradas=256):
+        self.etapas = {}
+        for etapa in etapas:
+            faltan = [d for d in etapa.dependencias if d not in self.etapas]
+            if faltan:
+                raise ValueError(f"La etapa {etapa.nombre} depende de etapas no "
+                                 f"declaradas antes: {', '.join(faltan)}")
+            self.etapas[etapa.nombre] = etapa
+        self.max_entradas = max_entradas
+        self.aciertos = Counter()
+        self.fallos = Counter()
+        self._memo = {nombre: OrderedDict() for nombre in self.etapas}
+        self._candado = threading.Lock()
+
+    def calcular(self, nombre, e):
+        """Resultado de la etapa `nombre` para la entrada `e`."""
+        return self._resolver(nombre, e, {})[0]
+
+    def _resolver(self, nombre, e, hechas):
+        if nombre in hechas:
+            return hechas[nombre]
+        etapa = self.etapas[nombre]
+        previas = [self._resolver(d, e, hechas) for d in etapa.dependencias]
+        clave = (type(e).__name__,
+                 tuple(_valor_clave(getattr(e, p, None)) for p in etapa.parametros),
+                 tuple(c for _, c in previas))
+
+        memo = self._memo[nombre]
+        with self._candado:
+            if clave in memo:
+                memo.move_to_end(clave)
+                self.aciertos[nombre] += 1
+                hechas[nombre] = (memo[clave], clave)
+                return hechas[nombre]
+
+        valor = etapa.funcion(e, *(v for v, _ in previas))
+        with self._candado:
+            self.fallos[nombre] += 1
+            memo[clave] = valor
+            if len(memo) > self.max_entradas:
+                memo.popitem(last=False)
+        hechas[nombre] = (valor, clave)
+        return hechas[nombre]
+
+    def estadisticas(self):
+        """Aciertos, fallos y resultados guardados de cada etapa."""
+        return {nombre: {"aciertos": self.aciertos[nombre],
+                         "fallos": self.fallos[nombre],
+                         "entradas": len(self._memo[nombre])}
+                for nombre in self.etapas}
+
+
+# ===============================
+# ETAPAS DEL DISEÑO
+# ===============================
+def _memoria(e, sol1, sol2, avance):
+    from submain_report import grafico_png, memoria_pdf
+    return memoria_pdf(e, sol1.d1, avance, sol2, grafico_png(avance, sol2, 300))
+
+
+def grafo_diseno(cache=None, max_entradas=256):
+    """
+    Grafo del diseño de la secundaria. Con `cache` (submain_cache) la
+    solución con dos diámetros, la etapa más costosa, se lee y guarda en la
+    caché persistente en disco.
+    """
+    from submain_graficos import graficos_avance
+    dos = solucion_dos_diametros if cache is None else cache.sol2
+    return Grafo((
+        Etapa("perfil", lambda e: e.tramos(), GEOMETRIA),
+        Etapa("christiansen", lambda e, perfil: e.F, (), ("perfil",)),
+        Etapa("tabla_hf", lambda e, perfil, F: tabla_un_diametro(e, perfil),
+              TUBERIA, ("perfil", "christiansen")),
+        Etapa("un_diametro", lambda e, tabla: solucion_un_diametro(e, tabla),
+              ("HF_disp",), ("tabla_hf",)),
+        Etapa("dos_diametros", lambda e, perfil: dos(e),
+              TUBERIA + ("HF_disp",), ("perfil",)),
+        Etapa("avance", lambda e, perfil, sol1, sol2: tiempo_avance(e, sol1.d1, sol2, perfil),
+              (), ("perfil", "un_diametro", "dos_diametros")),
+        Etapa("grafico", lambda e, avance, sol2: graficos_avance(avance, sol2),
+              (), ("avance", "dos_diametros")),
+        Etapa("memoria", _memoria, GEOMETRIA + TUBERIA + ("HF_disp",),
+              ("un_diametro", "dos_diametros", "avance")),
+    ), max_entradas)
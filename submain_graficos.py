@@ -0,0 +1,199 @@
+"""
+Gráficos livianos de la interfaz web.
+
+Con goteros a 0.3 m una secundaria de 3 km tiene 10.000 salidas; enviar
+todas al navegador en cada re-ejecución no escala. Las series se reducen
+con LTTB (largest triangle three buckets), que conserva la forma de la
+curva (picos y quiebres) con un número fijo de puntos, y se dibujan en el
+navegador con Vega-Lite (st.vega_lite_chart), sin matplotlib. El tamaño
+del gráfico enviado queda acotado sin importar el número de salidas.
+El frente de Pareto del diseño por costo y los perfiles de fertirriego
+también envían un número acotado de puntos.
+"""
+import numpy as np
+
+PUNTOS_MAX = 800        # puntos por serie enviados al navegador
+ROJO = "#d62728"        # tab:red
+AZUL = "#1f77b4"        # tab:blue
+
+
+# ===============================
+# DECIMACIÓN LTTB
+# ===============================
+def lttb(x, y, n):
+    """
+    Índices de los `n` puntos de (x, y) que conserva LTTB: el primero, el
+    último y, en cada una de n - 2 cubetas, el que forma el triángulo de
+    mayor área con el punto elegido antes y el promedio de la cubeta
+    siguiente. Con n >= len(x) devuelve todos.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    m = len(x)
+    if n >= m or n < 3:
+        return np.arange(m)
+
+    bordes = 1 + np.arange(n - 1) * (m - 2) // (n - 2)      # n - 2 cubetas
+    cuenta = np.diff(bordes)
+    x_medio = np.add.reduceat(x[1:m - 1], bordes[:-1] - 1) / cuenta
+    y_medio = np.add.reduceat(y[1:m - 1], bordes[:-1] - 1) / cuenta
+    x_medio = np.append(x_medio[1:], x[-1])                 # promedio de la siguiente
+    y_medio = np.append(y_medio[1:], y[-1])
+
+    idx = np.empty(n, dtype=int)
+    idx[0], idx[-1] = 0, m - 1
+    a = 0
+    for i in range(n - 2):
+        ini, fin = bordes[i], bordes[i + 1]
+        xs, ys = x[ini:fin], y[ini:fin]
+        area = np.abs((x[a] - x_medio[i]) * (ys - y[a])
+                      - (x[a] - xs) * (y_medio[i] - y[a]))
+        a = ini + int(area.argmax())
+        idx[i + 1] = a
+    return idx
+
+
+def reducir(x, y, n=PUNTOS_MAX):
+    """(x, y) reducidos a lo sumo a `n` puntos con LTTB."""
+    idx = lttb(x, y, n)
+    return np.asarray(x)[idx], np.asarray(y)[idx]
+
+
+# ===============================
+# VELOCIDAD Y TIEMPO DE AVANCE (VEGA-LITE)
+# ===============================
+def _valores(x, y, n):
+    x, y = reducir(x, y, n)
+    return [{"x": round(float(a), 3), "y": round(float(b), 5)} for a, b in zip(x, y)]
+
+
+def _panel(titulo, x, v, t, n):
+    eje_x = {"field": "x", "type": "quantitative", "title": "Longitud acumulada (m)"}
+    eje_v = {"field": "y", "type": "quantitative", "title": "Velocidad (m/s)",
+             "axis": {"titleColor": ROJO, "labelColor": ROJO}}
+    if v is None:
+        # Sin solución: ejes vacíos, como en el gráfico de la memoria
+        capas = [{"data": {"values": []}, "mark": "line",
+                  "encoding": {"x": eje_x, "y": eje_v}}]
+    else:
+        capas = [
+            {"data": {"values": _valores(x, v, n)},
+             "mark": {"type": "line", "color": ROJO, "strokeWidth": 2},
+             "encoding": {"x": eje_x, "y": eje_v}},
+            {"data": {"values": _valores(x, t, n)},
+             "mark": {"type": "circle", "color": AZUL, "size": 25, "opacity": 1},
+             "encoding": {"x": eje_x,
+                          "y": {"field": "y", "type": "quantitative",
+                                "title": "Tiempo acumulado (min)",
+                                "axis": {"orient": "right", "titleColor": AZUL,
+                                         "labelColor": AZUL}}}},
+        ]
+    return {
+        "title": titulo,
+        "height": 320,
+        "layer": capas,
+        "resolve": {"scale": {"y": "independent"}},
+    }
+
+
+def graficos_avance(avance, sol2, n=PUNTOS_MAX):
+    """
+    Especificaciones Vega-Lite de velocidad y tiempo acumulado para un
+    diámetro y para dos diámetros progresivos, con a lo sumo `n` puntos por
+    serie.
+    """
+    x = avance.long_acum
+    return (
+        _panel("Un diámetro", x, avance.v_tramo, avance.t_acum, n),
+        _panel("Dos diámetros progresivos", x,
+               avance.v_tramo_comb if sol2 else None, avance.t_acum_comb, n),
+    )
+
+
+# ===============================
+# FRENTE DE PARETO (VEGA-LITE)
+# ===============================
+def muestra_frente(frente, n=PUNTOS_MAX):
+    """
+    Índices de a lo sumo `n` diseños del frente (ordenado por costo),
+    equiespaciados en costo, más los de menor HF y menor tiempo de avance.
+    """
+    m = len(frente)
+    if m <= n:
+        return np.arange(m)
+    idx = np.linspace(0, m - 1, n - 2).round().astype(int)
+    return np.unique(np.concatenate((idx, [frente.HF.argmin(), frente.t_avance.argmin()])))
+
+
+def grafico_pareto(frente, n=PUNTOS_MAX, seleccion="eleccion"):
+    """
+    Especificación Vega-Lite del frente: costo contra HF, coloreado por el
+    tiempo de avance. Cada punto lleva su fila del frente en "fila" y se
+    elige con la selección de punto `seleccion`.
+    """
+    idx = muestra_frente(frente, n)
+    etiquetas = frente.etiquetas()
+    valores = [{
+        "fila": int(i),
+        "clase": etiquetas[i],
+        "diametros": f"{frente.D1[i]:g}" if np.isnan(frente.D2[i])
+                     else f"{frente.D1[i]:g} / {frente.D2[i]:g}",
+        "L1": round(float(frente.L1[i]), 2),
+        "costo": round(float(frente.costo[i]), 2),
+        "HF": round(float(frente.HF[i]), 4),
+        "t": round(float(frente.t_avance[i]), 2),
+    } for i in idx]
+    return {
+        "height": 420,
+        "data": {"values": valores},
+        "params": [{"name": seleccion, "select": {"type": "point", "fields": ["fila"]}}],
+        "mark": {"type": "circle", "size": 40},
+        "encoding": {
+            "x": {"field": "costo", "type": "quantitative", "title": "Costo de la tubería ($)",
+                  "scale": {"zero": False}},
+            "y": {"field": "HF", "type": "quantitative", "title": "Pérdida HF (m)"},
+            "color": {"field": "t", "type": "quantitative", "title": "Avance (min)",
+                      "scale": {"scheme": "viridis"}},
+            "opacity": {"condition": {"param": seleccion, "value": 1}, "value": 0.35},
+            "tooltip": [
+                {"field": "clase", "title": "Clase"},
+                {"field": "diametros", "title": "Diámetros (mm)"},
+                {"field": "L1", "title": "L1 (m)"},
+                {"field": "costo", "title": "Costo ($)"},
+                {"field": "HF", "title": "HF (m)"},
+                {"field": "t", "title": "Avance (min)"},
+            ],
+        },
+    }
+
+
+# ===============================
+# FERTIRRIEGO (VEGA-LITE)
+# ===============================
+def grafico_fertirriego(res, i=0, n=PUNTOS_MAX):
+    """
+    Especificación Vega-Lite de la dosis por salida del programa i y, en el
+    eje derecho, la llegada del fertilizante y el paso de la cola.
+    """
+    x = res.long_acum
+    eje_x = {"field": "x", "type": "quantitative", "title": "Longitud acumulada (m)"}
+    tiempo = {"field": "y", "type": "quantitative", "title": "Tiempo (min)",
+              "axis": {"orient": "right", "titleColor": AZUL, "labelColor": AZUL}}
+    return {
+        "height": 320,
+        "layer": [
+            {"data": {"values": _valores(x, 1e3 * res.dosis[i], n)},
+             "mark": {"type": "line", "color": ROJO, "strokeWidth": 2},
+             "encoding": {"x": eje_x,
+                          "y": {"field": "y", "type": "quantitative", "title": "Dosis (g)",
+                                "scale": {"zero": True},
+                                "axis": {"titleColor": ROJO, "labelColor": ROJO}}}},
+            {"layer": [
+                {"data": {"values": _valores(x, res.comienzo[i] + res.retardo, n)},
+                 "mark": {"type": "line", "color": AZUL}},
+                {"data": {"values": _valores(x, res.fin[i] + res.retardo, n)},
+                 "mark": {"type": "line", "color": AZUL, "strokeDash": [4, 3]}},
+            ], "encoding": {"x": eje_x, "y": tiempo}},
+        ],
+        "resolve": {"scale": {"y": "independent"}},
+    }
@@ -0,0 +1,182 @@
+"""
+Memorias de cálculo (PDF) por lotes.
+
+Lee las secundarias de un CSV o Parquet (las columnas del diseño por lotes
+y, opcionalmente, `nombre`) y genera la memoria de cálculo de cada una en
+un conjunto de procesos. Cada proceso dibuja los gráficos con el backend
+no interactivo Agg en memoria sobre una figura que se arma una sola vez y
+se reutiliza (sólo cambian los datos), y arma los documentos con la hoja
+de estilos y la plantilla de página compartidas de submain_report.
+
+La salida es un PDF por secundaria en una carpeta o, con --unir, un único
+documento con una secundaria por página (los gráficos se dibujan en
+paralelo y el documento se arma al final en el proceso principal).
+
+Uso:
+    python submain_memorias.py secundarias.csv memorias/ --workers 8
+    python submain_memorias.py secundarias.csv proyecto.pdf --unir --dpi 300
+"""
+import argparse
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+
+from submain_batch import COLUMNAS, leer_bloques, normalizar
+from submain_engine import Entrada, disenar
+
+CHUNK_PROCESO = 4       # memorias por envío a cada proceso
+
+
+@lru_cache(maxsize=None)
+def _plantilla():
+    """Figura del gráfico reutilizada por todas las memorias del proceso."""
+    from submain_report import PlantillaGrafico
+    return PlantillaGrafico()
+
+
+def _iniciar():
+    """Prepara cada proceso: backend sin pantalla, estilos y plantilla."""
+    import matplotlib
+    matplotlib.use("Agg")
+    from submain_report import estilos
+    estilos()
+    _plantilla()
+
+
+def leer_secundarias(ruta, chunk=5000):
+    """Itera (nombre, fila) con la fila normalizada en el orden de COLUMNAS."""
+    k = 0
+    for df in leer_bloques(ruta, chunk):
+        df = normalizar(df)
+        nombres = df["nombre"].astype(str).tolist() if "nombre" in df else None
+        for j, fila in enumerate(zip(*(df[c].tolist() for c in COLUMNAS))):
+            k += 1
+            nombre = nombres[j] if nombres else f"secundaria_{k:04d}"
+            yield re.sub(r"[^\w.-]+", "_", nombre), fila
+
+
+# ===============================
+# MEMORIA DE UNA SECUNDARIA
+# ===============================
+def _preparar(fila, dpi):
+    """Diseño completo y gráfico PNG de una fila."""
+    Q, S, LL, HF_disp, C, material, clase, modelo, temperatura = fila
+    e = Entrada(float(Q), float(S), float(LL), float(HF_disp),
+                float(C), material, clase, modelo, float(temperatura))
+    d = disenar(e)
+    if d.sol1.d1 is None:
+        raise ValueError("Ningún diámetro del catálogo cumple con la pérdida disponible")
+    return d, _plantilla().png(d.avance, d.sol2, dpi)
+
+
+def _memoria_individual(tarea):
+    """Escribe la memoria en su propio PDF; devuelve (nombre, error)."""
+    from submain_report import memoria_pdf
+    nombre, fila, carpeta, dpi = tarea
+    try:
+        d, png = _preparar(fila, dpi)
+    except (ValueError, TypeError) as err:
+        return nombre, str(err)
+    pdf = memoria_pdf(d.entrada, d.sol1.d1, d.avance, d.sol2, png)
+    (Path(carpeta) / f"{nombre}.pdf").write_bytes(pdf)
+    return nombre, None
+
+
+def _memoria_para_unir(tarea):
+    """Datos de la memoria para el documento unido; devuelve (nombre, error o datos)."""
+    nombre, fila, dpi = tarea
+    try:
+        d, png = _preparar(fila, dpi)
+    except (ValueError, TypeError) as err:
+        return nombre, str(err)
+    return nombre, (d.entrada, d.sol1.d1, d.avance, d.sol2, png)
+
+
+def _mapear(funcion, tareas, workers):
+    """Aplica `funcion` a las tareas en `workers` procesos, en orden."""
+    if workers <= 1:
+        _iniciar()
+        yield from map(funcion, tareas)
+        return
+    with ProcessPoolExecutor(max_workers=workers, initializer=_iniciar) as pool:
+        yield from pool.map(funcion, tareas, chunksize=CHUNK_PROCESO)
+
+
+# ===============================
+# LOTES
+# ===============================
+def memorias_individuales(secundarias, carpeta, workers=1, dpi=300):
+    """Un PDF por secundaria en `carpeta`; itera (nombre, error o None)."""
+    Path(carpeta).mkdir(parents=True, exist_ok=True)
+    tareas = ((nombre, fila, str(carpeta), dpi) for nombre, fila in secundarias)
+    yield from _mapear(_memoria_individual, tareas, workers)
+
+
+def memoria_unida(secundarias, ruta, workers=1, dpi=300):
+    """
+    Un único PDF con una secundaria por página. Devuelve la lista de
+    (nombre, error o None).
+    """
+    from reportlab.platypus import PageBreak
+    from submain_report import documento, elementos_memoria
+
+    elementos, estado = [], []
+    tareas = ((nombre, fila, dpi) for nombre, fila in secundarias)
+    for nombre, res in _mapear(_memoria_para_unir, tareas, workers):
+        if isinstance(res, str):
+            estado.append((nombre, res))
+            continue
+        if elementos:
+            elementos.append(PageBreak())
+        elementos += elementos_memoria(*res)
+        estado.append((nombre, None))
+    if elementos:
+        documento(str(ruta)).build(elementos)
+    return estado
+
+
+# ===============================
+# LÍNEA DE COMANDOS
+# ===============================
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Memorias de cálculo (PDF) por lotes de tuberías secundarias")
+    parser.add_argument("entrada", help="archivo CSV o Parquet de secundarias")
+    parser.add_argument("salida", help="carpeta de salida o, con --unir, archivo PDF")
+    parser.add_argument("--unir", action="store_true",
+                        help="un único PDF con una secundaria por página")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="procesos de cálculo (por defecto 1)")
+    parser.add_argument("--dpi", type=int, default=150,
+                        help="resolución de los gráficos (por defecto 150: unos "
+                             "380 ppp en la página, donde el gráfico ocupa 16 cm)")
+    args = parser.parse_args(argv)
+
+    secundarias = leer_secundarias(args.entrada)
+    t0 = time.perf_counter()
+    if args.unir:
+        estado = memoria_unida(secundarias, args.salida, args.workers, args.dpi)
+    else:
+        estado = []
+        for nombre, error in memorias_individuales(
+                secundarias, args.salida, args.workers, args.dpi):
+            estado.append((nombre, error))
+            if len(estado) % 50 == 0:
+                dt = time.perf_counter() - t0
+                print(f"{len(estado)} memorias  {len(estado) / dt:.1f} memorias/s",
+                      file=sys.stderr)
+
+    for nombre, error in estado:
+        if error:
+            print(f"{nombre}: {error}", file=sys.stderr)
+    dt = time.perf_counter() - t0
+    hechas = sum(error is None for _, error in estado)
+    print(f"Total: {hechas} memorias ({len(estado) - hechas} con error) en {dt:.2f} s "
+          f"({hechas / dt if dt else 0:.1f} memorias/s)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
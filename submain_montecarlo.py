@@ -0,0 +1,149 @@
+"""
+Análisis de incertidumbre (Monte Carlo) de un diseño ya elegido.
+
+Se muestrean el coeficiente C (envejecimiento de la tubería), la variación
+del caudal de cada salida y la tolerancia del espaciamiento; para cada
+muestra se calcula la pérdida HF tramo a tramo, la velocidad máxima y el
+tiempo de avance, y se estima la probabilidad de superar HF_disp y V_MAX.
+La suma tramo a tramo no usa el factor de Christiansen, por lo que la
+pérdida nominal (sin variación) puede diferir de la del diseño. Se parte
+del caudal y la longitud de cada tramo de la entrada (también de un
+Perfil) y de su modelo de fricción; con Darcy–Weisbach la pérdida no
+depende de C, de modo que el envejecimiento (C_sd) no se aplica. Los
+factores de variación del caudal se muestrean de una normal truncada en
+valores positivos, para que ninguna salida quede sin caudal.
+
+Las muestras se generan en tareas de tamaño fijo con semillas derivadas de
+una SeedSequence, de modo que el resultado es reproducible e independiente
+del número de procesos.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+
+from submain_engine import (
+    DARCY, K_HW, RUGOSIDAD, V_MAX, area, hf_darcy, viscosidad,
+)
+
+
+@dataclass(frozen=True)
+class Incertidumbre:
+    C_sd: float = 10.0          # desviación estándar de C
+    cv_q: float = 0.05          # coeficiente de variación del caudal por salida
+    tol_S: float = 0.02         # tolerancia relativa del espaciamiento (uniforme ±)
+
+
+@dataclass(frozen=True)
+class ResultadoMonteCarlo:
+    HF: np.ndarray              # pérdida por muestra (m)
+    V_max: np.ndarray           # velocidad máxima por muestra (m/s)
+    t_avance: np.ndarray        # tiempo de avance por muestra (min)
+    HF_disp: float
+    HF_nominal: float           # pérdida tramo a tramo sin variación (m)
+
+    @property
+    def muestras(self):
+        return len(self.HF)
+
+    @property
+    def p_HF(self):
+        """Probabilidad de superar la pérdida disponible."""
+        return float(np.mean(self.HF > self.HF_disp))
+
+    @property
+    def p_V(self):
+        """Probabilidad de superar la velocidad máxima."""
+        return float(np.mean(self.V_max > V_MAX))
+
+    def percentiles(self, q=(5, 50, 95)):
+        return {nombre: dict(zip(q, np.percentile(getattr(self, nombre), q)))
+                for nombre in ("HF", "V_max", "t_avance")}
+
+
+# ===============================
+# NÚCLEO VECTORIZADO
+# ===============================
+def _positivos(rng, cv, forma):
+    """Factores 1 + cv·N(0, 1) truncados en valores positivos (se remuestrean)."""
+    f = 1 + cv * rng.standard_normal(forma)
+    malos = f <= 0
+    while malos.any():
+        f[malos] = 1 + cv * rng.standard_normal(int(malos.sum()))
+        malos = f <= 0
+    return f
+
+
+def _evaluar(semilla, muestras, q_salida, dl0, C, diametros, inc, bloque, darcy=None):
+    """
+    darcy: (viscosidad, rugosidad relativa por tramo) para Darcy–Weisbach,
+    o None para Hazen–Williams.
+    """
+    rng = np.random.default_rng(semilla)
+    n = len(diametros)
+    k = diametros**-4.872
+    A = area(diametros)
+
+    HF = np.empty(muestras)
+    V_max = np.empty(muestras)
+    t = np.empty(muestras)
+    filas = max(1, bloque // n)
+    for i0 in range(0, muestras, filas):
+        m = min(filas, muestras - i0)
+        Cm = np.maximum(C + inc.C_sd * rng.standard_normal(m), 1.0)
+        qs = q_salida * _positivos(rng, inc.cv_q, (m, n))
+        dl = dl0 * (1 + inc.tol_S * rng.uniform(-1, 1, (m, n)))
+
+        # Caudal de cada tramo: suma de las salidas aguas abajo
+        q_tramo = np.cumsum(qs[:, ::-1], axis=1)[:, ::-1]
+
+        sl = slice(i0, i0 + m)
+        if darcy is None:
+            HF[sl] = K_HW * ((q_tramo / Cm[:, None])**1.852 * dl * k).sum(axis=1)
+        else:
+            HF[sl] = hf_darcy(q_tramo, dl, diametros, *darcy).sum(axis=1)
+        V_max[sl] = (q_tramo / A).max(axis=1) / 3600
+        t[sl] = (dl * A * 3600 / q_tramo).sum(axis=1) / 60
+    return HF, V_max, t
+
+
+def _tarea(args):
+    return _evaluar(*args)
+
+
+def monte_carlo(e, diametros, inc=Incertidumbre(), muestras=100_000,
+                semilla=0, procesos=1, tarea=50_000, bloque=2_000_000):
+    """
+    Simula `muestras` realizaciones del diseño `diametros` (uno por tramo
+    entre salidas, ver engine.diametros_por_tramo). Las tareas de `tarea` muestras
+    se reparten en `procesos` procesos; `bloque` acota los elementos
+    (muestras × salidas) de cada paso vectorizado.
+    """
+    diametros = np.asarray(diametros, dtype=float)
+    if len(diametros) != e.Salidas:
+        raise ValueError("Debe haber un diámetro por tramo entre salidas")
+
+    # Caudal de cada salida y longitud de cada tramo nominales
+    _, dl, q_tramo = e.tramos()
+    q_salida = q_tramo - np.append(q_tramo[1:], 0.0)
+    dl = np.broadcast_to(np.asarray(dl, dtype=float), (e.Salidas,))
+    darcy = None
+    if e.modelo == DARCY:
+        darcy = (viscosidad(e.temperatura), RUGOSIDAD[e.material] / diametros)
+
+    tamanos = [min(tarea, muestras - i) for i in range(0, muestras, tarea)]
+    semillas = np.random.SeedSequence(semilla).spawn(len(tamanos))
+    comunes = (q_salida, dl, e.C, diametros, inc, bloque, darcy)
+    args = [(s, m) + comunes for s, m in zip(semillas, tamanos)]
+
+    if procesos > 1 and len(args) > 1:
+        with ProcessPoolExecutor(max_workers=procesos) as pool:
+            partes = list(pool.map(_tarea, args))
+    else:
+        partes = [_tarea(a) for a in args]
+
+    HF, V_max, t = (np.concatenate(x) for x in zip(*partes))
+    nominal = _evaluar(0, 1, q_salida, dl, e.C, diametros, Incertidumbre(0, 0, 0),
+                       bloque, darcy)
+    return ResultadoMonteCarlo(HF=HF, V_max=V_max, t_avance=t, HF_disp=e.HF_disp,
+                               HF_nominal=float(nominal[0][0]))
@@ -0,0 +1,315 @@
+"""
+Red de tuberías: una submain que alimenta muchas secundarias.
+
+Las tuberías (de la red ramificada de red_submain o de cualquier trazado,
+también mallado, leído con red_desde_tablas) se resuelven en conjunto con
+el método del gradiente global (Todini–Pilati): en cada iteración de
+Newton se resuelve el sistema de cargas en los nudos
+
+    (A21·D⁻¹·A12) ΔH = (A21·Q - d) - A21·D⁻¹·E
+
+con D la derivada de la pérdida de Hazen–Williams de cada tubería y E el
+residuo de energía. La matriz tiene siempre el mismo patrón: se arma una
+sola vez en formato CSC (cada iteración sólo rellena los valores con
+bincount) y el ordenamiento que reduce el llenado se calcula una sola vez
+al armar la red y se reutiliza en todas las factorizaciones, también
+cuando sólo cambian las demandas.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.sparse.csgraph import connected_components
+from scipy.sparse.linalg import splu
+
+from submain_engine import (
+    K_HW, MATERIALES, area, diametros_por_tramo, solucion_un_diametro,
+)
+
+N_HW = 1.852
+
+
+def _en_tuberias(k, H):
+    """Valor de H en el nudo k de cada tubería (0 si el nudo es fijo)."""
+    return np.where(k >= 0, H[np.maximum(k, 0)], 0.0)
+
+
+def diametros_catalogo():
+    """Diámetros internos (mm) de todas las clases de los catálogos PVC/PE."""
+    return np.unique(np.concatenate(
+        [np.asarray(d, dtype=float) for clases in MATERIALES.values()
+         for d in clases.values()]))
+
+
+def _suma_nudos(k, x, n):
+    """Suma de x por nudo k, ignorando los nudos fijos (k < 0)."""
+    ok = k >= 0
+    return np.bincount(k[ok], weights=x[ok], minlength=n)
+
+
+@dataclass(frozen=True)
+class ResultadoRed:
+    caudal: np.ndarray          # caudal por tubería (m³/h), positivo de `desde` a `hasta`
+    carga: np.ndarray           # carga piezométrica por nudo (m)
+    hf: np.ndarray              # pérdida por tubería (m)
+    velocidad: np.ndarray       # velocidad por tubería (m/s)
+    convergio: bool
+    iteraciones: int
+    residuo: float              # máxima corrección relativa de caudal al terminar
+
+
+class Red:
+    """
+    Red de `nudos` nudos y tuberías (desde[p], hasta[p]) de longitud L (m),
+    diámetro interno D (mm, tomado de los catálogos PVC/PE) y coeficiente C.
+
+    fijos: {nudo: carga (m)} de los nudos de carga conocida (entradas).
+    rama:  etiqueta de cada tubería para el resumen por rama.
+    """
+
+    def __init__(self, nudos, desde, hasta, L, D, C=150, fijos=None, rama=None):
+        desde, hasta = np.asarray(desde), np.asarray(hasta)
+        n_tub = len(desde)
+        self.nudos = int(nudos)
+        self.desde, self.hasta = desde, hasta
+        self.L = np.broadcast_to(np.asarray(L, dtype=float), (n_tub,))
+        self.D = np.broadcast_to(np.asarray(D, dtype=float), (n_tub,))
+        self.C = np.broadcast_to(np.asarray(C, dtype=float), (n_tub,))
+        self.rama = None if rama is None else np.asarray(rama)
+        if not fijos:
+            raise ValueError("La red necesita al menos un nudo de carga fija")
+        if ((desde < 0) | (desde >= nudos) | (hasta < 0) | (hasta >= nudos)).any():
+            raise ValueError("Tubería con nudo inexistente")
+        fuera = ~np.isin(np.round(self.D, 2), np.round(diametros_catalogo(), 2))
+        if fuera.any():
+            raise ValueError(f"Diámetro fuera de los catálogos PVC/PE: "
+                             f"{self.D[fuera.argmax()]:g} mm")
+        if not ((self.L > 0).all() and (self.C > 0).all()):
+            raise ValueError("L y C de cada tubería deben ser positivos")
+
+        # Pérdida = r·|Q|^0.852·Q
+        self.r = K_HW * self.C**-N_HW * self.L * self.D**-4.872
+        self.A = area(self.D)
+
+        if any(not 0 <= k < nudos for k in fijos):
+            raise ValueError("Nudo de carga fija inexistente")
+        self.fijo = np.zeros(nudos, dtype=bool)
+        self.fijo[list(fijos)] = True
+        _, comp = connected_components(
+            sp.coo_matrix((np.ones(n_tub), (desde, hasta)), shape=(nudos, nudos)),
+            directed=False)
+        sin_carga = np.setdiff1d(comp, comp[self.fijo])
+        if sin_carga.size:
+            nudo = int(np.flatnonzero(comp == sin_carga[0])[0])
+            raise ValueError(f"El nudo {nudo} no está conectado a ningún nudo de carga fija")
+        self.H_fijo = np.zeros(nudos)
+        self.H_fijo[list(fijos)] = list(fijos.values())
+
+        # Numeración de las incógnitas (nudos de carga desconocida)
+        self.incognita = np.full(nudos, -1)
+        self.incognita[~self.fijo] = np.arange((~self.fijo).sum())
+        self._armar_patron()
+        self._ordenar()
+
+    # ===============================
+    # PATRÓN DISPERSO (UNA SOLA VEZ)
+    # ===============================
+    def _armar_patron(self):
+        i, j = self.incognita[self.desde], self.incognita[self.hasta]
+        n = int((~self.fijo).sum())
+        tub = np.arange(len(i))
+
+        # Contribuciones w·[1, 1, -1, -1] de cada tubería a (i,i), (j,j), (i,j), (j,i)
+        filas = np.concatenate((i, j, i, j))
+        cols = np.concatenate((i, j, j, i))
+        signo = np.repeat([1.0, 1.0, -1.0, -1.0], len(i))
+        tubo = np.tile(tub, 4)
+        ok = (filas >= 0) & (cols >= 0)
+        filas, cols, signo, tubo = filas[ok], cols[ok], signo[ok], tubo[ok]
+
+        # Orden por columnas (CSC) y posiciones únicas del patrón
+        clave = cols.astype(np.int64) * n + filas
+        unicas, self._pos = np.unique(clave, return_inverse=True)
+        self._signo, self._tubo = signo, tubo
+        self._indices = (unicas % n).astype(np.int32)
+        self._indptr = np.concatenate(
+            ([0], np.cumsum(np.bincount(unicas // n, minlength=n)))).astype(np.int32)
+        self._n = n
+
+    def _matriz(self, w):
+        datos = np.bincount(self._pos, weights=self._signo * w[self._tubo],
+                            minlength=len(self._indices))
+        return sp.csc_matrix((datos, self._indices, self._indptr),
+                             shape=(self._n, self._n))
+
+    def _ordenar(self):
+        """
+        Análisis simbólico único: el ordenamiento de grado mínimo de la
+        primera factorización se aplica renumerando las incógnitas, de modo
+        que las siguientes factorizaciones ya no reordenan.
+        """
+        lu = splu(self._matriz(np.ones(len(self.desde))), permc_spec="MMD_AT_PLUS_A",
+                  options=dict(SymmetricMode=True), diag_pivot_thresh=0)
+        nuevo = lu.perm_c     # posición de cada incógnita en el nuevo orden
+        self.incognita[~self.fijo] = nuevo[self.incognita[~self.fijo]]
+        self._armar_patron()
+
+    def _resolver_lineal(self, M, b):
+        lu = splu(M, permc_spec="NATURAL",
+                  options=dict(SymmetricMode=True), diag_pivot_thresh=0)
+        return lu.solve(b)
+
+    # ===============================
+    # SOLUCIÓN (GRADIENTE GLOBAL)
+    # ===============================
+    def resolver(self, demandas, tol=1e-6, max_iter=50, Q0=None):
+        """
+        Caudales y cargas para las `demandas` de cada nudo (m³/h; en los
+        nudos fijos se ignoran). `Q0` son los caudales iniciales (p. ej. el
+        caudal de una solución anterior); la Red no guarda estado entre
+        llamadas, de modo que puede compartirse entre hilos y sesiones.
+        """
+        libres = ~self.fijo
+        d = np.empty(self._n)
+        d[self.incognita[libres]] = np.asarray(demandas, dtype=float)[libres]
+        i, j = self.incognita[self.desde], self.incognita[self.hasta]
+        if Q0 is None or np.shape(Q0) != self.A.shape:
+            Q = self.A * 3600 * 0.5
+        else:
+            Q = np.array(Q0, dtype=float)
+        H = np.zeros(self._n)
+        H0_i = np.where(i < 0, self.H_fijo[self.desde], 0.0)
+        H0_j = np.where(j < 0, self.H_fijo[self.hasta], 0.0)
+
+        for it in range(1, max_iter + 1):
+            aQ = np.maximum(np.abs(Q), 1e-6)
+            Dq = N_HW * self.r * aQ**(N_HW - 1)
+            # Residuo de energía: pérdida - (H_desde - H_hasta)
+            E = (self.r * aQ**(N_HW - 1) * Q
+                 - (_en_tuberias(i, H) + H0_i - _en_tuberias(j, H) - H0_j))
+            w = 1 / Dq
+
+            # Continuidad: entradas - salidas - demanda en cada incógnita
+            F = _suma_nudos(j, Q, self._n) - _suma_nudos(i, Q, self._n) - d
+            g = w * E
+            b = F - (_suma_nudos(j, g, self._n) - _suma_nudos(i, g, self._n))
+            dH = self._resolver_lineal(self._matriz(w), b)
+
+            dQ = -w * (E - (_en_tuberias(i, dH) - _en_tuberias(j, dH)))
+            H = H + dH
+            Q = Q + dQ
+            res = float(np.abs(dQ).max() / max(np.abs(Q).max(), 1e-12))
+            if res < tol:
+                break
+
+        carga = self.H_fijo.copy()
+        carga[libres] = H[self.incognita[libres]]
+        hf = self.r * np.abs(Q)**(N_HW - 1) * Q
+        return ResultadoRed(
+            caudal=Q, carga=carga, hf=hf, velocidad=np.abs(Q) / self.A / 3600,
+            convergio=res < tol, iteraciones=it, residuo=res)
+
+    def resumen_ramas(self, res):
+        """Pérdida, velocidad máxima y tiempo de avance de cada rama."""
+        import pandas as pd
+        if self.rama is None:
+            raise ValueError("La red no tiene etiquetas de rama")
+        t = self.L / np.maximum(res.velocidad, 1e-12) / 60
+        df = pd.DataFrame({"Rama": self.rama, "hf": np.abs(res.hf), "V": res.velocidad,
+                           "Q": np.abs(res.caudal), "t": t,
+                           "H": np.minimum(res.carga[self.desde], res.carga[self.hasta])})
+        g = df.groupby("Rama", sort=False)
+        return pd.DataFrame({
+            "Caudal de entrada (m³/h)": g["Q"].max(),
+            "HF (m)": g["hf"].sum(),
+            "Velocidad máxima (m/s)": g["V"].max(),
+            "Tiempo de avance (min)": g["t"].sum().round(2),
+            "Carga mínima (m)": g["H"].min(),
+        }).reset_index()
+
+
+# ===============================
+# SUBMAIN CON SECUNDARIAS
+# ===============================
+def red_submain(secundarias, espaciamiento, D_submain, H_entrada, C_submain=150,
+                diametros=None):
+    """
+    Red ramificada: una submain con una toma cada `espaciamiento` m y, en
+    cada toma, una secundaria (Entrada) discretizada por salidas con su
+    caudal por salida como demanda. `diametros` da el diámetro de cada
+    tramo de cada secundaria; por defecto, el recomendado con un diámetro.
+
+    Devuelve (Red, demandas).
+    """
+    desde, hasta, L, D, C, rama, demanda = [], [], [], [], [], [], [0.0]
+    tomas = []
+    for k in range(len(secundarias)):
+        desde.append(k)
+        hasta.append(k + 1)
+        tomas.append(k + 1)
+    n_sub = len(secundarias)
+    L += [espaciamiento] * n_sub
+    D += [D_submain] * n_sub
+    C += [C_submain] * n_sub
+    rama += ["Submain"] * n_sub
+    demanda += [0.0] * n_sub
+
+    nudo = n_sub + 1
+    for k, e in enumerate(secundarias):
+        if diametros is None:
+            d1 = solucion_un_diametro(e).d1
+            if d1 is None:
+                raise ValueError(f"La secundaria {k + 1} no tiene diámetro que cumpla")
+            d_tramos = diametros_por_tramo(e, d1)
+        else:
+            d_tramos = np.broadcast_to(diametros[k], (e.Salidas,))
+        _, dl, q = e.tramos()
+        q_salida = q - np.append(q[1:], 0.0)
+        nudos = np.arange(nudo, nudo + e.Salidas)
+        desde += [tomas[k]] + nudos[:-1].tolist()
+        hasta += nudos.tolist()
+        L += np.broadcast_to(dl, (e.Salidas,)).tolist()
+        D += list(d_tramos)
+        C += [e.C] * e.Salidas
+        rama += [f"Secundaria {k + 1}"] * e.Salidas
+        demanda += q_salida.tolist()
+        nudo += e.Salidas
+
+    red = Red(nudo, desde, hasta, L, D, C, fijos={0: H_entrada}, rama=rama)
+    return red, np.array(demanda)
+
+
+# ===============================
+# RED DESDE TABLAS (RAMIFICADA O MALLADA)
+# ===============================
+def red_desde_tablas(tuberias, nudos):
+    """
+    Red de cualquier trazado (ramificado o con mallas) desde dos tablas:
+
+    tuberias: desde, hasta, L (m), D (mm) y, opcionalmente, C y rama.
+    nudos:    nudo, demanda (m³/h) y, opcionalmente, carga (m) en los nudos
+              de carga fija (vacía en los demás).
+
+    Los nudos se numeran 0..n-1. Devuelve (Red, demandas).
+    """
+    faltan = ({"desde", "hasta", "L", "D"} - set(tuberias.columns)) | \
+             ({"nudo", "demanda"} - set(nudos.columns))
+    if faltan:
+        raise ValueError(f"Faltan columnas: {', '.join(sorted(faltan))}")
+    if (nudos["nudo"] < 0).any() or (tuberias[["desde", "hasta"]] < 0).any(axis=None):
+        raise ValueError("Los nudos se numeran desde 0")
+    n = int(nudos["nudo"].max()) + 1 if len(nudos) else 0
+    n = max(n, int(tuberias[["desde", "hasta"]].to_numpy().max()) + 1)
+    demandas = np.zeros(n)
+    demandas[nudos["nudo"].to_numpy(dtype=int)] = nudos["demanda"].to_numpy(dtype=float)
+    fijos = {}
+    if "carga" in nudos.columns:
+        con_carga = nudos.dropna(subset=["carga"])
+        fijos = dict(zip(con_carga["nudo"].astype(int), con_carga["carga"].astype(float)))
+    C = tuberias["C"].to_numpy(dtype=float) if "C" in tuberias.columns else 150
+    rama = (tuberias["rama"].astype(str).to_numpy() if "rama" in tuberias.columns
+            else [f"Tubería {p + 1}" for p in range(len(tuberias))])
+    red = Red(n, tuberias["desde"].to_numpy(dtype=int), tuberias["hasta"].to_numpy(dtype=int),
+              tuberias["L"].to_numpy(dtype=float), tuberias["D"].to_numpy(dtype=float),
+              C, fijos=fijos, rama=rama)
+    return red, demandas
@@ -0,0 +1,313 @@
+"""
+Gráficos y memoria de cálculo (PDF) de la tubería secundaria.
+
+Todo se genera en memoria: el gráfico se dibuja sobre una Figure propia
+(sin pyplot, por lo que no queda registrada en el estado global de
+matplotlib y se libera al salir de la función) y el PDF se construye en un
+BytesIO. Así varias sesiones concurrentes no comparten archivos en el
+directorio de trabajo.
+"""
+import io
+from functools import lru_cache
+
+import numpy as np
+from matplotlib.colors import BoundaryNorm
+from matplotlib.figure import Figure
+
+from submain_engine import DARCY, HAZEN, V_MAX, etiqueta_material
+from submain_graficos import reducir
+
+PDF_NOMBRE = "Memoria_Secundaria_Riego.pdf"
+PUNTOS_PDF = 2000       # puntos por serie del gráfico de la memoria
+
+
+# ===============================
+# GRÁFICO VELOCIDAD VS LONGITUD
+# ===============================
+def _armar_grafico(fig):
+    """
+    Ejes del gráfico velocidad / tiempo acumulado, con sus rótulos y las
+    líneas aún vacías: [(ax, ax_tiempo, linea_velocidad, linea_tiempo)]
+    para un diámetro y para dos diámetros progresivos.
+    """
+    axes = fig.subplots(1, 2, sharex=True)
+    paneles = []
+    for ax, titulo in zip(axes, ("Un diámetro", "Dos diámetros progresivos")):
+        ax.set_title(titulo)
+        ax.set_xlabel("Longitud acumulada (m)")
+        ax.set_ylabel("Velocidad (m/s)", color="tab:red")
+        ax.tick_params(axis='y', labelcolor="tab:red")
+        ax.grid(True, linestyle=":", alpha=0.6)
+
+        axb = ax.twinx()
+        axb.set_ylabel("Tiempo acumulado (min)", color="tab:blue")
+        axb.tick_params(axis='y', labelcolor="tab:blue")
+
+        v, = ax.plot([], [], color="tab:red", linewidth=2)
+        t, = axb.plot([], [], "o", color="tab:blue", markersize=5)
+        paneles.append((ax, axb, v, t))
+    return paneles
+
+
+def _cargar_grafico(paneles, avance, sol2):
+    """
+    Carga los datos del avance en las líneas (reducidas con LTTB a
+    PUNTOS_PDF por serie) y reajusta las escalas.
+    """
+    datos = ((avance.v_tramo, avance.t_acum),
+             (avance.v_tramo_comb, avance.t_acum_comb) if sol2 else (None, None))
+    for (ax, axb, v, t), (vel, tiempo) in zip(paneles, datos):
+        hay = vel is not None
+        v.set_data(*(reducir(avance.long_acum, vel, PUNTOS_PDF) if hay else ([], [])))
+        t.set_data(*(reducir(avance.long_acum, tiempo, PUNTOS_PDF) if hay else ([], [])))
+        axb.set_visible(hay)
+        for eje in (ax, axb):
+            eje.relim()
+            if not hay:
+                # Sin datos: la escala vacía de una figura nueva
+                eje.set_ylim(-0.055, 0.055)
+                eje.set_autoscaley_on(True)
+            eje.autoscale_view()
+
+
+def dibujar_grafico(avance, sol2):
+    fig = Figure(figsize=(16,5))
+    _cargar_grafico(_armar_grafico(fig), avance, sol2)
+    fig.tight_layout()
+    return fig
+
+
+def grafico_png(avance, sol2, dpi=300):
+    """Gráfico como PNG en memoria; la figura se descarta al terminar."""
+    fig = dibujar_grafico(avance, sol2)
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png", dpi=dpi)
+    return buf.getvalue()
+
+
+class PlantillaGrafico:
+    """
+    Figura del gráfico armada una sola vez y reutilizada para muchas
+    memorias: sólo cambian los datos de las líneas. Los márgenes son fijos
+    (holgados para rótulos de hasta seis caracteres), sin recalcular
+    tight_layout en cada gráfico. No es segura entre hilos; se usa una por
+    proceso.
+    """
+
+    def __init__(self):
+        self.fig = Figure(figsize=(16,5))
+        self.paneles = _armar_grafico(self.fig)
+        self.fig.subplots_adjust(left=0.05, right=0.95, bottom=0.1, top=0.93,
+                                 wspace=0.3)
+
+    def png(self, avance, sol2, dpi=300):
+        _cargar_grafico(self.paneles, avance, sol2)
+        buf = io.BytesIO()
+        self.fig.savefig(buf, format="png", dpi=dpi)
+        return buf.getvalue()
+
+
+# ===============================
+# MAPAS DEL BARRIDO DE PARÁMETROS
+# ===============================
+ETIQUETAS_BARRIDO = {
+    "Q": "Caudal total (m³/h)",
+    "S": "Espaciamiento entre salidas (m)",
+    "LL": "Longitud total (m)",
+    "HF_disp": "Pérdida disponible (m)",
+    "C": "Coeficiente Hazen–Williams (C)",
+    "d1": "Diámetro recomendado (mm)",
+    "HF": "Pérdida de carga (m)",
+    "V": "Velocidad (m/s)",
+    "t_avance": "Tiempo de avance (min)",
+}
+
+
+def dibujar_barrido(barrido, variable, x, y):
+    """Mapa de calor de `variable` en el plano (x, y), con isolíneas."""
+    Z = barrido.plano(variable, x, y)
+    X, Y = barrido.ejes[x], barrido.ejes[y]
+
+    fig = Figure(figsize=(10,6))
+    ax = fig.subplots()
+    ax.set_title(f"{ETIQUETAS_BARRIDO[variable]} – "
+                 f"{etiqueta_material(barrido.material, barrido.clase)}")
+    ax.set_xlabel(ETIQUETAS_BARRIDO[x])
+    ax.set_ylabel(ETIQUETAS_BARRIDO[y])
+
+    if variable == "d1":
+        # Diámetros discretos: un color por diámetro del catálogo
+        niveles = np.unique(Z[np.isfinite(Z)])
+        if len(niveles):
+            bordes = np.concatenate(([niveles[0] - 1],
+                                     (niveles[1:] + niveles[:-1]) / 2,
+                                     [niveles[-1] + 1]))
+            malla = ax.pcolormesh(X, Y, Z, shading="nearest", cmap="viridis",
+                                  norm=BoundaryNorm(bordes, 256))
+            barra = fig.colorbar(malla, ax=ax, ticks=niveles)
+            barra.set_label(ETIQUETAS_BARRIDO[variable])
+    else:
+        malla = ax.pcolormesh(X, Y, Z, shading="nearest", cmap="viridis")
+        fig.colorbar(malla, ax=ax).set_label(ETIQUETAS_BARRIDO[variable])
+        if len(X) > 1 and len(Y) > 1 and np.isfinite(Z).any():
+            iso = ax.contour(X, Y, Z, levels=8, colors="white", linewidths=0.8)
+            ax.clabel(iso, fontsize=8, fmt="%.3g")
+
+    fig.tight_layout()
+    return fig
+
+
+# ===============================
+# HISTOGRAMAS DEL ANÁLISIS MONTE CARLO
+# ===============================
+def dibujar_monte_carlo(res):
+    """Histogramas de HF, velocidad máxima y tiempo de avance, con sus límites."""
+    fig = Figure(figsize=(16,4.5))
+    axes = fig.subplots(1, 3)
+    for ax, datos, titulo, limite in (
+        (axes[0], res.HF, "Pérdida de carga (m)", res.HF_disp),
+        (axes[1], res.V_max, "Velocidad máxima (m/s)", V_MAX),
+        (axes[2], res.t_avance, "Tiempo de avance (min)", None),
+    ):
+        ax.hist(datos[np.isfinite(datos)], bins=80, color="tab:blue", alpha=0.75)
+        ax.set_xlabel(titulo)
+        ax.grid(True, linestyle=":", alpha=0.6)
+        if limite is not None:
+            ax.axvline(limite, color="tab:red", linewidth=2)
+    axes[0].set_ylabel("Muestras")
+
+    fig.tight_layout()
+    return fig
+
+
+# ===============================
+# PERFIL DE PRESIÓN CON EMISORES
+# ===============================
+def dibujar_presiones(perfil, cota=None):
+    """Presión y caudal por salida a lo largo de la secundaria."""
+    fig = Figure(figsize=(16,5))
+    ax = fig.subplots()
+    ax.set_xlabel("Longitud acumulada (m)")
+    ax.set_ylabel("Presión (m)", color="tab:red")
+    ax.plot(perfil.long_acum, perfil.presion, color="tab:red", linewidth=2)
+    if cota is not None:
+        ax.plot(perfil.long_acum, cota, color="tab:brown", linestyle="--",
+                label="Cota del terreno (m)")
+        ax.legend(loc="lower left")
+    ax.tick_params(axis='y', labelcolor="tab:red")
+    ax.grid(True, linestyle=":", alpha=0.6)
+
+    axb = ax.twinx()
+    axb.set_ylabel("Caudal por salida (m³/h)", color="tab:blue")
+    axb.plot(perfil.long_acum, perfil.caudal, color="tab:blue", linewidth=1)
+    axb.tick_params(axis='y', labelcolor="tab:blue")
+
+    fig.tight_layout()
+    return fig
+
+
+# ===============================
+# MEMORIA DE CÁLCULO (PDF)
+# ===============================
+# ReportLab se importa recién al generar una memoria: la interfaz no paga
+# su importación en el arranque.
+@lru_cache(maxsize=None)
+def estilos():
+    """Hoja de estilos compartida (se arma una sola vez por proceso)."""
+    from reportlab.lib.styles import getSampleStyleSheet
+    return getSampleStyleSheet()
+
+
+def documento(destino):
+    """Plantilla carta con márgenes de media pulgada sobre `destino`."""
+    from reportlab import rl_config
+    from reportlab.lib.pagesizes import letter
+    from reportlab.platypus import SimpleDocTemplate
+
+    # Flujos binarios en lugar de ASCII85: sin el acelerador en C de
+    # ReportLab la codificación ASCII85 de la imagen en Python puro domina
+    # el armado del PDF, y además agranda el archivo un 20 %.
+    rl_config.useA85 = 0
+    return SimpleDocTemplate(
+        destino,
+        pagesize=letter,
+        rightMargin=36,
+        leftMargin=36,
+        topMargin=36,
+        bottomMargin=36
+    )
+
+
+def elementos_memoria(entrada, d1, avance, sol2, png):
+    """Contenido (flowables) de la memoria de una secundaria."""
+    from reportlab.lib.units import cm
+    from reportlab.platypus import Image, Paragraph, Spacer, Table
+
+    styles = estilos()
+    elements = []
+    e = entrada
+    if e.modelo == DARCY:
+        friccion = f"{DARCY} (agua a {e.temperatura:g} °C)"
+    else:
+        friccion = f"{HAZEN} (C = {e.C})"
+
+    # ----- CONTENIDO DEL PDF -----
+    elements.append(Paragraph(
+        "<b>MEMORIA DE CÁLCULO – TUBERÍA SECUNDARIA DE RIEGO</b>",
+        styles["Title"]
+    ))
+
+    elements.append(Spacer(1, 12))
+
+    elements.append(Paragraph(
+        f"""
+        <b>Datos de entrada</b><br/>
+        Caudal total: {e.Q:.2f} m³/h<br/>
+        Longitud total: {e.LL:.1f} m<br/>
+        Espaciamiento entre salidas: {e.S:.1f} m<br/>
+        Número de salidas: {e.Salidas}<br/>
+        Modelo de fricción: {friccion}<br/>
+        Pérdida disponible: {e.HF_disp:.2f} m<br/>
+        Material: {e.mat_label}
+        """,
+        styles["Normal"]
+    ))
+
+    elements.append(Spacer(1, 10))
+
+    if d1:
+        elements.append(Paragraph("<b>Solución con un diámetro</b>", styles["Heading3"]))
+        elements.append(Paragraph(
+            f"Diámetro seleccionado: {d1:.1f} mm<br/>"
+            f"Tiempo de avance: {avance.t_avance:.2f} min",
+            styles["Normal"]
+        ))
+
+    if sol2:
+        elements.append(Spacer(1, 8))
+        elements.append(Paragraph("<b>Solución con dos diámetros</b>", styles["Heading3"]))
+
+        tabla = Table([
+            ["Tramo", "Diámetro (mm)", "Longitud (m)", "Velocidad (m/s)"],
+            ["Inicial", sol2.D1, sol2.L1, f"{sol2.V1:.2f}"],
+            ["Final", sol2.D2, sol2.L2, f"{sol2.V2:.2f}"],
+        ])
+
+        elements.append(tabla)
+
+        elements.append(Paragraph(
+            f"Pérdida total de carga: {sol2.HF:.3f} m<br/>"
+            f"Tiempo de avance total: {avance.t_avance_comb:.2f} min",
+            styles["Normal"]
+        ))
+
+    elements.append(Spacer(1, 12))
+    elements.append(Image(io.BytesIO(png), width=16*cm, height=6*cm))
+    return elements
+
+
+def memoria_pdf(entrada, d1, avance, sol2, png):
+    """Memoria de cálculo como bytes PDF; `png` es el gráfico ya generado."""
+    buf = io.BytesIO()
+    documento(buf).build(elementos_memoria(entrada, d1, avance, sol2, png))
+    return buf.getvalue()
@@ -0,0 +1,80 @@
+"""
+Barrido de parámetros del diseño con un diámetro.
+
+Evalúa la selección de diámetro, la pérdida HF, la velocidad y el tiempo de
+avance sobre mallas completas de Q, S, LL, HF_disp y C para una clase
+SDR/PN. La malla se recorre en bloques de a lo sumo `bloque` puntos con
+arreglos de NumPy, de modo que la memoria queda acotada aun con millones
+de combinaciones.
+"""
+from dataclasses import dataclass
+from math import prod
+
+import numpy as np
+
+from submain_engine import K_HW, catalogo, factor_christiansen, t_avance_uno
+
+PARAMETROS = ("Q", "S", "LL", "HF_disp", "C")
+
+
+@dataclass(frozen=True)
+class Barrido:
+    material: str
+    clase: str
+    ejes: dict          # parámetro -> valores (un eje de la malla por parámetro)
+    d1: np.ndarray      # diámetro recomendado (mm), NaN si ninguno cumple
+    HF: np.ndarray      # pérdida con d1 (m)
+    V: np.ndarray       # velocidad a la entrada con d1 (m/s)
+    t_avance: np.ndarray  # tiempo de avance con d1 (min)
+
+    def plano(self, variable, x, y):
+        """
+        Corte 2-D de `variable` con `x` en columnas e `y` en filas; los
+        demás parámetros deben tener un solo valor.
+        """
+        datos = getattr(self, variable)
+        otros = [p for p in PARAMETROS if p not in (x, y)]
+        if any(len(self.ejes[p]) != 1 for p in otros):
+            raise ValueError("Los parámetros fuera del plano deben ser fijos")
+        orden = [PARAMETROS.index(y), PARAMETROS.index(x)]
+        orden += [PARAMETROS.index(p) for p in otros]
+        return np.transpose(datos, orden).reshape(len(self.ejes[y]), len(self.ejes[x]))
+
+
+def barrido(material, clase, Q, S, LL, HF_disp, C=150, bloque=1 << 20):
+    """
+    Cada parámetro puede ser un escalar o un arreglo 1-D; el resultado
+    tiene un eje por parámetro, en el orden de PARAMETROS.
+    """
+    cat = catalogo(material, clase)
+    ejes = {p: np.atleast_1d(np.asarray(v, dtype=float))
+            for p, v in zip(PARAMETROS, (Q, S, LL, HF_disp, C))}
+    for p, v in ejes.items():
+        if not (np.isfinite(v).all() and (v > 0).all()):
+            raise ValueError(f"{p} debe ser positivo y finito")
+    forma = tuple(len(v) for v in ejes.values())
+    total = prod(forma)
+
+    res = {k: np.full(total, np.nan) for k in ("d1", "HF", "V", "t_avance")}
+
+    for i0 in range(0, total, bloque):
+        plano = np.unravel_index(np.arange(i0, min(total, i0 + bloque)), forma)
+        q, s, ll, h, c = (ejes[p][i] for p, i in zip(PARAMETROS, plano))
+
+        n = np.floor(ll / s).astype(np.int64)
+        valido = n >= 1
+        n = np.maximum(n, 1)
+        F = factor_christiansen(n)
+
+        i = cat.indice_minimo(q, ll, h, c, F)
+        valido &= i >= 0
+        j = np.where(valido, i, 0)
+
+        sl = slice(i0, i0 + len(q))
+        res["d1"][sl] = np.where(valido, cat.d[j], np.nan)
+        res["HF"][sl] = np.where(valido, K_HW * (q / c)**1.852 * ll * cat.k[j] * F, np.nan)
+        res["V"][sl] = np.where(valido, q / cat.A[j] / 3600, np.nan)
+        res["t_avance"][sl] = np.where(valido, t_avance_uno(q, s, n, cat.d[j]), np.nan)
+
+    return Barrido(material, clase, ejes,
+                   **{k: v.reshape(forma) for k, v in res.items()})
@@ -0,0 +1,320 @@
+"""
+Diseño telescópico de la secundaria con cualquier número de diámetros.
+
+La tubería se discretiza por salidas: el tramo k (k = 1..Salidas) tiene
+longitud S y conduce q_k = Q - (k-1)·q_salida. Se eligen diámetros no
+crecientes aguas abajo, tomados de la clase SDR/PN seleccionada, que
+minimizan el costo (o el volumen) de tubería con HF <= HF_disp y
+V <= V_MAX en cada tramo.
+
+La restricción de pérdida se relaja con un multiplicador λ:
+    min  Σ c_j·L_j + λ·HF
+y para cada λ se resuelve una programación dinámica sobre los diámetros
+con sumas prefijas de la pérdida por salida, de modo que cada etapa es una
+operación vectorizada sobre las salidas. λ se ajusta por bisección hasta
+cumplir HF_disp, y una búsqueda local de cambios de uno o dos tramos
+aprovecha la holgura que deja la relajación.
+
+El resultado es heurístico: la relajación puede dejar una brecha de
+dualidad que la búsqueda local no siempre cierra. Cada λ evaluado da la
+cota inferior  min(Σ c_j·L_j + λ·HF) - λ·HF_disp  del costo de cualquier
+diseño factible; la mayor se informa con la solución (cota_inferior y
+brecha), de modo que el exceso sobre el óptimo queda acotado.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+from submain_engine import V_MAX, hf_tramos
+
+
+@dataclass(frozen=True)
+class Tramo:
+    D: float        # diámetro interno (mm)
+    L: float        # longitud (m)
+    V: float        # velocidad a la entrada del tramo (m/s)
+    HF: float       # pérdida por fricción del tramo (m)
+
+
+@dataclass(frozen=True)
+class SolucionTelescopica:
+    tramos: tuple
+    HF: float
+    costo: float
+    t_avance: float
+    diametro_salida: np.ndarray     # diámetro de cada tramo entre salidas
+    cota_inferior: float            # cota lagrangiana del costo óptimo
+
+    @property
+    def brecha(self):
+        """Exceso relativo máximo del costo sobre el óptimo: costo/cota - 1."""
+        if self.cota_inferior <= 0:
+            return float("inf")
+        return max(0.0, self.costo / self.cota_inferior - 1)
+
+    def tabla(self):
+        import pandas as pd
+        return pd.DataFrame({
+            "Tramo": [f"Tramo {i}" for i in range(1, len(self.tramos) + 1)],
+            "Diámetro (mm)": [t.D for t in self.tramos],
+            "Longitud (m)": [t.L for t in self.tramos],
+            "Velocidad (m/s)": [t.V for t in self.tramos],
+            "HF (m)": [t.HF for t in self.tramos],
+        })
+
+
+# ===============================
+# PROGRAMACIÓN DINÁMICA PARA UN λ
+# ===============================
+def _dp(costo, P, kmin, lam):
+    """
+    Diseño de mínimo costo + λ·HF con diámetros no crecientes aguas abajo.
+
+    costo[j]: costo del diámetro j por tramo entre salidas
+    P[j, b]:  pérdida acumulada de las primeras b salidas con el diámetro j
+    kmin[j]:  primera salida (0-based) en la que el diámetro j cumple V_MAX
+
+    G_j[b] es el mínimo para cubrir las primeras b salidas usando sólo los
+    diámetros >= j; el diámetro j cubre un intervalo (a, b] y
+        G_j[b] = c_j·b + λP_j[b] + min_{a <= b} (G_{j+1}[a] - c_j·a - λP_j[a])
+    Devuelve el índice de diámetro de cada tramo, o None si no hay diseño.
+    """
+    m, n1 = P.shape
+    b = np.arange(n1)
+    G = np.full(n1, np.inf)
+    G[0] = 0.0
+    etapas = []
+    for j in range(m - 1, -1, -1):
+        base = costo[j] * b + lam * P[j]
+        cand = G - base
+        cand[:kmin[j]] = np.inf
+        mejor = np.minimum.accumulate(cand) + base
+        etapas.append(G)
+        G = np.minimum(G, mejor)
+    if not np.isfinite(G[-1]):
+        return None
+
+    # Reconstrucción: de la última salida hacia aguas arriba
+    dia_idx = np.empty(n1 - 1, dtype=int)
+    fin = n1 - 1
+    for j in range(m):
+        G_sig = etapas[m - 1 - j]
+        if fin == 0:
+            break
+        base = costo[j] * b[:fin + 1] + lam * P[j, :fin + 1]
+        cand = G_sig[:fin + 1] - base
+        cand[:kmin[j]] = np.inf
+        a = int(np.argmin(cand))
+        if cand[a] + base[fin] < G_sig[fin]:
+            dia_idx[a:fin] = j
+            fin = a
+    return dia_idx
+
+
+# ===============================
+# SOLUCIÓN
+# ===============================
+def solucion_telescopica(e, precios=None, iteraciones=60):
+    """
+    Diseño telescópico (heurístico, con cota de su brecha) para la entrada `e`.
+
+    precios: costo por metro de cada diámetro de la clase (mismo orden que
+    e.dia); si es None se minimiza el volumen de tubería.
+    Devuelve SolucionTelescopica, o None si ni el mayor diámetro cumple.
+    """
+    cat = e.catalogo
+    n, S = e.Salidas, e.S
+    k_salida = np.arange(n)
+    q = e.Q - e.Q_salida * k_salida
+
+    if precios is None:
+        c_m = cat.A
+    else:
+        c_m = np.asarray(precios, dtype=float)
+        if c_m.shape != cat.d.shape:
+            raise ValueError("Debe haber un precio por diámetro de la clase")
+    costo = c_m * S
+
+    # Pérdida por tramo entre salidas y sumas prefijas (diámetros × salidas)
+    hf = hf_tramos(e)
+    P = np.zeros((len(cat), n + 1))
+    np.cumsum(hf, axis=1, out=P[:, 1:])
+
+    # q decrece aguas abajo: el diámetro j cumple V_MAX desde kmin[j]
+    v_ok = q[None, :] / cat.A[:, None] / 3600 <= V_MAX
+    kmin = np.where(v_ok.any(axis=1), np.argmax(v_ok, axis=1), n + 1)
+
+    cota = [0.0]
+
+    def evaluar(lam):
+        idx = _dp(costo, P, kmin, lam)
+        if idx is None:
+            return None, np.inf
+        HF = hf[idx, k_salida].sum()
+        cota[0] = max(cota[0], costo[idx].sum() + lam * (HF - e.HF_disp))
+        return idx, HF
+
+    idx, HF = evaluar(0.0)
+    if idx is None:
+        return None
+    if HF > e.HF_disp:
+        # Cota superior de λ: duplicar hasta cumplir (o agotar el catálogo)
+        lo, hi = 0.0, float(costo.max() / max(hf.min(), 1e-300))
+        idx, HF = evaluar(hi)
+        for _ in range(iteraciones):
+            if HF <= e.HF_disp:
+                break
+            lo, hi = hi, hi * 16
+            idx, HF = evaluar(hi)
+        if HF > e.HF_disp:
+            return None
+        idx_lo, HF_lo = evaluar(lo)
+        for _ in range(iteraciones):
+            mid = np.sqrt(lo * hi) if lo > 0 else hi / 16
+            idx_m, HF_m = evaluar(mid)
+            if HF_m <= e.HF_disp:
+                hi, idx, HF = mid, idx_m, HF_m
+            else:
+                lo, idx_lo, HF_lo = mid, idx_m, HF_m
+            if hi - lo <= 1e-9 * hi:
+                break
+
+        # La relajación deja una brecha de dualidad: se reparan ambos
+        # extremos (el factible y el infactible más barato) y se conserva
+        # el de menor costo.
+        candidatos = [_ajustar(idx, costo, hf, kmin, e.HF_disp - HF)]
+        idx_lo, HF_lo = _reforzar(idx_lo, costo, hf, HF_lo - e.HF_disp)
+        if HF_lo <= e.HF_disp:
+            candidatos.append(
+                _ajustar(idx_lo, costo, hf, kmin, e.HF_disp - HF_lo))
+        idx = min(candidatos, key=lambda i: costo[i].sum())
+    else:
+        idx = _ajustar(idx, costo, hf, kmin, e.HF_disp - HF)
+
+    return _armar(e, idx, hf, q, c_m, cota[0])
+
+
+def _reforzar(idx, costo, hf, exceso):
+    """
+    Lleva a HF <= HF_disp un diseño infactible: en cada paso aumenta el
+    diámetro del primer tramo de un diámetro (o de la tubería) que más
+    reduce la pérdida por unidad de costo agregada.
+    """
+    idx = idx.copy()
+    n, m = len(idx), hf.shape[0]
+    w = np.arange(m)
+    for _ in range(n * m):
+        if exceso <= 0:
+            break
+        # Candidatos: primer tramo de cada diámetro
+        p = np.flatnonzero(np.diff(np.insert(idx, 0, -1)))
+        v = idx[p]
+        ant = np.insert(idx, 0, m - 1)[p]
+        ok = (w[None, :] > v[:, None]) & (w[None, :] <= ant[:, None])
+        if not ok.any():
+            break
+        extra = costo[None, :] - costo[v][:, None]
+        reduccion = hf[v, p][:, None] - hf[:, p].T
+        razon = np.where(ok, reduccion / np.maximum(extra, 1e-300), -np.inf)
+        i, j = np.unravel_index(np.argmax(razon), razon.shape)
+        exceso -= reduccion[i, j]
+        idx[p[i]] = j
+    HF = hf[idx, np.arange(n)].sum()
+    return idx, HF
+
+
+def _movimientos(idx, costo, hf, kmin):
+    """
+    Cambios de un tramo que conservan los diámetros no crecientes:
+    bajar el último tramo de cada diámetro o subir el primero.
+    Devuelve (posición, nuevo diámetro, ahorro, aumento de HF) por cambio.
+    """
+    m = hf.shape[0]
+    w = np.arange(m)
+
+    p = np.flatnonzero(np.diff(np.append(idx, -1)))     # últimos tramos
+    sig = np.append(idx, 0)[p + 1]
+    bajar = ((w[None, :] >= sig[:, None]) & (w[None, :] < idx[p][:, None])
+             & (kmin[None, :] <= p[:, None]))
+
+    r = np.flatnonzero(np.diff(np.insert(idx, 0, -1)))  # primeros tramos
+    ant = np.insert(idx, 0, m - 1)[r]
+    subir = (w[None, :] > idx[r][:, None]) & (w[None, :] <= ant[:, None])
+
+    pos, dia = [], []
+    for t, ok in ((p, bajar), (r, subir)):
+        i, j = np.nonzero(ok)
+        pos.append(t[i])
+        dia.append(j)
+    pos, dia = np.concatenate(pos), np.concatenate(dia)
+    ahorro = costo[idx[pos]] - costo[dia]
+    dHF = hf[dia, pos] - hf[idx[pos], pos]
+    return pos, dia, ahorro, dHF
+
+
+def _ajustar(idx, costo, hf, kmin, holgura, max_pasos=256):
+    """
+    Búsqueda local sobre un diseño factible: aplica el cambio de uno o dos
+    tramos (bajar uno y subir otro) de mayor ahorro que mantiene
+    HF <= HF_disp, hasta que ninguno ahorra.
+    """
+    idx = idx.copy()
+    for _ in range(max_pasos):
+        pos, dia, ahorro, dHF = _movimientos(idx, costo, hf, kmin)
+        if not len(pos):
+            break
+
+        # Un tramo
+        ok1 = (ahorro > 0) & (dHF <= holgura)
+        mejor1 = np.where(ok1, ahorro, -np.inf)
+        i1 = int(np.argmax(mejor1))
+
+        # Dos tramos distintos; si son vecinos deben seguir ordenados
+        A = ahorro[:, None] + ahorro[None, :]
+        H = dHF[:, None] + dHF[None, :]
+        distintos = pos[:, None] != pos[None, :]
+        vecinos = np.abs(pos[:, None] - pos[None, :]) == 1
+        aguas_arriba = pos[:, None] < pos[None, :]
+        no_crece = np.where(aguas_arriba, dia[:, None] >= dia[None, :],
+                            dia[:, None] <= dia[None, :])
+        orden = ~vecinos | no_crece
+        ok2 = distintos & orden & (A > 0) & (H <= holgura)
+        mejor2 = np.where(ok2, A, -np.inf)
+        i2, j2 = np.unravel_index(int(np.argmax(mejor2)), mejor2.shape)
+
+        if mejor1[i1] <= 1e-12 * costo.max() and mejor2[i2, j2] <= 1e-12 * costo.max():
+            break
+        if mejor1[i1] >= mejor2[i2, j2]:
+            idx[pos[i1]] = dia[i1]
+            holgura -= dHF[i1]
+        else:
+            idx[pos[i2]] = dia[i2]
+            idx[pos[j2]] = dia[j2]
+            holgura -= dHF[i2] + dHF[j2]
+    return idx
+
+
+def _armar(e, idx, hf, q, c_m, cota_inferior):
+    cat = e.catalogo
+    S = e.S
+    k_salida = np.arange(len(idx))
+    hf_tramo = hf[idx, k_salida]
+
+    cortes = np.flatnonzero(np.diff(idx)) + 1
+    inicios = np.concatenate(([0], cortes))
+    fines = np.concatenate((cortes, [len(idx)]))
+    tramos = tuple(
+        Tramo(D=float(cat.d[idx[a]]), L=float((b - a) * S),
+              V=float(q[a] / cat.A[idx[a]] / 3600),
+              HF=float(hf_tramo[a:b].sum()))
+        for a, b in zip(inicios, fines))
+
+    t_tramo = S * cat.A[idx] * 3600 / q
+    return SolucionTelescopica(
+        tramos=tramos,
+        HF=float(hf_tramo.sum()),
+        costo=float((c_m[idx] * S).sum()),
+        t_avance=round(float(t_tramo.sum()) / 60, 2),
+        diametro_salida=cat.d[idx],
+        cota_inferior=float(min(cota_inferior, (c_m[idx] * S).sum())),
+    )
@@ -0,0 +1,62 @@
+"""
+Medición liviana de tiempos por etapa.
+
+Cronometro acumula intervalos con nombre (con `with crono.etapa("...")`)
+y los emite como una línea JSON en el logger "submain.tiempos", de modo
+que en producción puedan agregarse los tiempos de todas las sesiones.
+"""
+import json
+import logging
+import sys
+import time
+from contextlib import contextmanager
+
+LOGGER = "submain.tiempos"
+
+
+def logger():
+    """Logger de tiempos; si no está configurado escribe JSON en stderr."""
+    log = logging.getLogger(LOGGER)
+    if not log.handlers:
+        manejador = logging.StreamHandler(sys.stderr)
+        manejador.setFormatter(logging.Formatter("%(message)s"))
+        log.addHandler(manejador)
+        log.setLevel(logging.INFO)
+        log.propagate = False
+    return log
+
+
+class Cronometro:
+    def __init__(self, **contexto):
+        self.contexto = contexto
+        self.etapas = {}
+        self._t0 = time.perf_counter()
+
+    @contextmanager
+    def etapa(self, nombre):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            ms = (time.perf_counter() - t0) * 1e3
+            self.etapas[nombre] = self.etapas.get(nombre, 0.0) + ms
+
+    @property
+    def total_ms(self):
+        return (time.perf_counter() - self._t0) * 1e3
+
+    def registro(self, **extra):
+        return {
+            "evento": "tiempos",
+            "ts": round(time.time(), 3),
+            **self.contexto,
+            "etapas_ms": {k: round(v, 3) for k, v in self.etapas.items()},
+            "total_ms": round(self.total_ms, 3),
+            **extra,
+        }
+
+    def emitir(self, log=None, **extra):
+        """Emite el registro (con los campos `extra`) como una línea JSON y lo devuelve."""
+        reg = self.registro(**extra)
+        (log or logger()).info(json.dumps(reg, ensure_ascii=False))
+        return reg
@@ -1,538 +1,404 @@
-import streamlit as st
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, Image
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.lib.pagesizes import letter
-from reportlab.lib.units import cm
-
-# ===============================
-# BASES DE DATOS
-# ===============================
-PVC_SDR = {
-    "17": [37.18, 42.58, 53.21, 54.45, 78.44, 100.84, 148.46, 193.28],
-    "26": [30.36, 38.9, 44.56, 55.71, 67.45, 82.04, 105.52,
-           155.32, 202.22, 252.07, 298.95],
-    "32.5": [39.0, 45.22, 56.63, 68.55, 83.42, 107.28,
-             157.92, 205.62, 256.23, 303.93],
-    "41": [39.8, 45.9, 57.38, 69.46, 84.58, 108.72,
-           160.08, 208.42, 259.75, 308.05, 369.7]
-}
-
-PE_PN = {
-    "PN6": [35.4, 44.6, 56.0, 67.0, 80.8, 99.0,
-            112.8, 126.4, 144.0, 162.0, 180.0],
-    "PN8": [27.4, 34.4, 43.2, 54.4, 65.2, 78.2,
-            95.8, 108.8, 122.0, 139.2, 156.8, 173.2],
-    "PN10": [26.0, 32.6, 40.8, 51.4, 61.4, 73.6,
-             90.0, 102.2, 114.6, 130.8, 147.2, 163.6]
-}
-
-
-
-# ===============================
-# CONFIGURACIÓN GENERAL
-# ===============================
-st.set_page_config(page_title="Secundaria de Riego", layout="wide")
-st.title("💧 Diseño de Tubería Secundaria de Riego")
-st.caption("Diseño hidráulico + tiempo de avance discreto | Prof. Gregory Guevara")
-
-
-with st.expander("📘 Ayuda teórica – Fundamentos hidráulicos", expanded=False):
-
-    st.markdown("## 1. Flujo en tuberías con múltiples salidas")
-
-    st.markdown("""
-En una tubería secundaria de riego, el caudal **no es constante** a lo largo de la conducción.
-Cada salida extrae una fracción del caudal total.
-""")
-
-    st.latex(r"Q_i = Q - i \cdot q_{\text{salida}}")
-
-    st.markdown("""
-donde:
-
-- **Q** = caudal total de entrada (m³/h)  
-- **qₛₐₗᵢdₐ** = caudal por salida  
-- **i** = número de salidas aguas arriba  
-
-Este comportamiento implica que:
-- la velocidad varía con la longitud
-- las pérdidas por fricción deben corregirse
-- el tiempo de avance **no puede calcularse con una sola velocidad promedio**
-""")
-
-    st.markdown("---")
-
-    st.markdown("## 2. Pérdidas por fricción – Fórmula de Hazen–Williams")
-
-    st.markdown("Para tuberías a presión se utiliza la ecuación de Hazen–Williams:")
-
-    st.latex(
-        r"h_f = 10.67 \cdot \frac{L \cdot Q^{1.852}}{C^{1.852} \cdot D^{4.87}}"
-    )
-
-    st.markdown("""
-En esta aplicación se usa la forma adaptada a:
-
-- **Q** en m³/h  
-- **D** en mm  
-- **L** en m  
-""")
-
-    st.latex(
-        r"h_f = 1.131 \times 10^{9} \cdot \left(\frac{Q}{C}\right)^{1.852} \cdot L \cdot D^{-4.872}"
-    )
-
-    st.markdown("---")
-
-    st.markdown("## 3. Factor de corrección por múltiples salidas")
-
-    st.markdown("""
-Debido a la disminución progresiva del caudal, se introduce un factor de corrección **F**:
-""")
-
-    st.latex(
-        r"F = \frac{2n}{2n - 1} \left( \frac{1}{2.852} + \frac{\sqrt{0.852}}{6n^2} \right)"
-    )
-
-    st.markdown("""
-donde:
-
-- **n** = número total de salidas  
-
-Este factor permite estimar correctamente la pérdida total por fricción
-en tuberías con extracción distribuida.
-""")
-
-    st.markdown("---")
-
-    st.markdown("## 4. Velocidad del flujo")
-
-    st.latex(r"V = \frac{Q}{A}")
-
-    st.markdown("donde el área hidráulica es:")
-
-    st.latex(r"A = \frac{\pi D^2}{4}")
-
-    st.markdown("""
-**Criterio usual de diseño**:
-- \( V \leq 3.0\ \text{m/s} \)
-""")
-
-    st.markdown("---")
-
-    st.markdown("## 5. Tiempo de avance – Enfoque discreto (criterio correcto)")
-
-    st.markdown("""
-El **tiempo de avance** es el tiempo que tarda el agua en llegar desde la entrada
-hasta el extremo final del sistema.
-
-Dado que el caudal y la velocidad varían a lo largo de la tubería,
-el cálculo debe hacerse **tramo a tramo**:
-""")
-
-    st.latex(
-        r"t_{\text{avance}} = \sum_{i=1}^{n} \frac{\Delta L}{V_i}"
-    )
-
-    st.markdown("""
-donde:
-
-- **ΔL** = longitud entre salidas  
-- **Vᵢ** = velocidad real en el tramo *i*  
-
-Este enfoque es fundamental para:
-- fertirriego
-- análisis de uniformidad
-- evaluación del tiempo de respuesta hidráulica
-""")
-
-    st.markdown("---")
-
-    st.markdown("## 6. Interpretación de los gráficos")
-
-    st.markdown("""
-Los gráficos presentan simultáneamente:
-
-- **Velocidad** (línea continua)  
-- **Tiempo acumulado** (puntos)  
-
-permitiendo:
-- identificar tramos críticos
-- evaluar el efecto del cambio de diámetro
-- comparar diseños hidráulicos de forma visual y didáctica
-""")
-
-
-# ===============================
-# ENTRADAS
-# ===============================
-st.sidebar.header("🔧 Parámetros de entrada")
-
-Q = st.sidebar.number_input("Caudal total (m³/h)", value=20.0)
-S = st.sidebar.number_input("Espaciamiento entre salidas (m)", value=10.0)
-LL = st.sidebar.number_input("Longitud total (m)", value=100.0)
-HF_disp = st.sidebar.number_input("Pérdida disponible (m)", value=1.0)
-C = st.sidebar.number_input("Coeficiente Hazen–Williams (C)", value=150)
-
-Salidas = int(LL / S)
-Q_salida = Q / Salidas
-
-# ===============================
-# MATERIAL
-# ===============================
-st.sidebar.header("🧱 Material")
-
-material = st.sidebar.selectbox("Material", ["PVC", "PE (HDPE)"])
-
-if material == "PVC":
-    SDR_sel = st.sidebar.selectbox("SDR", list(PVC_SDR.keys()))
-    dia = np.array(PVC_SDR[SDR_sel])
-    mat_label = f"PVC SDR {SDR_sel}"
-else:
-    PN_sel = st.sidebar.selectbox("Clase PN", list(PE_PN.keys()))
-    dia = np.array(PE_PN[PN_sel])
-    mat_label = f"PE100 {PN_sel}"
-
-st.info(f"Material seleccionado: **{mat_label}**")
-
-# ===============================
-# FACTOR MULTISALIDAS
-# ===============================
-F = 2 * Salidas / (2 * Salidas - 1) * ((1 / 2.852) + 0.852**0.5 / (6 * Salidas**2))
-
-# ===============================
-# SOLUCIÓN UN DIÁMETRO
-# ===============================
-st.header("🔹 Solución con un diámetro")
-
-sol1 = []
-for d in dia:
-    A = np.pi * (d / 2000)**2
-    V = Q / A / 3600
-    HF = 1.131e9 * (Q / C)**1.852 * LL * d**-4.872 * F
-    sol1.append({
-        "Diámetro (mm)": d,
-        "Velocidad (m/s)": round(V, 2),
-        "HF (m)": round(HF, 2),
-        "Cumple": V <= 3 and HF <= HF_disp
-    })
-
-df1 = pd.DataFrame(sol1)
-st.dataframe(df1, use_container_width=True)
-
-df1_ok = df1[df1["Cumple"]]
-
-d1 = None
-if not df1_ok.empty:
-    d1 = df1_ok.iloc[0]["Diámetro (mm)"]
-    st.success(f"Diámetro recomendado: **{d1} mm**")
-
-# ===============================
-# SOLUCIÓN DOS DIÁMETROS
-# ===============================
-st.header("🔹 Solución con dos diámetros")
-
-sol2 = None
-for i in range(1, len(dia)):
-    d_up, d_dn = dia[i], dia[i-1]
-    for L1 in np.arange(S, LL, S):
-        L2 = LL - L1
-        Q2 = Q * L2 / LL
-
-        A1 = np.pi * (d_up/2000)**2
-        A2 = np.pi * (d_dn/2000)**2
-
-        V1 = Q / A1 / 3600
-        V2 = Q2 / A2 / 3600
-
-        HF = (
-            1.131e9 * (Q/C)**1.852 * L1 * d_up**-4.872 * F +
-            1.131e9 * (Q2/C)**1.852 * L2 * d_dn**-4.872 * F
-        )
-
-        if HF <= HF_disp and V1 <= 3 and V2 <= 3:
-            sol2 = dict(D1=d_up, L1=L1, V1=V1,
-                        D2=d_dn, L2=L2, V2=V2, HF=HF)
-            break
-    if sol2:
-        break
-
-if sol2:
-    st.success("Solución progresiva encontrada")
-    df_sol2 = pd.DataFrame({
-        "Tramo": ["Inicial", "Final"],
-        "Diámetro (mm)": [sol2["D1"], sol2["D2"]],
-        "Longitud (m)": [sol2["L1"], sol2["L2"]],
-        "Velocidad (m/s)": [sol2["V1"], sol2["V2"]],
-    })
-
-    st.dataframe(
-        df_sol2.style
-        .format({
-            "Diámetro (mm)": "{:.1f}",
-            "Longitud (m)": "{:.0f}",
-            "Velocidad (m/s)": "{:.2f}",
-        }),
-        use_container_width=True
-    )
-
-    st.metric("Pérdida de carga total (m)", f"{sol2['HF']:.3f}")
-
-
-# ===============================
-# TIEMPO DE AVANCE (ALGORITMO DISCRETO)
-# ===============================
-st.header("⏱️ Tiempo de avance del agua")
-
-df_t = pd.DataFrame()
-df_t["salida"] = range(1, Salidas + 1)
-df_t["long_acum"] = df_t["salida"] * S
-
-qq = Q + Q_salida
-q_tramo = []
-
-for _ in df_t["salida"]:
-    qq -= Q_salida
-    q_tramo.append(qq)
-
-df_t["q_tramo"] = q_tramo
-
-# --- Un diámetro
-A1 = np.pi * (d1 / 2000)**2
-df_t["v_tramo"] = df_t["q_tramo"] / A1 / 3600
-df_t["t_tramo"] = S / df_t["v_tramo"]
-df_t["t_acum"] = df_t["t_tramo"].cumsum() / 60
-t_avance = round(df_t["t_tramo"].sum() / 60, 2)
-
-st.metric("Tiempo de avance (1 diámetro) [min]", t_avance)
-
-# --- Dos diámetros
-if sol2:
-    df_t["v_tramo_comb"] = df_t.apply(
-        lambda r: r["q_tramo"]/(
-            np.pi * (sol2["D1"]/2000)**2
-        )/3600 if r["long_acum"] <= sol2["L1"]
-        else r["q_tramo"]/(
-            np.pi * (sol2["D2"]/2000)**2
-        )/3600,
-        axis=1
-    )
-
-    df_t["t_tramo_comb"] = S / df_t["v_tramo_comb"]
-    df_t["t_acum_comb"] = df_t["t_tramo_comb"].cumsum() / 60
-    t_avance_comb = round(df_t["t_tramo_comb"].sum() / 60, 2)
-
-    st.metric("Tiempo de avance (2 diámetros) [min]", t_avance_comb)
-
-st.dataframe(df_t, use_container_width=True)
-
-# ===============================
-# GRÁFICO VELOCIDAD VS LONGITUD
-# ===============================
-st.header("📊 Análisis hidráulico: velocidad y tiempo de avance")
-
-fig, axes = plt.subplots(1, 2, figsize=(16,5), sharex=True)
-
-# ===============================
-# SUBPLOT 1 – UN DIÁMETRO
-# ===============================
-ax1 = axes[0]
-ax1.set_title("Un diámetro")
-ax1.set_xlabel("Longitud acumulada (m)")
-ax1.set_ylabel("Velocidad (m/s)", color="tab:red")
-ax1.plot(df_t["long_acum"], df_t["v_tramo"], color="tab:red", linewidth=2)
-ax1.tick_params(axis='y', labelcolor="tab:red")
-ax1.grid(True, linestyle=":", alpha=0.6)
-
-ax1b = ax1.twinx()
-ax1b.set_ylabel("Tiempo acumulado (min)", color="tab:blue")
-ax1b.scatter(df_t["long_acum"], df_t["t_acum"], color="tab:blue", s=25)
-ax1b.tick_params(axis='y', labelcolor="tab:blue")
-
-# ===============================
-# SUBPLOT 2 – DOS DIÁMETROS
-# ===============================
-ax2 = axes[1]
-ax2.set_title("Dos diámetros progresivos")
-ax2.set_xlabel("Longitud acumulada (m)")
-ax2.set_ylabel("Velocidad (m/s)", color="tab:red")
-ax2.plot(df_t["long_acum"], df_t["v_tramo_comb"], color="tab:red", linewidth=2)
-ax2.tick_params(axis='y', labelcolor="tab:red")
-ax2.grid(True, linestyle=":", alpha=0.6)
-
-ax2b = ax2.twinx()
-ax2b.set_ylabel("Tiempo acumulado (min)", color="tab:blue")
-ax2b.scatter(df_t["long_acum"], df_t["t_acum_comb"], color="tab:blue", s=25)
-ax2b.tick_params(axis='y', labelcolor="tab:blue")
-
-fig.tight_layout()
-st.pyplot(fig)
-fig.savefig("grafico_velocidad_tiempo.png", dpi=300)
-
-
-# ===============================
-# ONE PAGE – MEMORIA DE CÁLCULO
-# ===============================
-from reportlab.platypus import TableStyle
-from reportlab.lib import colors
-
-
-styles = getSampleStyleSheet()
-story = []
-
-story.append(Paragraph(
-    "<b>Memoria de Cálculo Hidráulico – Tubería Secundaria de Riego</b>",
-    styles["Title"]
-))
-story.append(Spacer(1, 8))
-
-# ===============================
-# DATOS DE ENTRADA
-# ===============================
-story.append(Paragraph("<b>Datos de entrada</b>", styles["Heading2"]))
-
-tabla_entrada = Table([
-    ["Parámetro", "Valor"],
-    ["Caudal total Q (m³/h)", f"{Q}"],
-    ["Longitud total L (m)", f"{LL}"],
-    ["Espaciamiento entre salidas (m)", f"{S}"],
-    ["Número de salidas", f"{Salidas}"],
-    ["Pérdida disponible (m)", f"{HF_disp}"],
-    ["Coeficiente Hazen–Williams C", f"{C}"],
-    ["Material", mat_label],
-], colWidths=[7*cm, 6*cm])
-
-tabla_entrada.setStyle(TableStyle([
-    ("GRID", (0,0), (-1,-1), 0.4, colors.grey),
-    ("BACKGROUND", (0,0), (-1,0), colors.lightgrey),
-]))
-
-story.append(tabla_entrada)
-story.append(Spacer(1, 10))
-
-# ===============================
-# RESULTADOS HIDRÁULICOS
-# ===============================
-story.append(Paragraph("<b>Resultados hidráulicos</b>", styles["Heading2"]))
-
-tabla_res = [
-    ["Escenario", "Resultado"],
-    ["Diámetro único recomendado (mm)", f"{d1}"],
-    ["Tiempo de avance – 1 diámetro (min)", f"{t_avance}"],
-]
-
-if sol2:
-    tabla_res += [
-        ["Diámetro inicial (mm)", f"{sol2['D1']}"],
-        ["Diámetro final (mm)", f"{sol2['D2']}"],
-        ["Longitud cambio diámetro (m)", f"{sol2['L1']}"],
-        ["Tiempo de avance – 2 diámetros (min)", f"{t_avance_comb}"],
-    ]
-
-tabla_resultados = Table(tabla_res, colWidths=[7*cm, 6*cm])
-tabla_resultados.setStyle(TableStyle([
-    ("GRID", (0,0), (-1,-1), 0.4, colors.grey),
-    ("BACKGROUND", (0,0), (-1,0), colors.whitesmoke),
-]))
-
-story.append(tabla_resultados)
-story.append(Spacer(1, 10))
-
-# ===============================
-# GRÁFICO
-# ===============================
-story.append(Paragraph("<b>Análisis gráfico</b>", styles["Heading2"]))
-story.append(Paragraph(
-    "Variación de la velocidad y tiempo de avance a lo largo del manifold.",
-    styles["Normal"]
-))
-story.append(Spacer(1, 6))
-
-story.append(Image("grafico_velocidad_tiempo.png", width=16*cm, height=6*cm))
-
-# ===============================
-# CONSTRUCCIÓN PDF
-# ===============================
-if st.button("📄 Generar memoria de cálculo (PDF)"):
-    # 1. Crear PDF
-    pdf_file = "Memoria_Secundaria_Riego.pdf"
-
-    doc = SimpleDocTemplate(
-        pdf_file,
-        pagesize=letter,
-        rightMargin=36,
-        leftMargin=36,
-        topMargin=36,
-        bottomMargin=36
-    )
-
-    styles = getSampleStyleSheet()
-    elements = []
-
-    # ----- CONTENIDO DEL PDF -----
-    elements.append(Paragraph(
-        "<b>MEMORIA DE CÁLCULO – TUBERÍA SECUNDARIA DE RIEGO</b>",
-        styles["Title"]
-    ))
-
-    elements.append(Spacer(1, 12))
-
-    elements.append(Paragraph(
-        f"""
-        <b>Datos de entrada</b><br/>
-        Caudal total: {Q:.2f} m³/h<br/>
-        Longitud total: {LL:.1f} m<br/>
-        Espaciamiento entre salidas: {S:.1f} m<br/>
-        Número de salidas: {Salidas}<br/>
-        Coeficiente Hazen–Williams (C): {C}<br/>
-        Pérdida disponible: {HF_disp:.2f} m<br/>
-        Material: {mat_label}
-        """,
-        styles["Normal"]
-    ))
-
-    elements.append(Spacer(1, 10))
-
-    if d1:
-        elements.append(Paragraph("<b>Solución con un diámetro</b>", styles["Heading3"]))
-        elements.append(Paragraph(
-            f"Diámetro seleccionado: {d1:.1f} mm<br/>"
-            f"Tiempo de avance: {t_avance:.2f} min",
-            styles["Normal"]
-        ))
-
-    if sol2:
-        elements.append(Spacer(1, 8))
-        elements.append(Paragraph("<b>Solución con dos diámetros</b>", styles["Heading3"]))
-
-        tabla = Table([
-            ["Tramo", "Diámetro (mm)", "Longitud (m)", "Velocidad (m/s)"],
-            ["Inicial", sol2["D1"], sol2["L1"], f"{sol2['V1']:.2f}"],
-            ["Final", sol2["D2"], sol2["L2"], f"{sol2['V2']:.2f}"],
-        ])
-
-        elements.append(tabla)
-
-        elements.append(Paragraph(
-            f"Pérdida total de carga: {sol2['HF']:.3f} m<br/>"
-            f"Tiempo de avance total: {t_avance_comb:.2f} min",
-            styles["Normal"]
-        ))
-
-    elements.append(Spacer(1, 12))
-    elements.append(Image("grafico_velocidad_tiempo.png", width=16*cm, height=6*cm))
-
-    # 2. Construir PDF
-    doc.build(elements)
-
-    # 3. Botón de descarga
-    with open(pdf_file, "rb") as f:
-        st.download_button(
-            label="⬇️ Descargar PDF",
-            data=f,
-            file_name=pdf_file,
-            mime="application/pdf"
-        )
+import os
+import sqlite3
+import uuid
+
+import pandas as pd
+import streamlit as st
+
+from submain_cache import RUTA_DEFECTO, abrir
+from submain_engine import (
+    PVC_SDR, PE_PN, DARCY, MODELOS, Entrada, Perfil,
+)
+from submain_etapas import grafo_diseno
+from submain_telescoping import solucion_telescopica
+from submain_timing import Cronometro
+
+# ===============================
+# CONFIGURACIÓN GENERAL
+# ===============================
+st.set_page_config(page_title="Secundaria de Riego", layout="wide")
+st.title("💧 Diseño de Tubería Secundaria de Riego")
+st.caption("Diseño hidráulico + tiempo de avance discreto | Prof. Gregory Guevara")
+
+# ===============================
+# DIAGNÓSTICO DE TIEMPOS
+# ===============================
+# Cada etapa se mide en cada ejecución; al final se emite una línea JSON
+# (logger "submain.tiempos") y, si se pide, se muestra en la barra lateral.
+sesion = st.session_state.setdefault("sesion", uuid.uuid4().hex[:12])
+crono = Cronometro(sesion=sesion)
+
+
+def cerrar_diagnostico():
+    registro = crono.emitir(etapas_grafo=grafo().estadisticas())
+    if st.session_state.get("diagnostico"):
+        with st.sidebar.expander("🩺 Tiempos por etapa", expanded=True):
+            st.dataframe(
+                [{"Etapa": k, "ms": round(v, 2)}
+                 for k, v in registro["etapas_ms"].items()],
+                use_container_width=True, hide_index=True
+            )
+            st.caption(f"Total de la ejecución: {registro['total_ms']:.1f} ms")
+            st.dataframe(
+                [{"Etapa": k, **v} for k, v in registro["etapas_grafo"].items()],
+                use_container_width=True, hide_index=True
+            )
+
+# ===============================
+# GRAFO DE ETAPAS
+# ===============================
+# Streamlit re-ejecuta todo el script en cada interacción; el diseño se
+# calcula con el grafo de etapas de submain_etapas, compartido entre
+# sesiones: cada etapa se memoriza por los datos que declara, de modo que
+# sólo se recalcula lo que queda aguas abajo del dato cambiado. La solución
+# con dos diámetros se guarda además en la caché persistente en disco
+# (SUBMAIN_CACHE: ruta del archivo; vacía para desactivarla), que sobrevive
+# a los reinicios y se comparte con el diseño por lotes.
+CACHE_ENTRADAS = 256
+FILAS_PAGINA = 500      # salidas por página de la tabla de avance
+
+
+@st.cache_resource
+def cache_disco():
+    ruta = os.environ.get("SUBMAIN_CACHE", str(RUTA_DEFECTO))
+    try:
+        return abrir(ruta) if ruta else None
+    except (OSError, sqlite3.Error):
+        return None     # p. ej. directorio de sólo lectura: sin caché en disco
+
+
+@st.cache_resource
+def grafo():
+    return grafo_diseno(cache_disco(), CACHE_ENTRADAS)
+
+
+def etapa(nombre, entrada):
+    return grafo().calcular(nombre, entrada)
+
+
+@st.cache_data(max_entries=CACHE_ENTRADAS, show_spinner=False)
+def etapa_telescopica(entrada):
+    return solucion_telescopica(entrada)
+
+
+with st.expander("📘 Ayuda teórica – Fundamentos hidráulicos", expanded=False):
+
+    st.markdown("## 1. Flujo en tuberías con múltiples salidas")
+
+    st.markdown("""
+En una tubería secundaria de riego, el caudal **no es constante** a lo largo de la conducción.
+Cada salida extrae una fracción del caudal total.
+""")
+
+    st.latex(r"Q_i = Q - i \cdot q_{\text{salida}}")
+
+    st.markdown("""
+donde:
+
+- **Q** = caudal total de entrada (m³/h)  
+- **qₛₐₗᵢdₐ** = caudal por salida  
+- **i** = número de salidas aguas arriba  
+
+Este comportamiento implica que:
+- la velocidad varía con la longitud
+- las pérdidas por fricción deben corregirse
+- el tiempo de avance **no puede calcularse con una sola velocidad promedio**
+""")
+
+    st.markdown("---")
+
+    st.markdown("## 2. Pérdidas por fricción – Fórmula de Hazen–Williams")
+
+    st.markdown("Para tuberías a presión se utiliza la ecuación de Hazen–Williams:")
+
+    st.latex(
+        r"h_f = 10.67 \cdot \frac{L \cdot Q^{1.852}}{C^{1.852} \cdot D^{4.87}}"
+    )
+
+    st.markdown("""
+En esta aplicación se usa la forma adaptada a:
+
+- **Q** en m³/h  
+- **D** en mm  
+- **L** en m  
+""")
+
+    st.latex(
+        r"h_f = 1.131 \times 10^{9} \cdot \left(\frac{Q}{C}\right)^{1.852} \cdot L \cdot D^{-4.872}"
+    )
+
+    st.markdown("---")
+
+    st.markdown("## 3. Factor de corrección por múltiples salidas")
+
+    st.markdown("""
+Debido a la disminución progresiva del caudal, se introduce un factor de corrección **F**:
+""")
+
+    st.latex(
+        r"F = \frac{2n}{2n - 1} \left( \frac{1}{2.852} + \frac{\sqrt{0.852}}{6n^2} \right)"
+    )
+
+    st.markdown("""
+donde:
+
+- **n** = número total de salidas  
+
+Este factor permite estimar correctamente la pérdida total por fricción
+en tuberías con extracción distribuida.
+""")
+
+    st.markdown("---")
+
+    st.markdown("## 4. Velocidad del flujo")
+
+    st.latex(r"V = \frac{Q}{A}")
+
+    st.markdown("donde el área hidráulica es:")
+
+    st.latex(r"A = \frac{\pi D^2}{4}")
+
+    st.markdown("""
+**Criterio usual de diseño**:
+- \( V \leq 3.0\ \text{m/s} \)
+""")
+
+    st.markdown("---")
+
+    st.markdown("## 5. Tiempo de avance – Enfoque discreto (criterio correcto)")
+
+    st.markdown("""
+El **tiempo de avance** es el tiempo que tarda el agua en llegar desde la entrada
+hasta el extremo final del sistema.
+
+Dado que el caudal y la velocidad varían a lo largo de la tubería,
+el cálculo debe hacerse **tramo a tramo**:
+""")
+
+    st.latex(
+        r"t_{\text{avance}} = \sum_{i=1}^{n} \frac{\Delta L}{V_i}"
+    )
+
+    st.markdown("""
+donde:
+
+- **ΔL** = longitud entre salidas  
+- **Vᵢ** = velocidad real en el tramo *i*  
+
+Este enfoque es fundamental para:
+- fertirriego (llegada, lavado y dosis por salida en la página *Fertirriego*)
+- análisis de uniformidad
+- evaluación del tiempo de respuesta hidráulica
+""")
+
+    st.markdown("---")
+
+    st.markdown("## 6. Interpretación de los gráficos")
+
+    st.markdown("""
+Los gráficos presentan simultáneamente:
+
+- **Velocidad** (línea continua)  
+- **Tiempo acumulado** (puntos)  
+
+permitiendo:
+- identificar tramos críticos
+- evaluar el efecto del cambio de diámetro
+- comparar diseños hidráulicos de forma visual y didáctica
+""")
+
+
+# ===============================
+# ENTRADAS
+# ===============================
+st.sidebar.header("🔧 Parámetros de entrada")
+
+Q = st.sidebar.number_input("Caudal total (m³/h)", value=20.0)
+S = st.sidebar.number_input("Espaciamiento entre salidas (m)", value=10.0)
+LL = st.sidebar.number_input("Longitud total (m)", value=100.0)
+HF_disp = st.sidebar.number_input("Pérdida disponible (m)", value=1.0)
+C = st.sidebar.number_input("Coeficiente Hazen–Williams (C)", value=150)
+
+modelo = st.sidebar.selectbox("Modelo de fricción", MODELOS)
+temperatura = 20.0
+if modelo == DARCY:
+    temperatura = st.sidebar.number_input("Temperatura del agua (°C)", value=20.0,
+                                          min_value=0.0, max_value=40.0)
+
+# ===============================
+# MATERIAL
+# ===============================
+st.sidebar.header("🧱 Material")
+
+material = st.sidebar.selectbox("Material", ["PVC", "PE (HDPE)"])
+
+if material == "PVC":
+    clase = st.sidebar.selectbox("SDR", list(PVC_SDR.keys()))
+else:
+    clase = st.sidebar.selectbox("Clase PN", list(PE_PN.keys()))
+
+# ===============================
+# PERFIL DE SALIDAS (OPCIONAL)
+# ===============================
+# CSV con columnas "posicion" (m desde la entrada) y "caudal" (m³/h) por
+# salida; reemplaza Q, S y LL por el cálculo exacto tramo a tramo.
+st.sidebar.header("📍 Perfil de salidas")
+
+archivo = st.sidebar.file_uploader("Posición y caudal por salida (CSV)", type="csv")
+
+st.sidebar.checkbox("Mostrar diagnóstico de tiempos", key="diagnostico")
+
+try:
+    if archivo is None:
+        entrada = Entrada(Q=Q, S=S, LL=LL, HF_disp=HF_disp, C=C,
+                          material=material, clase=clase,
+                          modelo=modelo, temperatura=temperatura)
+    else:
+        perfil = pd.read_csv(archivo)
+        if not {"posicion", "caudal"} <= set(perfil.columns):
+            raise ValueError("El CSV debe tener las columnas posicion y caudal")
+        entrada = Perfil(perfil["posicion"].to_numpy(), perfil["caudal"].to_numpy(),
+                         HF_disp=HF_disp, C=C, material=material, clase=clase,
+                         modelo=modelo, temperatura=temperatura)
+except ValueError as err:
+    st.error(str(err))
+    cerrar_diagnostico()
+    st.stop()
+
+Salidas = entrada.Salidas
+mat_label = entrada.mat_label
+
+st.info(f"Material seleccionado: **{mat_label}** | Fricción: **{modelo}**")
+if archivo is not None:
+    st.info(f"Perfil cargado: **{Salidas} salidas**, Q = {entrada.Q:.2f} m³/h, "
+            f"L = {entrada.LL:.1f} m (pérdida exacta tramo a tramo)")
+
+# ===============================
+# SOLUCIÓN UN DIÁMETRO
+# ===============================
+st.header("🔹 Solución con un diámetro")
+
+with crono.etapa("un_diametro"):
+    res1 = etapa("un_diametro", entrada)
+    st.dataframe(res1.tabla(), use_container_width=True)
+
+d1 = res1.d1
+if d1 is not None:
+    st.success(f"Diámetro recomendado: **{d1} mm**")
+
+# ===============================
+# SOLUCIÓN DOS DIÁMETROS
+# ===============================
+st.header("🔹 Solución con dos diámetros")
+
+with crono.etapa("dos_diametros"):
+    sol2 = etapa("dos_diametros", entrada)
+
+if sol2:
+    st.success("Solución progresiva encontrada")
+    df_sol2 = sol2.tabla()
+
+    st.dataframe(
+        df_sol2.style
+        .format({
+            "Diámetro (mm)": "{:.1f}",
+            "Longitud (m)": "{:.0f}",
+            "Velocidad (m/s)": "{:.2f}",
+        }),
+        use_container_width=True
+    )
+
+    st.metric("Pérdida de carga total (m)", f"{sol2.HF:.3f}")
+
+# ===============================
+# SOLUCIÓN TELESCÓPICA (N DIÁMETROS)
+# ===============================
+st.header("🔹 Solución telescópica (varios diámetros)")
+
+if archivo is None:
+    with crono.etapa("telescopica"):
+        sol_n = etapa_telescopica(entrada)
+else:
+    sol_n = None
+    st.info("Disponible sólo con salidas uniformes")
+
+if sol_n:
+    st.success(f"Diseño telescópico de bajo volumen con {len(sol_n.tramos)} diámetros")
+
+    st.dataframe(
+        sol_n.tabla().style
+        .format({
+            "Diámetro (mm)": "{:.1f}",
+            "Longitud (m)": "{:.0f}",
+            "Velocidad (m/s)": "{:.2f}",
+            "HF (m)": "{:.3f}",
+        }),
+        use_container_width=True
+    )
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Pérdida de carga total (m)", f"{sol_n.HF:.3f}")
+    col2.metric("Tiempo de avance [min]", sol_n.t_avance)
+    col3.metric("Brecha máxima al óptimo", f"{sol_n.brecha:.1%}",
+                help="Exceso máximo garantizado de volumen sobre el óptimo: "
+                     "volumen / cota lagrangiana − 1")
+
+
+# ===============================
+# TIEMPO DE AVANCE (ALGORITMO DISCRETO)
+# ===============================
+st.header("⏱️ Tiempo de avance del agua")
+
+with crono.etapa("tiempo_avance"):
+    avance = etapa("avance", entrada)
+t_avance = avance.t_avance
+t_avance_comb = avance.t_avance_comb
+
+if d1 is None:
+    st.warning("Ningún diámetro del catálogo cumple con la pérdida disponible")
+    cerrar_diagnostico()
+    st.stop()
+
+st.metric("Tiempo de avance (1 diámetro) [min]", t_avance)
+
+if sol2:
+    st.metric("Tiempo de avance (2 diámetros) [min]", t_avance_comb)
+
+# Con miles de salidas la tabla se envía por páginas
+with crono.etapa("tabla_avance"):
+    df_t = avance.tabla()
+    if len(df_t) > FILAS_PAGINA:
+        paginas = -(-len(df_t) // FILAS_PAGINA)
+        pagina = st.number_input(
+            f"Página de la tabla ({paginas} páginas de {FILAS_PAGINA} salidas)",
+            min_value=1, max_value=paginas, value=1, step=1)
+        df_t = df_t.iloc[(pagina - 1) * FILAS_PAGINA:pagina * FILAS_PAGINA]
+    st.dataframe(df_t, use_container_width=True)
+
+# ===============================
+# GRÁFICO VELOCIDAD VS LONGITUD
+# ===============================
+st.header("📊 Análisis hidráulico: velocidad y tiempo de avance")
+
+with crono.etapa("grafico"):
+    for col, spec in zip(st.columns(2), etapa("grafico", entrada)):
+        col.vega_lite_chart(spec, use_container_width=True)
+
+
+# ===============================
+# MEMORIA DE CÁLCULO (PDF)
+# ===============================
+# El gráfico a 300 dpi y el PDF se generan sólo a pedido, en memoria.
+if st.button("📄 Generar memoria de cálculo (PDF)"):
+    from submain_report import PDF_NOMBRE
+    with crono.etapa("pdf"):
+        pdf = etapa("memoria", entrada)
+
+    st.download_button(
+        label="⬇️ Descargar PDF",
+        data=pdf,
+        file_name=PDF_NOMBRE,
+        mime="application/pdf"
+    )
+
+cerrar_diagnostico()
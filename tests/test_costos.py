@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from submain_costos import PRECIOS, frente_pareto, no_dominados
+from submain_engine import MATERIALES, V_MAX, Entrada, tiempo_avance
+
+
+def _frente_fuerza_bruta(a, b, c):
+    p = np.column_stack((a, b, c))
+    domina = (p[None, :, :] <= p[:, None, :]).all(axis=2) & \
+             (p[None, :, :] < p[:, None, :]).any(axis=2)
+    return {tuple(x) for x in p[~domina.any(axis=1)]}
+
+
+@pytest.mark.parametrize("bloque", [1, 7, 1024])
+def test_no_dominados_igual_a_fuerza_bruta(bloque):
+    rng = np.random.default_rng(bloque)
+    for _ in range(50):
+        # Valores enteros pequeños: muchos empates y repetidos
+        a, b, c = rng.integers(0, 6, (3, int(rng.integers(1, 80))))
+        idx = no_dominados(a, b, c, bloque=bloque)
+        frente = [(a[i], b[i], c[i]) for i in idx]
+        assert len(frente) == len(set(frente))          # repetidos una sola vez
+        assert set(frente) == _frente_fuerza_bruta(a, b, c)
+        assert (np.diff(a[idx]) >= 0).all()             # ordenados por a
+
+
+def test_frente_factible_y_coherente_con_el_motor():
+    e = Entrada(20, 5, 400, 3)
+    frente = frente_pareto(e)
+    assert len(frente) > 0
+    assert (frente.HF <= e.HF_disp + 1e-9).all()
+    assert (frente.V1 <= V_MAX).all()
+    assert (np.nan_to_num(frente.V2) <= V_MAX).all()
+    assert set(no_dominados(frente.costo, frente.HF, frente.t_avance)) == set(range(len(frente)))
+
+    for i in range(0, len(frente), max(1, len(frente) // 20)):
+        ei, d1, sol2 = frente.solucion(e, i)
+        avance = tiempo_avance(ei, d1, sol2)
+        t = avance.t_acum[-1] if sol2 is None else avance.t_acum_comb[-1]
+        assert frente.t_avance[i] == pytest.approx(t)
+        precio = dict(zip(MATERIALES[ei.material][ei.clase], PRECIOS[ei.material][ei.clase]))
+        if sol2 is None:
+            costo = precio[d1] * e.LL
+        else:
+            costo = precio[sol2.D1] * sol2.L1 + precio[sol2.D2] * sol2.L2
+        assert frente.costo[i] == pytest.approx(costo)
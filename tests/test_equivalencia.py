@@ -0,0 +1,125 @@
+"""
+Equivalencia del motor vectorizado con el cálculo original (bucles
+escalares de la primera versión de submain_web.py) sobre entradas
+aleatorias.
+"""
+import math
+
+import numpy as np
+import pytest
+
+from submain_engine import (
+    MATERIALES, Entrada, solucion_dos_diametros, solucion_un_diametro,
+    t_avance_rapido, tiempo_avance,
+)
+from submain_sweep import barrido
+
+
+# ===============================
+# REFERENCIA (BUCLES ORIGINALES)
+# ===============================
+def _F(n):
+    return 2 * n / (2 * n - 1) * ((1 / 2.852) + 0.852**0.5 / (6 * n**2))
+
+
+def ref_un_diametro(Q, S, LL, HF_disp, C, dia):
+    F = _F(int(LL / S))
+    for d in dia:
+        V = Q / (np.pi * (d / 2000)**2) / 3600
+        HF = 1.131e9 * (Q / C)**1.852 * LL * d**-4.872 * F
+        if V <= 3 and HF <= HF_disp:
+            return d
+    return None
+
+
+def ref_dos_diametros(Q, S, LL, HF_disp, C, dia):
+    F = _F(int(LL / S))
+    for i in range(1, len(dia)):
+        d_up, d_dn = dia[i], dia[i - 1]
+        for L1 in np.arange(S, LL, S):
+            L2 = LL - L1
+            Q2 = Q * L2 / LL
+            V1 = Q / (np.pi * (d_up / 2000)**2) / 3600
+            V2 = Q2 / (np.pi * (d_dn / 2000)**2) / 3600
+            HF = (1.131e9 * (Q / C)**1.852 * L1 * d_up**-4.872 * F
+                  + 1.131e9 * (Q2 / C)**1.852 * L2 * d_dn**-4.872 * F)
+            if HF <= HF_disp and V1 <= 3 and V2 <= 3:
+                return dict(D1=d_up, L1=L1, V1=V1, D2=d_dn, L2=L2, V2=V2, HF=HF)
+    return None
+
+
+def ref_avance(Q, S, LL, d1, sol2):
+    Salidas = int(LL / S)
+    Q_salida = Q / Salidas
+    qq = Q + Q_salida
+    t1 = t2 = 0.0
+    for k in range(1, Salidas + 1):
+        qq -= Q_salida
+        t1 += S / (qq / (np.pi * (d1 / 2000)**2) / 3600)
+        if sol2 is not None:
+            d = sol2["D1"] if k * S <= sol2["L1"] else sol2["D2"]
+            t2 += S / (qq / (np.pi * (d / 2000)**2) / 3600)
+    return round(t1 / 60, 2), round(t2 / 60, 2) if sol2 is not None else None
+
+
+def entradas(n, semilla):
+    rng = np.random.default_rng(semilla)
+    clases = [(m, c) for m in MATERIALES for c in MATERIALES[m]]
+    for _ in range(n):
+        material, clase = clases[rng.integers(len(clases))]
+        S = round(float(rng.uniform(0.5, 20)), 2)
+        yield Entrada(Q=round(float(rng.uniform(2, 250)), 2), S=S,
+                      LL=round(float(rng.uniform(2 * S, 60 * S)), 1),
+                      HF_disp=round(float(rng.uniform(0.05, 8)), 2),
+                      C=float(rng.choice([130, 140, 150])),
+                      material=material, clase=clase)
+
+
+def _cerca(a, b, tol=0.01 + 1e-9):
+    """Iguales salvo un centésimo por el redondeo a 2 decimales."""
+    return math.isclose(a, b, abs_tol=tol)
+
+
+# ===============================
+# PRUEBAS
+# ===============================
+@pytest.mark.parametrize("semilla", range(4))
+def test_diseno_igual_a_la_referencia(semilla):
+    for e in entradas(150, semilla):
+        dia = list(MATERIALES[e.material][e.clase])
+        args = (e.Q, e.S, e.LL, e.HF_disp, e.C, dia)
+
+        d1 = solucion_un_diametro(e).d1
+        assert d1 == ref_un_diametro(*args)
+
+        sol2, ref2 = solucion_dos_diametros(e), ref_dos_diametros(*args)
+        assert (sol2 is None) == (ref2 is None)
+        if sol2 is not None:
+            assert (sol2.D1, sol2.D2) == (ref2["D1"], ref2["D2"])
+            assert sol2.L1 == pytest.approx(ref2["L1"])
+            assert sol2.HF == pytest.approx(ref2["HF"])
+
+        if d1 is None:
+            continue
+        t1, t2 = ref_avance(e.Q, e.S, e.LL, d1, ref2)
+        avance = tiempo_avance(e, d1, sol2)
+        assert _cerca(avance.t_avance, t1)
+        rapido = t_avance_rapido(e, d1, sol2)
+        assert _cerca(rapido[0], t1)
+        if sol2 is not None:
+            assert _cerca(avance.t_avance_comb, t2)
+            assert _cerca(rapido[1], t2)
+
+
+def test_barrido_igual_al_diseno_punto_a_punto():
+    Q = np.linspace(5, 60, 7)
+    LL = np.linspace(50, 800, 9)
+    res = barrido("PVC", "41", Q, 10.0, LL, 2.0)
+    d1 = res.plano("d1", "LL", "Q")
+    for iq, q in enumerate(Q):
+        for il, ll in enumerate(LL):
+            esperado = solucion_un_diametro(Entrada(q, 10.0, ll, 2.0)).d1
+            if esperado is None:
+                assert np.isnan(d1[iq, il])
+            else:
+                assert d1[iq, il] == esperado
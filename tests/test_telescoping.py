@@ -0,0 +1,40 @@
+import numpy as np
+import pytest
+
+from submain_engine import Entrada
+from submain_telescoping import solucion_telescopica
+
+
+def _no_crece(sol):
+    return bool((np.diff(sol.diametro_salida) <= 0).all())
+
+
+@pytest.mark.parametrize("entrada, precios", [
+    # Un par de cambios vecinos hacía crecer el diámetro aguas abajo
+    (Entrada(9.81294502619329, 1.0, 29.32090071249409, 1.0140937253649005,
+             150, "PVC", "17"),
+     [1.0184621976453676, 6.734832547043039, 7.378112422956348, 19.022417291297437,
+      20.704274348152897, 31.74643048241894, 41.509220838703314, 41.87235437891861]),
+    (Entrada(10.0029, 10, 116.94, 4.938, 150, "PVC", "17"), None),
+])
+def test_regresion_diametros_no_crecientes(entrada, precios):
+    sol = solucion_telescopica(entrada, precios)
+    assert sol is not None
+    assert _no_crece(sol)
+    assert sol.HF <= entrada.HF_disp + 1e-9
+
+
+def test_telescopica_monotona_y_factible():
+    rng = np.random.default_rng(7)
+    for _ in range(300):
+        S = float(rng.choice([1.0, 5.0, 10.0]))
+        e = Entrada(float(rng.uniform(1, 80)), S, float(rng.uniform(2 * S, 40 * S)),
+                    float(rng.uniform(0.1, 8)), 150, "PVC",
+                    str(rng.choice(["17", "26", "32.5", "41"])))
+        precios = None if rng.random() < 0.5 else np.sort(rng.uniform(1, 50, len(e.dia)))
+        sol = solucion_telescopica(e, precios)
+        if sol is None:
+            continue
+        assert _no_crece(sol)
+        assert sol.HF <= e.HF_disp + 1e-9
+        assert sol.cota_inferior <= sol.costo * (1 + 1e-12)